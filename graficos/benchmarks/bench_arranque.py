@@ -0,0 +1,105 @@
+"""
+Benchmark: tempo de arranque (do início do processo até a janela principal aparecer).
+
+Cada repetição corre num processo novo (imports a frio, como no arranque real) e mede:
+  - imports: import do Controller e da View;
+  - janela: até a janela principal estar desenhada e pronta a receber cliques;
+  - aquecimento: até as bibliotecas pesadas estarem carregadas em segundo plano.
+Falha (código 1) se a mediana do tempo até à janela exceder --limite-ms, ou se o
+pandas, o numpy, o matplotlib ou o seaborn forem importados com o Controller e a View
+(devem ser carregados apenas pelo aquecimento em segundo plano).
+Sem display (ex.: servidor de CI), apenas os imports são medidos.
+
+Uso (na pasta graficos):
+    python benchmarks/bench_arranque.py --repeticoes 5 --limite-ms 800
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+PESADOS = ("pandas", "numpy", "matplotlib", "seaborn")
+
+# Script executado em cada processo filho; a última linha do stdout é o resultado (JSON)
+FILHO = """
+import io, json, sys, threading, time
+inicio = time.perf_counter()
+sys.stdout = io.StringIO()  # Silencia o logger da consola
+resultado = {}
+from graficos.controller import Controller
+from graficos.view import View
+resultado["imports"] = time.perf_counter() - inicio
+resultado["pesados_nos_imports"] = [m for m in %(pesados)r if m in sys.modules]
+try:
+    controller = Controller(View)
+except Exception as e:  # Sem display
+    resultado["erro_janela"] = str(e)
+else:
+    def janela_visivel():
+        controller.view.update_idletasks()
+        resultado["janela"] = time.perf_counter() - inicio
+        for thread in threading.enumerate():
+            if thread.name == "aquecimento":
+                thread.join()
+        resultado["aquecimento"] = time.perf_counter() - inicio
+        controller.view.quit()
+    controller.view.after(0, janela_visivel)
+    controller.run()
+sys.stdout = sys.__stdout__
+print(json.dumps(resultado))
+"""
+
+
+def medir_arranque() -> Dict:
+    ambiente = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, "-c", FILHO % {"pesados": PESADOS}],
+        capture_output=True, text=True, env=ambiente, check=True,
+    )
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+    # Inclui o arranque do interpretador
+    resultado["processo"] = time.perf_counter() - inicio
+    return resultado
+
+
+def mediana_ms(resultados: List[Dict], chave: str) -> float:
+    valores = [r[chave] for r in resultados if chave in r]
+    return statistics.median(valores) * 1000 if valores else float("nan")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--limite-ms", type=float, default=800.0, help="Tempo máximo até a janela aparecer")
+    args = parser.parse_args()
+
+    resultados = [medir_arranque() for _ in range(args.repeticoes)]
+    print(f"{args.repeticoes} arranques (mediana)\n")
+    print(f"{'Imports (Controller + View)':<35} {mediana_ms(resultados, 'imports'):>10.1f} ms")
+    print(f"{'Janela principal visível':<35} {mediana_ms(resultados, 'janela'):>10.1f} ms")
+    print(f"{'Aquecimento concluído':<35} {mediana_ms(resultados, 'aquecimento'):>10.1f} ms")
+    print(f"{'Processo completo':<35} {mediana_ms(resultados, 'processo'):>10.1f} ms")
+
+    falhas = []
+    pesados = sorted({m for r in resultados for m in r["pesados_nos_imports"]})
+    if pesados:
+        falhas.append(f"Bibliotecas pesadas carregadas nos imports: {', '.join(pesados)}")
+    if "erro_janela" in resultados[0]:
+        print(f"\nJanela não medida: {resultados[0]['erro_janela']}")
+    elif mediana_ms(resultados, "janela") > args.limite_ms:
+        falhas.append(f"Janela demorou mais de {args.limite_ms:.0f} ms a aparecer")
+
+    for falha in falhas:
+        print(f"\nREGRESSÃO: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
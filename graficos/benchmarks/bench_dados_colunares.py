@@ -0,0 +1,73 @@
+"""
+Benchmark: lista de dicionários (registos) vs. armazenamento colunar (DadosColunares).
+
+Compara o custo de manter os dados importados como `to_dict(orient="records")` e
+reconstruir um DataFrame em cada chamada, com o armazenamento colunar construído uma
+única vez na importação.
+
+Uso (na pasta graficos):
+    python benchmarks/bench_dados_colunares.py --linhas 1000000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from graficos.dados import DadosColunares  # noqa: E402
+
+
+def gerar_dataframe(linhas: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    categorias = np.array(["Alimentos", "Transporte", "Lazer", "Educação", "Saúde"])
+    return pd.DataFrame({
+        "Categoria": categorias[rng.integers(0, len(categorias), linhas)],
+        "Valor": rng.random(linhas) * 100,
+    })
+
+
+def medir(descricao: str, funcao) -> None:
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{descricao:<45} {duracao * 1000:>10.1f} ms {pico / 2**20:>10.1f} MB (pico)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = gerar_dataframe(args.linhas)
+    print(f"{args.linhas} linhas\n")
+
+    registos = None
+    colunar = None
+
+    def importar_registos():
+        nonlocal registos
+        registos = df.to_dict(orient="records")
+
+    def importar_colunar():
+        nonlocal colunar
+        colunar = DadosColunares(df.copy())
+
+    medir("Importação (lista de dicionários)", importar_registos)
+    medir("Importação (colunar)", importar_colunar)
+    medir("get_colunas_disponiveis (lista de dicionários)", lambda: list(pd.DataFrame(registos).columns))
+    medir("get_colunas_disponiveis (colunar)", lambda: colunar.colunas)
+    medir("Preparação do gráfico (lista de dicionários)", lambda: pd.DataFrame(registos)[["Categoria", "Valor"]])
+    medir("Preparação do gráfico (colunar)", lambda: colunar.frame[["Categoria", "Valor"]])
+    print(f"\nMemória do armazenamento colunar: {colunar.memoria_bytes() / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark do pipeline importar -> gerar -> gravar, com dados sintéticos.
+
+Para cada cenário é gerado um CSV (gerar_csv.py) e o pipeline do Model corre com uma
+HeadlessView, tal como no modo batch. Cada repetição corre num processo novo, para que o
+pico de memória (RSS máximo do processo) seja o do cenário e não o dos anteriores. É
+registado, por etapa, o tempo (mediana das repetições) e o pico de memória atingido até
+ao fim da etapa.
+
+Os resultados são gravados em JSON (com o commit atual) e podem ser comparados com os de
+outro commit: tempos ou memória acima do limiar são assinalados como regressões e o
+script termina com código 1.
+
+Uso (na pasta graficos):
+    python benchmarks/bench_pipeline.py --saida base.json
+    git checkout outro-ramo
+    python benchmarks/bench_pipeline.py --saida novo.json --comparar base.json
+    python benchmarks/bench_pipeline.py --resultados novo.json --comparar base.json   # sem correr
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gerar_csv import gerar_csv  # noqa: E402
+
+# Cenários por omissão: parâmetros do gerador (linhas a multiplicar por --escala) e,
+# opcionalmente, o tipo de gráfico (com 100 000 categorias só o gráfico de linhas faz sentido)
+# e a política de validação (o cenário "sujo" seria rejeitado na importação com a de omissão)
+CENARIOS: Dict[str, Dict[str, Any]] = {
+    "pequeno": {"linhas": 10_000, "categorias": 5},
+    "medio": {"linhas": 1_000_000, "categorias": 20},
+    "grande": {"linhas": 5_000_000, "categorias": 20},
+    "alta_cardinalidade": {"linhas": 1_000_000, "categorias": 100_000, "tipo": "Linhas"},
+    "colunas_largas": {"linhas": 1_000_000, "categorias": 20, "colunas_extra": 20},
+    "sujo": {"linhas": 1_000_000, "categorias": 20, "fracao_sujos": 0.01, "politica": "coagir"},
+}
+ETAPAS = ("importar", "gerar", "gravar")
+
+LIMIAR_TEMPO = 0.10          # Regressão: mais 10% de tempo...
+MINIMO_TEMPO_S = 0.02        # ...e pelo menos 20 ms de diferença (evita ruído em etapas rápidas)
+LIMIAR_MEMORIA = 0.10        # Regressão: mais 10% de pico de memória
+
+
+# =============================================================================
+# Execução de um cenário (num processo novo)
+# =============================================================================
+
+def _pico_memoria_mb() -> Optional[float]:
+    """RSS máximo do processo até agora (None se o sistema não o disponibilizar)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux devolve KB, macOS devolve bytes
+    return pico / 2**20 if sys.platform == "darwin" else pico / 1024
+
+
+def _executar_pipeline(caminho_csv: str, caminho_saida: str, tipo: str, usar_cache: bool, politica: Optional[str] = None) -> Dict[str, Any]:
+    os.environ["MPLBACKEND"] = "Agg"
+    from graficos.controller.ILogger import ILogger
+    from graficos.model import Model
+    from graficos.view.headlessview import HeadlessView
+
+    class LoggerSilencioso(ILogger):
+        def log_info(self, mensagem: str) -> None:
+            pass
+
+        def log_erro(self, mensagem: str) -> None:
+            pass
+
+    view = HeadlessView()
+    model = Model(view, LoggerSilencioso())
+    if not usar_cache:
+        model.cache_importacao = None
+    if politica:
+        model.politica_validacao = politica
+
+    etapas = {
+        "importar": lambda: model.importar_ficheiro(caminho_csv),
+        "gerar": lambda: model.gerar_grafico(tipo, "Categoria", "Valor"),
+        "gravar": lambda: model.gravar_grafico(caminho_saida),
+    }
+    resultado: Dict[str, Any] = {"etapas": {}, "memoria_inicial_mb": _pico_memoria_mb()}
+    for nome, etapa in etapas.items():
+        inicio = time.perf_counter()
+        etapa()
+        resultado["etapas"][nome] = {"segundos": time.perf_counter() - inicio, "pico_mb": _pico_memoria_mb()}
+        if view.erros:
+            break
+    resultado["sucesso"] = view.grafico_gravado and not view.erros
+    resultado["erros"] = view.erros
+    return resultado
+
+
+def executar_cenario(caminho_csv: str, tipo: str, repeticoes: int, usar_cache: bool, politica: Optional[str] = None) -> Dict[str, Any]:
+    contexto = multiprocessing.get_context("spawn")
+    execucoes = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        for _ in range(repeticoes):
+            # Um processo por repetição: memória e imports começam do zero
+            with contexto.Pool(1) as pool:
+                execucoes.append(pool.apply(_executar_pipeline, (caminho_csv, os.path.join(diretorio, "grafico.png"), tipo, usar_cache, politica)))
+
+    etapas = {}
+    for nome in ETAPAS:
+        medidas = [e["etapas"][nome] for e in execucoes if nome in e["etapas"]]
+        if medidas:
+            picos = [m["pico_mb"] for m in medidas if m["pico_mb"] is not None]
+            etapas[nome] = {
+                "segundos": statistics.median(m["segundos"] for m in medidas),
+                "segundos_min": min(m["segundos"] for m in medidas),
+                "pico_mb": max(picos) if picos else None,
+            }
+    return {
+        "sucesso": all(e["sucesso"] for e in execucoes),
+        "erros": execucoes[0]["erros"],
+        "etapas": etapas,
+        "total_segundos": sum(etapa["segundos"] for etapa in etapas.values()),
+    }
+
+
+# =============================================================================
+# Resultados e comparação
+# =============================================================================
+
+def commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(base: Dict[str, Any], novo: Dict[str, Any], limiar_tempo: float, limiar_memoria: float) -> List[str]:
+    """Mostra a variação de cada etapa entre dois resultados e devolve as regressões."""
+    regressoes = []
+    print(f"\nComparação: {base.get('commit')} -> {novo.get('commit')}\n")
+    print(f"{'Cenário / etapa':<32} {'base (s)':>9} {'novo (s)':>9} {'Δ tempo':>9} {'base MB':>9} {'novo MB':>9} {'Δ mem':>8}")
+    for cenario, resultado in novo["cenarios"].items():
+        anterior = base["cenarios"].get(cenario)
+        if anterior is None or anterior.get("parametros") != resultado.get("parametros"):
+            print(f"{cenario:<32} (sem resultado comparável na base)")
+            continue
+        for etapa, medida in resultado["etapas"].items():
+            medida_base = anterior["etapas"].get(etapa)
+            if medida_base is None:
+                continue
+            t0, t1 = medida_base["segundos"], medida["segundos"]
+            m0, m1 = medida_base.get("pico_mb"), medida.get("pico_mb")
+            dt = (t1 - t0) / t0 if t0 else 0.0
+            dm = (m1 - m0) / m0 if m0 and m1 else 0.0
+            marca = ""
+            if dt > limiar_tempo and t1 - t0 > MINIMO_TEMPO_S:
+                regressoes.append(f"{cenario}/{etapa}: tempo {t0:.3f} s -> {t1:.3f} s ({dt:+.0%})")
+                marca = " <- REGRESSÃO"
+            if dm > limiar_memoria:
+                regressoes.append(f"{cenario}/{etapa}: memória {m0:.0f} MB -> {m1:.0f} MB ({dm:+.0%})")
+                marca = " <- REGRESSÃO"
+            print(f"{cenario + '/' + etapa:<32} {t0:>9.3f} {t1:>9.3f} {dt:>+9.0%} "
+                  f"{m0 or 0:>9.0f} {m1 or 0:>9.0f} {dm:>+8.0%}{marca}")
+    return regressoes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplica o número de linhas de todos os cenários")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--tipo", choices=("Barras", "Linhas"), default="Barras", help="Tipo de gráfico dos cenários que não o fixam")
+    parser.add_argument("--cache", action="store_true", help="Usa a cache persistente de importações")
+    parser.add_argument("--dados", default=os.path.join(tempfile.gettempdir(), "graficos-bench"),
+                        help="Diretório dos CSV gerados (reaproveitados entre execuções)")
+    parser.add_argument("--saida", help="Ficheiro JSON onde os resultados são gravados")
+    parser.add_argument("--resultados", help="Não corre o benchmark: usa os resultados deste JSON")
+    parser.add_argument("--comparar", help="JSON de outro commit com que os resultados são comparados")
+    parser.add_argument("--limiar-tempo", type=float, default=LIMIAR_TEMPO)
+    parser.add_argument("--limiar-memoria", type=float, default=LIMIAR_MEMORIA)
+    args = parser.parse_args()
+
+    if args.resultados:
+        with open(args.resultados, encoding="utf-8") as f:
+            resultados = json.load(f)
+    else:
+        resultados = {
+            "commit": commit_atual(),
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeticoes": args.repeticoes,
+            "cenarios": {},
+        }
+        print(f"{'Cenário':<20} {'MB':>7} {'importar':>9} {'gerar':>9} {'gravar':>9} {'pico MB':>9}")
+        for nome in args.cenarios:
+            parametros = dict(CENARIOS[nome], linhas=int(CENARIOS[nome]["linhas"] * args.escala))
+            tipo = parametros.pop("tipo", args.tipo)
+            politica = parametros.pop("politica", None)
+            nome_ficheiro = "_".join(f"{chave}{valor}" for chave, valor in sorted(parametros.items())) + ".csv"
+            caminho = os.path.join(args.dados, nome_ficheiro)
+            if not os.path.exists(caminho):
+                gerar_csv(caminho, **parametros)
+
+            resultado = executar_cenario(caminho, tipo, args.repeticoes, args.cache, politica)
+            resultado["parametros"] = {**parametros, "tipo": tipo, "politica": politica, "cache": args.cache}
+            resultado["tamanho_mb"] = os.path.getsize(caminho) / 2**20
+            resultados["cenarios"][nome] = resultado
+
+            tempos = " ".join(f"{resultado['etapas'][e]['segundos']:>9.3f}" if e in resultado["etapas"] else f"{'-':>9}"
+                              for e in ETAPAS)
+            picos = [m["pico_mb"] for m in resultado["etapas"].values() if m["pico_mb"] is not None]
+            estado = "" if resultado["sucesso"] else f"  FALHA: {'; '.join(resultado['erros'])}"
+            print(f"{nome:<20} {resultado['tamanho_mb']:>7.1f} {tempos} {max(picos) if picos else 0:>9.0f}{estado}")
+
+        if args.saida:
+            with open(args.saida, "w", encoding="utf-8") as f:
+                json.dump(resultados, f, ensure_ascii=False, indent=2)
+            print(f"\nResultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(base, resultados, args.limiar_tempo, args.limiar_memoria)
+        for regressao in regressoes:
+            print(f"REGRESSÃO: {regressao}")
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
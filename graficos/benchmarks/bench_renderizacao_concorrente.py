@@ -0,0 +1,86 @@
+"""
+Benchmark/verificação: desenho de gráficos em série vs. num pool de threads.
+
+Cada gráfico é desenhado numa Figure própria (renderizacao.py), sem o estado global do
+pyplot. O script desenha os mesmos gráficos primeiro em série e depois em simultâneo num
+pool de threads, e confirma que as imagens (pixels RGBA) são iguais e que nenhuma figura
+ficou registada no pyplot. Termina com código 1 se alguma imagem for diferente.
+
+Uso (na pasta graficos):
+    python benchmarks/bench_renderizacao_concorrente.py --graficos 32 --threads 8
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib._pylab_helpers import Gcf
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from graficos.agregacao import estatisticas, resumir  # noqa: E402
+from graficos.renderizacao import renderizar_grafico  # noqa: E402
+
+Especificacao = Tuple[str, pd.DataFrame, str, str]
+
+
+def gerar_especificacoes(graficos: int, linhas: int) -> List[Especificacao]:
+    """Gráficos de barras e de linhas, alternados, cada um com dados e modo de erro diferentes."""
+    modos = ["ic", "dp", "ep", "nenhum"]
+    especificacoes = []
+    for i in range(graficos):
+        rng = np.random.default_rng(i)
+        if i % 2 == 0:
+            categorias = pd.Series(rng.choice([f"C{c}" for c in range(8)], linhas))
+            tipo = "barras"
+        else:
+            categorias = pd.Series(rng.integers(0, linhas // 10, linhas))
+            tipo = "linhas"
+        valores = pd.Series(rng.normal(50, 10, linhas))
+        tabela = estatisticas(resumir(valores, categorias.rename("x")), "x")
+        especificacoes.append((tipo, tabela, modos[i % len(modos)], f"Gráfico {i}"))
+    return especificacoes
+
+
+def desenhar(especificacao: Especificacao) -> bytes:
+    tipo, tabela, modo, titulo = especificacao
+    figura = renderizar_grafico(tipo, tabela, "x", "x", "media", titulo, modo).figura
+    figura.canvas.draw()
+    return bytes(figura.canvas.buffer_rgba())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graficos", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--linhas", type=int, default=20_000)
+    args = parser.parse_args()
+
+    especificacoes = gerar_especificacoes(args.graficos, args.linhas)
+
+    inicio = time.perf_counter()
+    em_serie = [desenhar(e) for e in especificacoes]
+    duracao_serie = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        em_paralelo = list(pool.map(desenhar, especificacoes))
+    duracao_paralelo = time.perf_counter() - inicio
+
+    diferentes = [i for i, (a, b) in enumerate(zip(em_serie, em_paralelo)) if a != b]
+    print(f"{args.graficos} gráficos, {args.linhas} linhas cada\n")
+    print(f"{'Em série':<30} {duracao_serie * 1000:>10.1f} ms")
+    print(f"{f'Pool de {args.threads} threads':<30} {duracao_paralelo * 1000:>10.1f} ms")
+    print(f"\nImagens iguais: {len(especificacoes) - len(diferentes)}/{len(especificacoes)}")
+    print(f"Figuras registadas no pyplot: {Gcf.get_num_fig_managers()}")
+    if diferentes:
+        print(f"Imagens diferentes: {diferentes}")
+    return 1 if diferentes or Gcf.get_num_fig_managers() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
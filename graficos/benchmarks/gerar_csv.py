@@ -0,0 +1,71 @@
+"""
+Gerador de ficheiros CSV sintéticos para os benchmarks.
+
+Os ficheiros têm as colunas obrigatórias (Categoria, Valor) e, opcionalmente, colunas
+numéricas extra. É possível escolher o número de linhas, o número de categorias
+distintas (cardinalidade) e a fração de valores "sujos" em Valor (texto, vazios, vírgula
+decimal), tal como aparecem em ficheiros reais. O mesmo conjunto de parâmetros (e
+semente) gera sempre o mesmo ficheiro.
+
+Uso (na pasta graficos):
+    python benchmarks/gerar_csv.py dados.csv --linhas 1000000 --categorias 50 --sujos 0.01
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+LINHAS_POR_BLOCO = 500_000
+VALORES_SUJOS = np.array(["", "n/a", "abc", "1,5", "-", "?"])
+
+
+def gerar_csv(caminho: str, linhas: int, colunas_extra: int = 0, categorias: int = 5, fracao_sujos: float = 0.0,
+              semente: int = 0) -> str:
+    """
+    Escreve o CSV em `caminho` (por blocos, com memória constante) e devolve o caminho.
+    :param categorias: Número de categorias distintas na coluna Categoria.
+    :param fracao_sujos: Fração (0 a 1) das linhas em que Valor não é um número válido.
+    """
+    rng = np.random.default_rng(semente)
+    nomes_categorias = np.array([f"Categoria {i:0{len(str(categorias))}d}" for i in range(categorias)])
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8", newline="") as ficheiro:
+        for inicio in range(0, max(linhas, 1), LINHAS_POR_BLOCO):
+            n = min(LINHAS_POR_BLOCO, linhas - inicio)
+            if n <= 0:
+                break
+            valores = np.round(rng.gamma(2.0, 50.0, n), 2)
+            bloco = {"Categoria": nomes_categorias[rng.integers(0, categorias, n)]}
+            if fracao_sujos > 0:
+                sujos = rng.random(n) < fracao_sujos
+                texto = valores.astype(str).astype(object)
+                texto[sujos] = VALORES_SUJOS[rng.integers(0, len(VALORES_SUJOS), int(sujos.sum()))]
+                bloco["Valor"] = texto
+            else:
+                bloco["Valor"] = valores
+            for i in range(colunas_extra):
+                bloco[f"Extra{i + 1}"] = rng.integers(0, 1000, n)
+            pd.DataFrame(bloco).to_csv(ficheiro, index=False, header=inicio == 0)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("caminho")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--colunas-extra", type=int, default=0)
+    parser.add_argument("--categorias", type=int, default=5)
+    parser.add_argument("--sujos", type=float, default=0.0, help="Fração de valores inválidos em Valor (0 a 1)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    gerar_csv(args.caminho, args.linhas, args.colunas_extra, args.categorias, args.sujos, args.semente)
+    print(f"{args.caminho}: {os.path.getsize(args.caminho) / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,27 @@
-from graficos.controller import Controller
-from graficos.view import View
+import os
+import sys
 
 
 def main() -> None:
-    controller = Controller(View)
-    controller.run()
+    # "graficos batch ..." corre sem interface gráfica (ver graficos/batch.py).
+    # Os imports são feitos aqui para que o modo batch não carregue o tkinter.
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from graficos.batch import main as main_batch
+        sys.exit(main_batch(sys.argv[2:]))
+
+    from graficos.controller import Controller
+    from graficos.view import View
+
+    # GRAFICOS_LOG=<ficheiro> (ou "-" para o stdout) troca o logger da consola por um
+    # logger em segundo plano, que escreve JSON sem bloquear a interface
+    logger = None
+    if os.environ.get("GRAFICOS_LOG"):
+        from graficos.controller.controllerQueueLogger import ControllerQueueLogger
+        logger = ControllerQueueLogger(os.environ["GRAFICOS_LOG"])
+
+    controller = Controller(View, logger)
+    try:
+        controller.run()
+    finally:
+        if logger is not None:
+            logger.fechar()
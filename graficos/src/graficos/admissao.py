@@ -0,0 +1,109 @@
+import os
+from typing import Dict, Optional
+
+from graficos.esquema import EsquemaCSV
+from graficos.importacao import LINHAS_POR_BLOCO
+
+# =============================================================================
+# Controlo de admissão: o ficheiro cabe em memória, é lido por blocos ou é recusado
+# =============================================================================
+
+# Modos de leitura decididos na importação
+MEMORIA = "memoria"       # As colunas do gráfico são lidas de uma vez para memória
+STREAMING = "streaming"   # O ficheiro é lido por blocos e agregado à medida que é lido
+REJEITAR = "rejeitar"     # Nem um bloco cabe no orçamento
+
+DESCRICOES_MODO: Dict[str, str] = {
+    MEMORIA: "leitura para memória",
+    STREAMING: "leitura por blocos",
+    REJEITAR: "ficheiro recusado",
+}
+
+FRACAO_MEMORIA_FISICA = 0.25   # Orçamento por omissão: fração da memória física
+ORCAMENTO_OMISSAO_MB = 1024    # Orçamento quando a memória física não é conhecida (ex.: Windows)
+# O pd.read_csv chega a ocupar mais do que o DataFrame final (buffers do parser, texto
+# ainda por converter); a estimativa do DataFrame é multiplicada por este fator
+FATOR_PICO_LEITURA = 2.0
+COLUNAS_GRAFICO = 2            # Colunas lidas para gerar um gráfico (x e y)
+
+
+def orcamento_memoria_mb() -> float:
+    """Orçamento de memória dos dados: $GRAFICOS_MEMORIA_MB ou uma fração da memória física."""
+    configurado = os.environ.get("GRAFICOS_MEMORIA_MB")
+    if configurado:
+        return max(1.0, float(configurado))
+    try:
+        fisica = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return float(ORCAMENTO_OMISSAO_MB)
+    return fisica * FRACAO_MEMORIA_FISICA / 2**20
+
+
+class EstimativaMemoria:
+    """
+    Memória que os dados ocupam num DataFrame, estimada a partir da amostra lida pela sonda
+    do esquema: bytes por linha de cada coluna (memory_usage com deep=True, que conta o
+    texto de cada valor) vezes o número de linhas estimado pelo tamanho do ficheiro. Uma
+    coluna de texto largo pesa assim muito mais do que o seu tamanho no CSV.
+    """
+    def __init__(self, linhas: int, bytes_por_coluna: Dict[str, float]) -> None:
+        self.linhas = linhas
+        self.bytes_por_coluna = bytes_por_coluna   # Bytes em memória por linha, de cada coluna
+
+    @classmethod
+    def da_amostra(cls, esquema: EsquemaCSV, tamanho_dados: int) -> "EstimativaMemoria":
+        """:param tamanho_dados: Tamanho do CSV descomprimido, em bytes (ver compressao.tamanho_dados)."""
+        amostra = esquema.amostra
+        linhas = len(amostra)
+        if esquema.bytes_por_linha > 0:
+            linhas = max(linhas, int((tamanho_dados - esquema.bytes_cabecalho) / esquema.bytes_por_linha))
+        memoria = amostra.memory_usage(index=False, deep=True)
+        return cls(linhas, {str(coluna): memoria[coluna] / max(len(amostra), 1) for coluna in amostra.columns})
+
+    def memoria_grafico(self) -> float:
+        """Pico (bytes) de ler para memória as colunas de um gráfico: as duas mais pesadas,
+        o pior caso para qualquer escolha de X e Y."""
+        pesos = sorted(self.bytes_por_coluna.values(), reverse=True)[:COLUNAS_GRAFICO]
+        return sum(pesos) * self.linhas * FATOR_PICO_LEITURA
+
+    def memoria_bloco(self) -> float:
+        """Pico (bytes) de um bloco da leitura por blocos, que lê todas as colunas (perfil e validação)."""
+        return sum(self.bytes_por_coluna.values()) * min(self.linhas, LINHAS_POR_BLOCO) * FATOR_PICO_LEITURA
+
+
+class DecisaoAdmissao:
+    """Modo de leitura escolhido, com as estimativas que o justificam (em MB)."""
+    def __init__(self, modo: str, estimativa: EstimativaMemoria, orcamento_mb: float) -> None:
+        self.modo = modo
+        self.linhas = estimativa.linhas
+        self.memoria_mb = estimativa.memoria_grafico() / 2**20
+        self.bloco_mb = estimativa.memoria_bloco() / 2**20
+        self.orcamento_mb = orcamento_mb
+
+    @property
+    def streaming(self) -> bool:
+        return self.modo == STREAMING
+
+    def __str__(self) -> str:
+        if self.modo == REJEITAR:
+            return (f"cada bloco de {LINHAS_POR_BLOCO} linhas ocupa ~{self.bloco_mb:.0f} MB, "
+                    f"acima do orçamento de {self.orcamento_mb:.0f} MB")
+        return (f"~{self.linhas} linhas, ~{self.memoria_mb:.1f} MB em memória "
+                f"(orçamento: {self.orcamento_mb:.0f} MB): {DESCRICOES_MODO[self.modo]}")
+
+
+def decidir_admissao(esquema: EsquemaCSV, tamanho_dados: int, orcamento_mb: Optional[float] = None) -> DecisaoAdmissao:
+    """
+    Compara a memória estimada com o orçamento: se as colunas de um gráfico cabem, são
+    lidas para memória; senão o ficheiro é lido por blocos (memória limitada a um bloco
+    e às estatísticas por categoria); se nem um bloco cabe, o ficheiro é recusado.
+    """
+    orcamento_mb = orcamento_mb or orcamento_memoria_mb()
+    estimativa = EstimativaMemoria.da_amostra(esquema, tamanho_dados)
+    if estimativa.memoria_bloco() / 2**20 > orcamento_mb:
+        modo = REJEITAR
+    elif estimativa.memoria_grafico() / 2**20 > orcamento_mb:
+        modo = STREAMING
+    else:
+        modo = MEMORIA
+    return DecisaoAdmissao(modo, estimativa, orcamento_mb)
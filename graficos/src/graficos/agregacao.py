@@ -0,0 +1,125 @@
+import math
+from statistics import NormalDist
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from graficos.opcoes import BARRAS_ERRO_OMISSAO, MODOS_BARRAS_ERRO, NIVEL_CONFIANCA  # noqa: F401
+
+# =============================================================================
+# Agregação por categoria (estatísticas desenhadas nos gráficos)
+# =============================================================================
+
+# Colunas do resumo parcial (combinável entre blocos/processos), indexado pela categoria
+COLUNAS_RESUMO = ["contagem", "soma", "media", "m2"]
+
+
+def resumir(valores: pd.Series, categorias: pd.Series) -> pd.DataFrame:
+    """
+    Resume os valores por categoria numa única passagem de groupby vetorizado.
+
+    Devolve, por categoria (pela ordem de aparição), a contagem, a soma, a média e a soma
+    dos quadrados dos desvios à média (m2), a partir da qual se obtém a variância.
+    """
+    grupos = valores.astype("float64").groupby(categorias, sort=False, observed=True)
+    resumo = grupos.agg(["count", "sum", "mean", "var"])
+    resumo.columns = ["contagem", "soma", "media", "m2"]
+    # m2 = variância amostral * (n - 1); grupos com um só valor têm variância NaN
+    resumo["m2"] = (resumo["m2"] * (resumo["contagem"] - 1)).fillna(0.0)
+    return resumo[resumo["contagem"] > 0]
+
+
+def combinar(resumos: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combina vários resumos parciais (de blocos ou processos) num só, com um único groupby
+    sobre os parciais concatenados. A soma dos quadrados dos desvios é recalculada em
+    relação à média combinada (fórmula paralela de Chan et al.), sem perda de precisão
+    mesmo com médias muito grandes.
+    """
+    if len(resumos) == 1:
+        return resumos[0]
+    todos = pd.concat(resumos)
+    chave = todos.index
+    contagem = todos["contagem"].groupby(chave, sort=False).sum()
+    soma = todos["soma"].groupby(chave, sort=False).sum()
+    media = (todos["media"] * todos["contagem"]).groupby(chave, sort=False).sum() / contagem
+    desvios = todos["media"] - media.reindex(chave).to_numpy()
+    m2 = (todos["m2"] + todos["contagem"] * desvios ** 2).groupby(chave, sort=False).sum()
+    return pd.DataFrame({"contagem": contagem, "soma": soma, "media": media, "m2": m2})
+
+
+def estatisticas(resumo: pd.DataFrame, coluna_categoria: str) -> pd.DataFrame:
+    """
+    Calcula as estatísticas finais de cada categoria a partir de um resumo:
+    média, soma, contagem, desvio padrão, erro padrão e a margem do intervalo de
+    confiança analítico (distribuição t de Student).
+    """
+    contagem = resumo["contagem"].to_numpy(dtype="float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        desvio = np.sqrt(resumo["m2"].to_numpy(dtype="float64") / (contagem - 1))
+        erro = desvio / np.sqrt(contagem)
+    desvio[contagem < 2] = np.nan
+    erro[contagem < 2] = np.nan
+    return pd.DataFrame({
+        coluna_categoria: resumo.index.to_numpy(),
+        "media": resumo["media"].to_numpy(dtype="float64"),
+        "soma": resumo["soma"].to_numpy(dtype="float64"),
+        "contagem": contagem.astype("int64"),
+        "desvio_padrao": desvio,
+        "erro_padrao": erro,
+        "margem_ic": erro * quantil_t(contagem - 1, NIVEL_CONFIANCA),
+    })
+
+
+def tabela_pontos(valores: pd.Series, x: pd.Series, coluna_x: str) -> pd.DataFrame:
+    """
+    Tabela com as mesmas colunas de estatisticas(), mas sem agregar: uma linha por ponto,
+    em que a média é o próprio valor. Com um só valor por ponto não há barras de erro.
+    Linhas sem x ou sem um valor numérico são ignoradas.
+    """
+    numeros = pd.to_numeric(valores, errors="coerce").astype("float64")
+    validos = numeros.notna() & x.notna()
+    y = numeros[validos].to_numpy()
+    return pd.DataFrame({
+        coluna_x: x[validos].to_numpy(),
+        "media": y,
+        "soma": y,
+        "contagem": np.ones(len(y), dtype="int64"),
+        "desvio_padrao": np.full(len(y), np.nan),
+        "erro_padrao": np.full(len(y), np.nan),
+        "margem_ic": np.full(len(y), np.nan),
+    })
+
+
+def quantil_t(graus_liberdade: np.ndarray, nivel: float = NIVEL_CONFIANCA) -> np.ndarray:
+    """
+    Valor crítico bilateral da distribuição t para cada número de graus de liberdade.
+    Exato para 1 e 2 graus; acima disso usa a expansão de Cornish-Fisher a partir do
+    quantil normal (erro < 0.01 a partir de 3 graus), sem depender do scipy.
+    """
+    p = 0.5 + nivel / 2
+    z = NormalDist().inv_cdf(p)
+    v = np.asarray(graus_liberdade, dtype="float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = (z
+             + (z**3 + z) / (4 * v)
+             + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+             + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3)
+             + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * v**4))
+    t = np.where(v == 1, math.tan(math.pi * (p - 0.5)), t)
+    t = np.where(v == 2, (2 * p - 1) / math.sqrt(2 * p * (1 - p)), t)
+    return np.where(v >= 1, t, np.nan)
+
+
+def calcular_barras_erro(tabela: pd.DataFrame, modo: str = BARRAS_ERRO_OMISSAO) -> Optional[np.ndarray]:
+    """
+    Devolve a meia-amplitude das barras de erro de cada categoria para o modo pedido,
+    ou None se o modo for "nenhum".
+    """
+    if modo not in MODOS_BARRAS_ERRO:
+        raise ValueError(f"Modo de barras de erro desconhecido: {modo}")
+    if modo == "nenhum":
+        return None
+    coluna = {"ic": "margem_ic", "dp": "desvio_padrao", "ep": "erro_padrao"}[modo]
+    return tabela[coluna].to_numpy()
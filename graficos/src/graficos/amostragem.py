@@ -0,0 +1,64 @@
+import numpy as np
+
+# =============================================================================
+# Redução de pontos para os gráficos de linhas (resolução visual)
+# =============================================================================
+
+# Fração da largura da figura ocupada pela área de desenho (descontando eixos e margens)
+FRACAO_AREA_DESENHO = 0.8
+# Cada balde contribui no máximo com 4 pontos: primeiro, mínimo, máximo e último
+PONTOS_POR_BALDE = 4
+
+
+def baldes_por_largura(largura_polegadas: float, dpi: float, fracao: float = FRACAO_AREA_DESENHO) -> int:
+    """Número de baldes (um por pixel horizontal) para uma figura com a largura e DPI dados."""
+    return max(1, int(largura_polegadas * dpi * fracao))
+
+
+def reduzir_min_max(x: np.ndarray, y: np.ndarray, baldes: int) -> np.ndarray:
+    """
+    Escolhe os índices dos pontos a desenhar, mantendo a forma visual da série.
+
+    O eixo x é dividido em `baldes` intervalos (um por pixel) e, de cada um, ficam o
+    primeiro e o último ponto e os pontos de valor mínimo e máximo. Os picos nunca se
+    perdem e a linha desenhada é visualmente igual à original, com no máximo
+    4 * baldes pontos. Tudo é vetorizado (reduceat), sem ciclos em Python.
+
+    :param x: Valores de x, já ordenados; se não forem numéricos usa-se a posição.
+    :param y: Valores de y (podem conter NaN).
+    :return: Índices (ordenados) dos pontos a manter.
+    """
+    n = len(y)
+    if n <= PONTOS_POR_BALDE * baldes:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype="float64")
+    balde = _baldes_dos_pontos(x, n, baldes)
+
+    # Início de cada balde não vazio (os baldes são não decrescentes)
+    inicios = np.flatnonzero(np.r_[True, balde[1:] != balde[:-1]])
+    fins = np.r_[inicios[1:], n] - 1
+    tamanhos = np.diff(np.r_[inicios, n])
+
+    # Mínimo/máximo de cada balde (fmin/fmax ignoram NaN) e o primeiro índice onde ocorrem
+    posicoes = np.arange(n)
+    minimos = np.repeat(np.fmin.reduceat(y, inicios), tamanhos)
+    maximos = np.repeat(np.fmax.reduceat(y, inicios), tamanhos)
+    indice_min = np.minimum.reduceat(np.where(y == minimos, posicoes, n), inicios)
+    indice_max = np.minimum.reduceat(np.where(y == maximos, posicoes, n), inicios)
+
+    # Baldes só com NaN não têm mínimo: ficam apenas o primeiro e o último ponto
+    indices = np.concatenate([inicios, fins, indice_min, indice_max])
+    return np.unique(indices[indices < n])
+
+
+def _baldes_dos_pontos(x: np.ndarray, n: int, baldes: int) -> np.ndarray:
+    # Com x numérico e crescente os baldes correspondem a intervalos iguais de x (pixels);
+    # caso contrário correspondem a grupos de pontos consecutivos
+    if np.issubdtype(np.asarray(x).dtype, np.number):
+        valores = np.asarray(x, dtype="float64")
+        inicio, fim = np.nanmin(valores), np.nanmax(valores)
+        if fim > inicio and np.all(np.diff(valores) >= 0):
+            balde = ((valores - inicio) / (fim - inicio) * baldes).astype(np.int64)
+            return np.minimum(balde, baldes - 1)
+    return np.arange(n) * baldes // n
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from graficos.controller.ILogger import ILogger
+
+# =============================================================================
+# Aquecimento em segundo plano (arranque rápido da interface)
+# =============================================================================
+# A interface arranca sem pandas, numpy, matplotlib nem seaborn: só o Model e o desenho
+# dos gráficos precisam deles. Enquanto o user escolhe o ficheiro, uma thread carrega
+# essas bibliotecas e desenha um gráfico mínimo, o que também prepara a cache de fontes
+# do matplotlib. Quando o primeiro gráfico é pedido, já não há nada a carregar.
+
+
+def aquecer(interface: bool = True) -> None:
+    """
+    Carrega as bibliotecas pesadas e desenha um gráfico mínimo fora do ecrã.
+    :param interface: Carrega também o backend Tk do matplotlib (usado para mostrar os gráficos).
+    """
+    import pandas as pd
+
+    import graficos.model  # noqa: F401  (pandas, numpy, matplotlib, seaborn)
+    from graficos.renderizacao import renderizar_grafico
+
+    # Desenhar texto carrega a lista de fontes (font_manager) e as fontes usadas
+    tabela = pd.DataFrame({"x": ["a", "b"], "media": [1.0, 2.0]})
+    renderizar_grafico("barras", tabela, "x", "x", "y", "aquecimento", "nenhum").figura.canvas.draw()
+
+    if interface:
+        import matplotlib.backends.backend_tkagg  # noqa: F401
+
+
+def aquecer_em_segundo_plano(logger: ILogger, interface: bool = True) -> threading.Thread:
+    """Executa aquecer() numa thread daemon. Erros são registados e nunca impedem o arranque."""
+    def executar() -> None:
+        inicio = time.perf_counter()
+        try:
+            aquecer(interface)
+            logger.log_info(f"aquecimento - Bibliotecas carregadas em {time.perf_counter() - inicio:.2f} s")
+        except Exception as e:
+            logger.log_erro(f"aquecimento - Falhou (as bibliotecas serão carregadas quando forem usadas): {e}")
+
+    thread = threading.Thread(target=executar, name="aquecimento", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,253 @@
+"""
+Modo batch: converte muitos ficheiros CSV em gráficos, sem interface gráfica.
+
+Cada ficheiro passa pelo mesmo pipeline do Model usado pela interface (importar, gerar,
+gravar), com uma HeadlessView no lugar da View em tkinter. Os ficheiros são distribuídos
+por um pool de processos.
+
+Uso:
+    graficos batch "dados/**/*.csv" --tipo barras --formato png --saida graficos/
+    graficos batch "dados/*.csv" --formato png svg pdf --saida graficos/
+    graficos batch a.csv b.csv --tipo linhas --x Categoria --y Valor --processos 4
+    graficos batch "dados/*.csv" --validacao descartar --minimo 0 --maximo 1000
+    graficos batch "arquivo/*.csv.gz" --formato png --saida graficos/
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Sequence, TextIO, Union
+
+from graficos.compressao import nome_sem_compressao
+from graficos.opcoes import (FORMATO_EXPORTACAO_OMISSAO, FORMATOS_EXPORTACAO, MODOS_BARRAS_ERRO, POLITICA_VALIDACAO_OMISSAO,
+                             POLITICAS_VALIDACAO, TIPO_GRAFICO_OMISSAO, TIPOS_GRAFICO)
+from graficos.controller.ILogger import ILogger
+
+# Códigos de saída do processo
+SAIDA_SUCESSO = 0
+SAIDA_FALHAS = 1
+SAIDA_SEM_FICHEIROS = 2
+
+
+class ResultadoFicheiro:
+    """Resultado do processamento de um ficheiro no modo batch."""
+    def __init__(self, caminho: str, saidas: List[str], sucesso: bool, mensagem: str, tamanho_bytes: int, segundos: float) -> None:
+        self.caminho = caminho
+        self.saidas = saidas
+        self.sucesso = sucesso
+        self.mensagem = mensagem
+        self.tamanho_bytes = tamanho_bytes
+        self.segundos = segundos
+
+    @property
+    def mb_por_segundo(self) -> float:
+        return self.tamanho_bytes / 2**20 / self.segundos if self.segundos > 0 else 0.0
+
+
+class _LoggerMemoria(ILogger):
+    """Logger que guarda os erros em memória em vez de escrever no terminal."""
+    def __init__(self, detalhado: bool = False) -> None:
+        self.detalhado = detalhado
+        self.erros: List[str] = []
+
+    def log_info(self, mensagem: str) -> None:
+        if self.detalhado:
+            print(f"[INFO] {mensagem}", file=sys.stderr)
+
+    def log_erro(self, mensagem: str) -> None:
+        self.erros.append(mensagem)
+        if self.detalhado:
+            print(f"[ERRO] {mensagem}", file=sys.stderr)
+
+
+# =============================================================================
+# Pipeline de um ficheiro (corre num processo do pool)
+# =============================================================================
+
+def _inicializar_processo() -> None:
+    # Backend sem janelas; cada processo do pool já é um grau de paralelismo, por isso a
+    # leitura paralela de ficheiros grandes (paralelo.py) fica desligada dentro dele
+    os.environ["MPLBACKEND"] = "Agg"
+    os.environ["GRAFICOS_PROCESSOS"] = "1"
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def processar_ficheiro(caminho: str, saida: Union[str, Sequence[str]], tipo: str, x: str, y: str, barras_erro: Optional[str] = None,
+                       titulo: Optional[str] = None, usar_cache: bool = False, detalhado: bool = False,
+                       validacao: str = POLITICA_VALIDACAO_OMISSAO, minimo: Optional[float] = None,
+                       maximo: Optional[float] = None, negativos: bool = True,
+                       memoria_mb: Optional[float] = None) -> ResultadoFicheiro:
+    """Importa o ficheiro, gera o gráfico e grava-o em `saida` (um ou vários ficheiros, um por
+    formato, todos a partir do mesmo desenho), tal como na interface. Os valores inválidos
+    são tratados segundo a política `validacao` (ver validacao.py)."""
+    # Importado aqui para que o backend do matplotlib já esteja definido
+    from graficos.model import Model
+    from graficos.validacao import RegrasValidacao
+    from graficos.view.headlessview import HeadlessView
+
+    saidas = [saida] if isinstance(saida, str) else list(saida)
+    inicio = time.perf_counter()
+    view = HeadlessView()
+    logger = _LoggerMemoria(detalhado)
+    model = Model(view, logger)
+    if not usar_cache:
+        model.cache_importacao = None
+    model.orcamento_memoria_mb = memoria_mb
+    model.politica_validacao = validacao
+    model.regras_validacao = RegrasValidacao(minimo, maximo, negativos)
+
+    model.importar_ficheiro(caminho)
+    if not view.erros:
+        titulo = titulo or nome_sem_compressao(caminho)
+        model.gerar_grafico(tipo, x, y, x, y, titulo, barras_erro=barras_erro)
+    if not view.erros and view.grafico_gerado:
+        model.gravar_grafico(saidas)
+
+    sucesso = view.grafico_gravado and not view.erros
+    mensagem = "; ".join(view.erros or logger.erros) if not sucesso else ""
+    tamanho = os.path.getsize(caminho) if os.path.exists(caminho) else 0
+    return ResultadoFicheiro(caminho, saidas, sucesso, mensagem, tamanho, time.perf_counter() - inicio)
+
+
+# =============================================================================
+# Execução do lote
+# =============================================================================
+
+def encontrar_ficheiros(padroes: Sequence[str]) -> List[str]:
+    """Expande os padrões glob (incluindo **) e devolve os ficheiros, sem repetidos."""
+    ficheiros = []
+    for padrao in padroes:
+        encontrados = sorted(glob.glob(padrao, recursive=True)) if glob.has_magic(padrao) else [padrao]
+        ficheiros.extend(f for f in encontrados if os.path.isfile(f))
+    return list(dict.fromkeys(ficheiros))
+
+
+def caminhos_saida(ficheiros: Sequence[str], diretorio: str, formatos: Union[str, Sequence[str]]) -> List[List[str]]:
+    """Ficheiros de saída de cada entrada (nome base, sem .csv nem a extensão de compressão, + cada
+    formato); nomes repetidos são numerados."""
+    formatos = [formatos] if isinstance(formatos, str) else list(dict.fromkeys(formatos))
+    usados = set()
+    saidas = []
+    for caminho in ficheiros:
+        base = nome_sem_compressao(caminho)
+        nome, n = base, 1
+        while nome in usados:
+            n += 1
+            nome = f"{base}_{n}"
+        usados.add(nome)
+        saidas.append([os.path.join(diretorio, f"{nome}.{formato}") for formato in formatos])
+    return saidas
+
+
+def executar_lote(ficheiros: Sequence[str], saidas: Sequence[Sequence[str]], processos: int, progresso: Optional[TextIO] = None,
+                  **opcoes) -> List[ResultadoFicheiro]:
+    """
+    Processa os ficheiros num pool de processos e devolve os resultados pela ordem de entrada.
+    :param opcoes: Argumentos de processar_ficheiro (tipo, x, y, barras_erro, ...).
+    """
+    resultados: List[Optional[ResultadoFicheiro]] = [None] * len(ficheiros)
+    if processos <= 1:
+        _inicializar_processo()
+        for indice, (caminho, saida) in enumerate(zip(ficheiros, saidas)):
+            resultados[indice] = processar_ficheiro(caminho, saida, **opcoes)
+            _mostrar_progresso(progresso, indice + 1, len(ficheiros), resultados[indice])
+        return resultados
+
+    # "spawn": cada processo começa limpo (sem estado do matplotlib/Tk herdado)
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(processos, len(ficheiros)), mp_context=contexto,
+                             initializer=_inicializar_processo) as pool:
+        futuros = {
+            pool.submit(processar_ficheiro, caminho, saida, **opcoes): indice
+            for indice, (caminho, saida) in enumerate(zip(ficheiros, saidas))
+        }
+        for feitos, futuro in enumerate(as_completed(futuros), start=1):
+            indice = futuros[futuro]
+            try:
+                resultados[indice] = futuro.result()
+            except Exception as e:
+                # Ex.: o processo terminou abruptamente (falta de memória)
+                resultados[indice] = ResultadoFicheiro(ficheiros[indice], list(saidas[indice]), False, str(e), 0, 0.0)
+            _mostrar_progresso(progresso, feitos, len(ficheiros), resultados[indice])
+    return resultados
+
+
+def _mostrar_progresso(destino: Optional[TextIO], feitos: int, total: int, resultado: ResultadoFicheiro) -> None:
+    if destino is not None:
+        estado = "OK" if resultado.sucesso else "FALHA"
+        print(f"[{feitos}/{total}] {estado} {resultado.caminho}", file=destino, flush=True)
+
+
+def imprimir_resumo(resultados: Sequence[ResultadoFicheiro], segundos: float, destino: TextIO = sys.stdout) -> None:
+    """Tabela por ficheiro (tempo, tamanho, débito) e débito total do lote."""
+    for r in resultados:
+        estado = "OK" if r.sucesso else "FALHA"
+        linha = f"{estado:<5} {r.segundos:8.2f} s {r.tamanho_bytes / 2**20:9.1f} MB {r.mb_por_segundo:8.1f} MB/s  {r.caminho}"
+        print(f"{linha} -> {', '.join(r.saidas)}" if r.sucesso else f"{linha}: {r.mensagem}", file=destino)
+
+    falhas = sum(1 for r in resultados if not r.sucesso)
+    total_mb = sum(r.tamanho_bytes for r in resultados) / 2**20
+    print("-" * 72, file=destino)
+    print(
+        f"{len(resultados)} ficheiros ({len(resultados) - falhas} OK, {falhas} com falha) em {segundos:.2f} s: "
+        f"{len(resultados) / segundos if segundos > 0 else 0:.2f} ficheiros/s, "
+        f"{total_mb / segundos if segundos > 0 else 0:.1f} MB/s",
+        file=destino,
+    )
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="graficos batch", description="Converte ficheiros CSV em gráficos, sem interface gráfica.")
+    parser.add_argument("entradas", nargs="+", help="Ficheiros ou padrões glob (ex.: 'dados/**/*.csv')")
+    parser.add_argument("--tipo", choices=TIPOS_GRAFICO, default=TIPO_GRAFICO_OMISSAO,
+                        help=f"Tipo de gráfico (por omissão: {TIPO_GRAFICO_OMISSAO})")
+    parser.add_argument("--x", default="Categoria", help="Coluna do eixo X (por omissão: Categoria)")
+    parser.add_argument("--y", default="Valor", help="Coluna do eixo Y (por omissão: Valor)")
+    parser.add_argument("--formato", nargs="+", choices=FORMATOS_EXPORTACAO, default=[FORMATO_EXPORTACAO_OMISSAO],
+                        help=f"Formato(s) das imagens, gravados a partir do mesmo desenho (por omissão: {FORMATO_EXPORTACAO_OMISSAO})")
+    parser.add_argument("--saida", default=".", help="Diretório onde as imagens são gravadas")
+    parser.add_argument("--barras-erro", choices=tuple(MODOS_BARRAS_ERRO), default=None, help="Barras de erro")
+    parser.add_argument("--titulo", default=None, help="Título dos gráficos (por omissão: nome do ficheiro)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1, help="Número de processos (por omissão: número de cores)")
+    parser.add_argument("--validacao", choices=tuple(POLITICAS_VALIDACAO), default=POLITICA_VALIDACAO_OMISSAO,
+                        help=f"Tratamento dos valores inválidos (por omissão: {POLITICA_VALIDACAO_OMISSAO})")
+    parser.add_argument("--minimo", type=float, default=None, help="Valor mínimo aceite na coluna Y")
+    parser.add_argument("--maximo", type=float, default=None, help="Valor máximo aceite na coluna Y")
+    parser.add_argument("--sem-negativos", action="store_true", help="Considera inválidos os valores negativos")
+    parser.add_argument("--memoria-mb", type=float, default=None,
+                        help="Orçamento de memória por ficheiro; acima dele os dados são lidos por blocos "
+                             "(por omissão: $GRAFICOS_MEMORIA_MB ou 1/4 da memória física)")
+    parser.add_argument("--cache", action="store_true", help="Usa a cache persistente de importações")
+    parser.add_argument("--detalhado", action="store_true", help="Mostra as mensagens do Model")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argumentos = criar_parser().parse_args(argv)
+
+    ficheiros = encontrar_ficheiros(argumentos.entradas)
+    if not ficheiros:
+        print("Nenhum ficheiro corresponde às entradas indicadas.", file=sys.stderr)
+        return SAIDA_SEM_FICHEIROS
+
+    os.makedirs(argumentos.saida, exist_ok=True)
+    saidas = caminhos_saida(ficheiros, argumentos.saida, argumentos.formato)
+
+    inicio = time.perf_counter()
+    resultados = executar_lote(
+        ficheiros, saidas, argumentos.processos, progresso=sys.stderr,
+        tipo=argumentos.tipo, x=argumentos.x, y=argumentos.y, barras_erro=argumentos.barras_erro,
+        titulo=argumentos.titulo, usar_cache=argumentos.cache, detalhado=argumentos.detalhado,
+        validacao=argumentos.validacao, minimo=argumentos.minimo, maximo=argumentos.maximo,
+        negativos=not argumentos.sem_negativos, memoria_mb=argumentos.memoria_mb,
+    )
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+    return SAIDA_FALHAS if any(not r.sucesso for r in resultados) else SAIDA_SUCESSO
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# Cache persistente de importações (formato colunar binário)
+# =============================================================================
+
+VERSAO_FORMATO = 2
+TAMANHO_MAX_CACHE_MB = 1024          # Limite de espaço em disco ocupado pela cache
+LIMITE_HASH_COMPLETO_MB = 64         # Acima deste tamanho só é feito hash de amostras
+BYTES_AMOSTRA_HASH = 1024 * 1024     # Bytes lidos no início e no fim para o hash amostral
+FICHEIRO_META = "meta.json"
+HASHES_MEMORIZADOS = 64              # Hashes de conteúdo guardados em memória (ficheiros distintos)
+
+
+def diretorio_cache_omissao() -> str:
+    """Diretório da cache: $GRAFICOS_CACHE_DIR ou ~/.cache/graficos."""
+    diretorio = os.environ.get("GRAFICOS_CACHE_DIR")
+    if diretorio:
+        return diretorio
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "graficos")
+
+
+def hash_conteudo(caminho: str, tamanho: int) -> str:
+    """
+    Hash do conteúdo do ficheiro. Ficheiros pequenos são lidos na íntegra; nos grandes
+    apenas o início e o fim são lidos (a alteração do tamanho/mtime já invalida a entrada).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(tamanho).encode())
+    with open(caminho, "rb") as ficheiro:
+        if tamanho <= LIMITE_HASH_COMPLETO_MB * 1024 * 1024:
+            for bloco in iter(lambda: ficheiro.read(BYTES_AMOSTRA_HASH), b""):
+                h.update(bloco)
+        else:
+            h.update(ficheiro.read(BYTES_AMOSTRA_HASH))
+            ficheiro.seek(-BYTES_AMOSTRA_HASH, os.SEEK_END)
+            h.update(ficheiro.read(BYTES_AMOSTRA_HASH))
+    return h.hexdigest()
+
+
+class CacheImportacao:
+    """
+    Cache em disco dos dados importados, num formato colunar binário.
+
+    Cada entrada é um diretório com um ficheiro .npy por coluna e um meta.json. As colunas
+    são guardadas à medida que vão sendo lidas (importação em duas fases), pelo que uma
+    entrada pode conter só parte das colunas do ficheiro. As colunas numéricas são abertas
+    com memory-map; as colunas de texto são guardadas como códigos inteiros (memory-mapped)
+    mais a lista de categorias. A entrada é identificada pelo caminho, tamanho e mtime do
+    ficheiro e validada pelo hash do conteúdo, calculado uma vez por versão do ficheiro
+    (caminho, tamanho, mtime e inode): os vários acessos de uma importação não voltam a
+    ler o ficheiro. Quando o espaço ocupado ultrapassa o limite,
+    as entradas usadas há mais tempo são removidas (LRU).
+    """
+    def __init__(self, diretorio: str, tamanho_max_bytes: int = TAMANHO_MAX_CACHE_MB * 1024 * 1024) -> None:
+        self.diretorio = diretorio
+        self.tamanho_max_bytes = tamanho_max_bytes
+        self.__hashes: Dict[Tuple[str, int, int, int], str] = {}
+
+    @classmethod
+    def por_omissao(cls) -> "CacheImportacao":
+        return cls(diretorio_cache_omissao())
+
+    # =========================================================================
+    # API pública
+    # =========================================================================
+
+    def obter(self, caminho: str, variante: str = "", colunas: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Devolve um DataFrame com as colunas pedidas que existem em cache (todas, se colunas
+        for None), ou None se a entrada não existir ou estiver desatualizada (tamanho, mtime
+        ou hash diferentes). Colunas pedidas que não estejam em cache são omitidas.
+        """
+        estado = os.stat(caminho)
+        entrada = self.__diretorio_entrada(caminho, estado, variante)
+        meta = self.__ler_meta(entrada, caminho, estado)
+        if meta is None:
+            return None
+
+        nomes = [nome for nome in (colunas if colunas is not None else meta["colunas"]) if nome in meta["colunas"]]
+        series = {}
+        for nome in nomes:
+            coluna = meta["colunas"][nome]
+            array = np.load(os.path.join(entrada, coluna["ficheiro"]), mmap_mode="r", allow_pickle=False)
+            if coluna["tipo"] == "categorica":
+                series[nome] = pd.Categorical.from_codes(array, categories=coluna["categorias"])
+            else:
+                series[nome] = array
+
+        # Regista o acesso para efeitos de LRU
+        os.utime(os.path.join(entrada, FICHEIRO_META))
+        return pd.DataFrame(series, columns=nomes, copy=False)
+
+    def guardar(self, caminho: str, frame: pd.DataFrame, variante: str = "") -> bool:
+        """
+        Acrescenta as colunas do frame à entrada do ficheiro (criando-a se necessário).
+        Devolve False se nenhuma coluna pôde ser representada no formato da cache.
+        """
+        estado = os.stat(caminho)
+        os.makedirs(self.diretorio, exist_ok=True)
+        entrada = self.__diretorio_entrada(caminho, estado, variante)
+        meta = self.__ler_meta(entrada, caminho, estado)
+        if meta is None:
+            meta = self.__criar_entrada(entrada, caminho, estado)
+
+        escritas = 0
+        for nome in frame.columns:
+            coluna = self.__escrever_coluna(entrada, str(nome), frame[nome])
+            if coluna is not None:
+                meta["colunas"][str(nome)] = coluna
+                escritas += 1
+        if not escritas:
+            return False
+
+        # O meta.json é substituído atomicamente: leitores nunca veem colunas incompletas
+        temporario = os.path.join(entrada, f".{FICHEIRO_META}.tmp")
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temporario, os.path.join(entrada, FICHEIRO_META))
+
+        self.limpar_excedente()
+        return True
+
+    def limpar_excedente(self) -> None:
+        """Remove as entradas menos usadas recentemente até respeitar o limite de tamanho."""
+        entradas = []
+        for nome in os.listdir(self.diretorio):
+            entrada = os.path.join(self.diretorio, nome)
+            ficheiro_meta = os.path.join(entrada, FICHEIRO_META)
+            if nome.startswith(".") or not os.path.isfile(ficheiro_meta):
+                continue
+            tamanho = sum(f.stat().st_size for f in os.scandir(entrada) if f.is_file())
+            entradas.append((os.stat(ficheiro_meta).st_mtime_ns, tamanho, entrada))
+
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, entrada in sorted(entradas):
+            if total <= self.tamanho_max_bytes:
+                break
+            shutil.rmtree(entrada, ignore_errors=True)
+            total -= tamanho
+
+    # =========================================================================
+    # Métodos auxiliares
+    # =========================================================================
+
+    def __diretorio_entrada(self, caminho: str, estado: os.stat_result, variante: str) -> str:
+        chave = f"{os.path.abspath(caminho)}|{estado.st_size}|{estado.st_mtime_ns}|{variante}"
+        return os.path.join(self.diretorio, hashlib.blake2b(chave.encode(), digest_size=16).hexdigest())
+
+    def __hash_conteudo(self, caminho: str, estado: os.stat_result) -> str:
+        """hash_conteudo memorizado: o ficheiro só é lido de novo se mudar (ou for substituído)."""
+        chave = (os.path.abspath(caminho), estado.st_size, estado.st_mtime_ns, estado.st_ino)
+        valor = self.__hashes.get(chave)
+        if valor is None:
+            if len(self.__hashes) >= HASHES_MEMORIZADOS:
+                self.__hashes.clear()
+            valor = self.__hashes[chave] = hash_conteudo(caminho, estado.st_size)
+        return valor
+
+    def __ler_meta(self, entrada: str, caminho: str, estado: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Lê o meta.json da entrada; entradas desatualizadas são removidas."""
+        ficheiro_meta = os.path.join(entrada, FICHEIRO_META)
+        if not os.path.isfile(ficheiro_meta):
+            return None
+        with open(ficheiro_meta, encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("versao") != VERSAO_FORMATO
+                or meta["tamanho"] != estado.st_size
+                or meta["mtime_ns"] != estado.st_mtime_ns
+                or meta["hash"] != self.__hash_conteudo(caminho, estado)):
+            shutil.rmtree(entrada, ignore_errors=True)
+            return None
+        return meta
+
+    def __criar_entrada(self, entrada: str, caminho: str, estado: os.stat_result) -> Dict[str, Any]:
+        # O diretório é criado à parte e renomeado, para nunca existir uma entrada a meio
+        temporario = tempfile.mkdtemp(prefix=".tmp-", dir=self.diretorio)
+        try:
+            os.replace(temporario, entrada)
+        except OSError:
+            # Outra importação criou a entrada entretanto
+            shutil.rmtree(temporario, ignore_errors=True)
+        return {
+            "versao": VERSAO_FORMATO,
+            "caminho": os.path.abspath(caminho),
+            "tamanho": estado.st_size,
+            "mtime_ns": estado.st_mtime_ns,
+            "hash": self.__hash_conteudo(caminho, estado),
+            "colunas": {},
+        }
+
+    @staticmethod
+    def __escrever_coluna(entrada: str, nome: str, serie: pd.Series) -> Optional[Dict[str, Any]]:
+        ficheiro = hashlib.blake2b(nome.encode(), digest_size=8).hexdigest() + ".npy"
+        temporario = os.path.join(entrada, f".{ficheiro}.tmp")
+        if pd.api.types.is_numeric_dtype(serie.dtype) and not pd.api.types.is_extension_array_dtype(serie.dtype):
+            coluna = {"tipo": "numpy", "ficheiro": ficheiro}
+            array = serie.to_numpy()
+        else:
+            # Texto e restantes tipos: códigos inteiros + categorias, pela ordem de aparição
+            codigos, categorias = pd.factorize(serie, use_na_sentinel=True)
+            categorias = list(categorias)
+            if not all(isinstance(c, str) for c in categorias):
+                return None
+            coluna = {"tipo": "categorica", "ficheiro": ficheiro, "categorias": categorias}
+            array = codigos.astype(np.int32)
+
+        with open(temporario, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(temporario, os.path.join(entrada, ficheiro))
+        return coluna
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import pandas as pd
+
+# =============================================================================
+# Cache em memória dos dados dos gráficos (LRU com limite de memória)
+# =============================================================================
+
+TAMANHO_MAX_CACHE_GRAFICOS_MB = 256   # Memória máxima ocupada pelos dados em cache
+
+
+def impressao_digital(caminho: str, variante: str = "") -> str:
+    """
+    Identifica um conjunto de dados: caminho, tamanho e mtime do ficheiro e as opções de
+    leitura (variante). Só usa o stat do ficheiro, por isso é imediata mesmo em ficheiros
+    grandes; qualquer alteração ao ficheiro produz uma impressão diferente.
+    """
+    estado = os.stat(caminho)
+    chave = f"{os.path.abspath(caminho)}|{estado.st_size}|{estado.st_mtime_ns}|{variante}"
+    return hashlib.blake2b(chave.encode(), digest_size=16).hexdigest()
+
+
+def tamanho_bytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class CacheGraficos:
+    """
+    Cache LRU, em memória, das estatísticas já agregadas que alimentam os gráficos.
+
+    A chave identifica o conjunto de dados (impressao_digital) e a especificação dos dados
+    do gráfico (colunas x e y). O tipo de gráfico, os rótulos, o título e as barras de erro
+    só mudam o desenho, que é feito a partir destas estatísticas: alternar entre "Barras" e
+    "Linhas", ou mudar o título, reaproveita a mesma entrada. Quando a memória ocupada
+    ultrapassa o limite, as entradas usadas há mais tempo são removidas.
+    """
+    def __init__(self, tamanho_max_bytes: int = TAMANHO_MAX_CACHE_GRAFICOS_MB * 1024 * 1024) -> None:
+        self.tamanho_max_bytes = tamanho_max_bytes
+        self.__entradas: "OrderedDict[Hashable, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+        # Contadores
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave: Hashable) -> Optional[pd.DataFrame]:
+        """Devolve os dados em cache (marcando-os como usados recentemente), ou None."""
+        with self.__lock:
+            entrada = self.__entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+            self.__entradas.move_to_end(chave)
+            self.acertos += 1
+            return entrada[0]
+
+    def guardar(self, chave: Hashable, dados: pd.DataFrame) -> bool:
+        """
+        Guarda os dados e remove as entradas menos usadas até respeitar o limite.
+        Devolve False (sem guardar) se os dados sozinhos excedem o limite.
+        """
+        tamanho = tamanho_bytes(dados) + sys.getsizeof(chave)
+        if tamanho > self.tamanho_max_bytes:
+            return False
+        with self.__lock:
+            anterior = self.__entradas.pop(chave, None)
+            if anterior is not None:
+                self.__bytes -= anterior[1]
+            self.__entradas[chave] = (dados, tamanho)
+            self.__bytes += tamanho
+            while self.__bytes > self.tamanho_max_bytes:
+                _, (_, removido) = self.__entradas.popitem(last=False)
+                self.__bytes -= removido
+                self.remocoes += 1
+        return True
+
+    def limpar(self) -> None:
+        with self.__lock:
+            self.__entradas.clear()
+            self.__bytes = 0
+
+    @property
+    def bytes_ocupados(self) -> int:
+        return self.__bytes
+
+    def __len__(self) -> int:
+        return len(self.__entradas)
+
+    def resumo(self) -> str:
+        """Contadores da cache, para o logger."""
+        pedidos = self.acertos + self.falhas
+        taxa = 100 * self.acertos / pedidos if pedidos else 0.0
+        return (
+            f"{self.acertos} acertos, {self.falhas} falhas ({taxa:.0f}% acertos), {self.remocoes} removidas, "
+            f"{len(self)} entradas, {self.__bytes / 2**20:.1f} de {self.tamanho_max_bytes / 2**20:.0f} MB"
+        )
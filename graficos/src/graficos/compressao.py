@@ -0,0 +1,141 @@
+import bz2
+import gzip
+import os
+import struct
+import zipfile
+from typing import BinaryIO, Optional
+
+# =============================================================================
+# Ficheiros CSV comprimidos (gzip, bzip2, zstd, zip), lidos sem descomprimir para disco
+# =============================================================================
+
+# Assinaturas (magic bytes) do início de cada formato; a extensão do ficheiro não conta
+ASSINATURAS = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "zstd": b"\x28\xb5\x2f\xfd",
+    "zip": b"PK\x03\x04",
+}
+# Extensões habituais dos ficheiros comprimidos (só para nomes de saída; a deteção usa as assinaturas)
+EXTENSOES = (".gz", ".bz2", ".zst", ".zip")
+# Razão de compressão assumida quando o formato não guarda o tamanho descomprimido
+# (valor típico de um CSV numérico; só serve para escolher o modo de leitura)
+FATOR_COMPRESSAO_ESTIMADO = 5
+
+
+class CompressaoNaoSuportadaErro(ValueError):
+    """Erro lançado quando o ficheiro está comprimido num formato que não pode ser lido aqui."""
+
+
+def detetar_compressao(caminho: str) -> Optional[str]:
+    """Formato de compressão do ficheiro ("gzip", "bz2", "zstd", "zip") ou None se for texto simples."""
+    with open(caminho, "rb") as ficheiro:
+        inicio = ficheiro.read(max(map(len, ASSINATURAS.values())))
+    return next((formato for formato, assinatura in ASSINATURAS.items() if inicio.startswith(assinatura)), None)
+
+
+def nome_sem_compressao(caminho: str) -> str:
+    """Nome do ficheiro sem diretório, extensão de compressão e extensão .csv ("a.csv.gz" -> "a")."""
+    nome = os.path.basename(caminho)
+    for extensao in EXTENSOES:
+        if nome.lower().endswith(extensao):
+            nome = nome[:-len(extensao)]
+            break
+    return os.path.splitext(nome)[0]
+
+
+def tamanho_dados(caminho: str) -> int:
+    """
+    Tamanho (em bytes) dos dados descomprimidos, exato ou estimado. É o tamanho que conta
+    para decidir se o ficheiro cabe em memória: um .gz de 10 MB pode ter 100 MB de CSV.
+    """
+    tamanho = os.path.getsize(caminho)
+    formato = detetar_compressao(caminho)
+    if formato is None:
+        return tamanho
+    if formato == "zip":
+        with zipfile.ZipFile(caminho) as arquivo:
+            return _membro_csv(arquivo).file_size
+    if formato == "gzip" and tamanho >= 4:
+        # Os últimos 4 bytes guardam o tamanho original módulo 2**32 (errado acima de 4 GB)
+        with open(caminho, "rb") as ficheiro:
+            ficheiro.seek(-4, os.SEEK_END)
+            return max(struct.unpack("<I", ficheiro.read(4))[0], tamanho)
+    return tamanho * FATOR_COMPRESSAO_ESTIMADO
+
+
+class FicheiroCSV:
+    """
+    Abre um ficheiro CSV, comprimido ou não, para leitura sequencial:
+
+        with FicheiroCSV(caminho) as ficheiro:
+            pd.read_csv(ficheiro.dados, ...)
+            ficheiro.bytes_lidos()
+
+    `dados` é o fluxo já descomprimido, lido à medida que o parser pede (nada é escrito em
+    disco). `bytes_lidos` é a posição no ficheiro em disco, ou seja, no fluxo comprimido:
+    comparada com o tamanho do ficheiro dá o progresso da leitura.
+    """
+    def __init__(self, caminho: str) -> None:
+        self.caminho = caminho
+        self.formato = detetar_compressao(caminho)
+        self.__bruto: BinaryIO = open(caminho, "rb")
+        try:
+            self.dados: BinaryIO = self.__descomprimir()
+        except BaseException:
+            self.__bruto.close()
+            raise
+
+    def __descomprimir(self) -> BinaryIO:
+        if self.formato is None:
+            return self.__bruto
+        if self.formato == "gzip":
+            return gzip.GzipFile(fileobj=self.__bruto, mode="rb")
+        if self.formato == "bz2":
+            return bz2.BZ2File(self.__bruto, mode="rb")
+        if self.formato == "zip":
+            self.__arquivo = zipfile.ZipFile(self.__bruto)
+            return self.__arquivo.open(_membro_csv(self.__arquivo))
+        return _abrir_zstd(self.__bruto)
+
+    def bytes_lidos(self) -> int:
+        return self.__bruto.tell()
+
+    def close(self) -> None:
+        if self.dados is not self.__bruto:
+            self.dados.close()
+        if self.formato == "zip":
+            self.__arquivo.close()
+        self.__bruto.close()
+
+    def __enter__(self) -> "FicheiroCSV":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _membro_csv(arquivo: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """O ficheiro .csv do arquivo zip (ou o único ficheiro, se não houver nenhum .csv)."""
+    ficheiros = [membro for membro in arquivo.infolist() if not membro.is_dir()]
+    csvs = [membro for membro in ficheiros if membro.filename.lower().endswith(".csv")]
+    if len(csvs) == 1 or (not csvs and len(ficheiros) == 1):
+        return (csvs or ficheiros)[0]
+    if not ficheiros:
+        raise CompressaoNaoSuportadaErro("O arquivo zip está vazio.")
+    raise CompressaoNaoSuportadaErro("O arquivo zip tem de conter um único ficheiro CSV.")
+
+
+def _abrir_zstd(bruto: BinaryIO) -> BinaryIO:
+    # zstd não faz parte da biblioteca padrão antes do Python 3.14: fica opcional
+    try:
+        from compression import zstd
+        return zstd.ZstdFile(bruto, mode="rb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise CompressaoNaoSuportadaErro(
+            "Ficheiro comprimido com zstd: é preciso instalar o pacote 'zstandard'.") from None
+    return zstandard.ZstdDecompressor().stream_reader(bruto, closefd=False)
@@ -1,4 +1,7 @@
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
 
 
 class ILogger(ABC):
@@ -8,4 +11,13 @@ class ILogger(ABC):
 
     @abstractmethod
     def log_erro(self, mensagem: str) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    @contextmanager
+    def medir_etapa(self, etapa: str) -> Iterator[None]:
+        """Regista a duração de uma etapa (bloco with). Os loggers podem registá-la de forma estruturada."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.log_info(f"{etapa} - Etapa concluída em {(time.perf_counter() - inicio) * 1000:.1f} ms")
@@ -1,10 +1,19 @@
-from typing import Callable
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from .controllerEvent import ControllerEvent
 from .controllerConsoleLogger import ControllerConsoleLogger
+from .metricasEventos import registo_latencias
 from .ILogger import ILogger
+from .tarefas import ExecutorTarefas, ViewNaInterface
 from graficos.view.IUserView import IUserView
-from graficos.model import Model
+from graficos.aquecimento import aquecer_em_segundo_plano
+from graficos.opcoes import INTERVALO_SEGUIMENTO_S
+
+if TYPE_CHECKING:
+    # O Model (pandas, matplotlib, seaborn) só é importado quando é usado pela primeira vez
+    from graficos.model import Model
 
 
 class MostraDlgCarregarFicheiroEvt(ControllerEvent):
@@ -36,26 +45,46 @@ class MostraDlgGravaGraficoEvt(ControllerEvent):
 class GravaGraficoEvt(ControllerEvent):
     """Evento emitido pelo Controller para informar o Model que deve gravar o gráfico 
     e em que localização do filesystem e com que nome gravá-lo.
+    Recebe a lista de ficheiros a gravar (um por formato).
     """
-    def add_handler(self, handler: Callable[[str], None]):
+    def add_handler(self, handler: Callable[[List[str]], None]):
         super().add_handler(handler)
 
-    def invoke(self, caminho: str) -> None:
-        super().invoke(caminho)
+    def invoke(self, caminhos: List[str]) -> None:
+        super().invoke(caminhos)
 
 
 class Controller:
-    def __init__(self, View: Callable[[ILogger], IUserView]) -> None:
+    def __init__(self, View: Callable[[ILogger], IUserView], logger: Optional[ILogger] = None) -> None:
         
-        #Instanciar o logger do Consoller
-        self.logger: ILogger = ControllerConsoleLogger()
+        #Instanciar o logger do Consoller (ou usar o logger recebido, ex.: ControllerQueueLogger)
+        self.logger: ILogger = logger or ControllerConsoleLogger()
 
         # Instanciar a View e o seu Logger
         self.view = View(self.logger)
         view = self.view
 
-        # Instanciar o Model, com logger injetado
-        self.model = model = Model(view, self.logger)
+        # Importação, geração e gravação correm numa thread de trabalho, para que o
+        # mainloop do Tk nunca bloqueie. O Model fala com a View através de um proxy
+        # que entrega as chamadas na thread da interface (via after()).
+        self.__executor = ExecutorTarefas(
+            self.logger, ao_mudar_estado=lambda em_curso: view.executar_na_interface(view.mostra_tarefa_em_curso, em_curso)
+        )
+        self.__view_interface = ViewNaInterface(view)
+
+        # O Model é criado quando é usado pela primeira vez (ver a propriedade model); até
+        # lá as bibliotecas de que depende são carregadas em segundo plano, enquanto o
+        # user escolhe o ficheiro
+        self.__model: Optional["Model"] = None
+        self.__lock_model = threading.Lock()
+        aquecer_em_segundo_plano(self.logger)
+
+        # Modo de seguimento: parâmetros do último gráfico pedido e o temporizador da
+        # próxima verificação do ficheiro (cada verificação é uma tarefa curta no executor)
+        self.__parametros_grafico: Optional[tuple] = None
+        self.__a_seguir = False
+        self.__temporizador_seguimento: Optional[threading.Timer] = None
+        self.__lock_seguimento = threading.Lock()
 
         # Definição de eventos do Controller
         self.__mostra_dlg_carregar_ficheiro_evt: MostraDlgCarregarFicheiroEvt = MostraDlgCarregarFicheiroEvt()
@@ -65,49 +94,122 @@ class Controller:
 
         # Subscrição de eventos emitidos pelo Controller
         self.__mostra_dlg_carregar_ficheiro_evt.add_handler(view.mostra_dlg_carregar_ficheiro)
-        self.__importar_ficheiro_evt.add_handler(model.importar_ficheiro)
+        # Uma nova importação torna obsoletas todas as tarefas anteriores
+        self.__importar_ficheiro_evt.add_handler(self.__em_segundo_plano(self.__importar_ficheiro, substituir=True))
         self.__mostra_dlg_grava_grafico_evt.add_handler(view.mostra_dlg_grava_grafico)
-        self.__grava_grafico_evt.add_handler(model.gravar_grafico)
+        self.__grava_grafico_evt.add_handler(self.__em_segundo_plano(self.__gravar_grafico))
+
+        # Subscrições de eventos da View (referências fracas: a View não mantém o Controller vivo)
+        view.importar_ficheiro_click_evt.add_handler_fraco(self.user_importa_ficheiro)
+        view.ficheiro_selecionado_evt.add_handler_fraco(self.user_seleciona_ficheiro)
+        view.grafico_selecionado_click_evt.add_handler_fraco(self.user_selecionou_grafico)
+        view.submissao_parametros_evt.add_handler_fraco(self.user_submeteu_parametros)
+        view.solicita_guardar_grafico_click_evt.add_handler_fraco(self.user_solicitou_gravacao)
+        view.grava_grafico_click_evt.add_handler_fraco(self.user_grava_grafico)
+        view.cancelar_tarefa_click_evt.add_handler_fraco(self.user_cancela_tarefa)
+        view.seguir_ficheiro_click_evt.add_handler_fraco(self.user_seguir_ficheiro)
+        view.alterar_aparencia_click_evt.add_handler_fraco(self.user_alterou_aparencia)
+        view.voltar_menu_click_evt.add_handler_fraco(self.user_voltou_menu)
+        view.galeria_click_evt.add_handler_fraco(self.user_pediu_galeria)
+        view.miniatura_selecionada_click_evt.add_handler_fraco(self.user_selecionou_miniatura)
 
-        # Subscrições de eventos da View
-        view.importar_ficheiro_click_evt.add_handler(self.user_importa_ficheiro)
-        view.ficheiro_selecionado_evt.add_handler(self.user_seleciona_ficheiro)
-        view.grafico_selecionado_click_evt.add_handler(self.user_selecionou_grafico)
-        view.submissao_parametros_evt.add_handler(self.user_submeteu_parametros)
-        view.solicita_guardar_grafico_click_evt.add_handler(self.user_solicitou_gravacao)
-        view.grava_grafico_click_evt.add_handler(self.user_grava_grafico)
+    @property
+    def model(self) -> "Model":
+        """Model, com logger injetado; é importado e criado no primeiro acesso."""
+        with self.__lock_model:
+            if self.__model is None:
+                from graficos.model import Model
+                self.__model = Model(self.__view_interface, self.logger)
+            return self.__model
 
     def run(self):
         try:
             self.logger.log_info("A iniciar a interface gráfica...")
             self.view.ativar_interface()
             self.logger.log_info("Interface encerrada com sucesso.")
+            self.__parar_seguimento()
+            self.__executor.encerrar()
+            if os.environ.get("GRAFICOS_LATENCIAS"):
+                self.despejar_latencias()
         except Exception as e:
             self.logger.log_erro(f"Falha crítica ao iniciar a interface: {str(e)}")
             print("Biblioteca de interface indisponível, falha crítica.")
             print(f"Contacte o suporte: erro {e}")
 
+    def despejar_latencias(self) -> None:
+        """Escreve no logger os histogramas de latência dos eventos e dos seus handlers."""
+        self.logger.log_info(f"Latências dos eventos:\n{registo_latencias.despejar()}")
+
     def user_importa_ficheiro(self) -> None:
         """User selecionou importar ficheiro"""
         self.__mostra_dlg_carregar_ficheiro_evt.invoke()
 
     def user_seleciona_ficheiro(self, caminho: str):
         """User selecionou um ficheiro para importar."""
+        self.__parar_seguimento()
         self.__importar_ficheiro_evt.invoke(caminho)
 
     def user_selecionou_grafico(self, tipo: str):
-        # Estas verrugas (chamadas diretas a componentes) que não queria aqui 
         self.tipo_grafico = tipo
-        # esta devia ter ter um evt e um handler
-        colunas = self.model.get_colunas_disponiveis()
         self.logger.log_info(f"user_selecionou_grafico() - Tipo de gráfico selecionado: {tipo}")
-        # e esta também
-        self.view.mostra_formulario_parametros(colunas)
-        self.logger.log_info(f"user_selecionou_grafico() - Colunas disponíveis: {colunas}")
+        # As colunas são pedidas ao Model na thread de trabalho, depois de uma importação ainda
+        # em curso; o Model responde à View com o evento colunas_disponiveis
+        self.__executor.submeter(self.__notificar_colunas)
+
+    def user_submeteu_parametros(self, x: str, y: str, x_label: str, y_label: str, barras_erro: str):
+        self.logger.log_info(f"user_submeteu_parametros() - Parâmetros submetidos: x={x}, y={y}, x_label='{x_label}', y_label='{y_label}', barras_erro='{barras_erro}'")
+        # Leitura, agregação e desenho correm todos na thread de trabalho: o Model desenha
+        # numa Figure própria (sem pyplot) e a View só a mostra, na thread da interface
+        self.__parar_seguimento()
+        self.__parametros_grafico = (self.tipo_grafico, x, y, x_label, y_label, barras_erro)
+        self.__executor.submeter(self.__gerar_grafico, *self.__parametros_grafico)
+
+    def user_voltou_menu(self) -> None:
+        """User voltou ao menu inicial: o gráfico mostrado (e guardado para gravação) é largado."""
+        self.logger.log_info("user_voltou_menu() - Utilizador voltou ao menu inicial")
+        self.__parar_seguimento()
+        self.__executor.submeter(self.__descartar_grafico, visivel=False)
+
+    def user_pediu_galeria(self, barras_erro: str) -> None:
+        """User pediu a galeria de miniaturas (um gráfico por par de colunas)."""
+        self.logger.log_info(f"user_pediu_galeria() - Galeria do tipo '{self.tipo_grafico}', barras_erro='{barras_erro}'")
+        self.__parar_seguimento()
+        self.__executor.submeter(self.__gerar_galeria, self.tipo_grafico, barras_erro)
+
+    def user_selecionou_miniatura(self, x: str, y: str, barras_erro: str) -> None:
+        """User escolheu uma miniatura da galeria: o gráfico desse par é gerado em tamanho normal."""
+        self.logger.log_info(f"user_selecionou_miniatura() - x={x}, y={y}")
+        self.user_submeteu_parametros(x, y, x, y, barras_erro)
+
+    def user_alterou_aparencia(self, x_label: str, y_label: str, titulo: str, barras_erro: str) -> None:
+        """User mudou rótulos, título ou barras de erro do gráfico mostrado."""
+        self.logger.log_info(f"user_alterou_aparencia() - x_label='{x_label}', y_label='{y_label}', titulo='{titulo}', barras_erro='{barras_erro}'")
+        if self.__parametros_grafico is not None:
+            tipo, x, y, _, _, _ = self.__parametros_grafico
+            self.__parametros_grafico = (tipo, x, y, x_label, y_label, barras_erro)
+        # Não há dados a ler nem a desenhar: o Model só reencaminha a nova aparência para a
+        # View, pela ordem das restantes tarefas (ex.: depois de uma geração ainda em curso)
+        self.__executor.submeter(self.__alterar_aparencia, x_label, y_label, titulo, barras_erro)
+
+    def user_seguir_ficheiro(self, ativo: bool) -> None:
+        """User ligou/desligou o seguimento do ficheiro (gráfico atualizado à medida que cresce)."""
+        self.logger.log_info(f"user_seguir_ficheiro() - Seguimento {'ligado' if ativo else 'desligado'}")
+        if not ativo:
+            self.__parar_seguimento()
+            self.view.mostra_mensagem_info("Seguimento do ficheiro terminado.")
+            return
+        if self.__parametros_grafico is None:
+            self.view.mostra_mensagem_info("Gere primeiro um gráfico.")
+            return
+        with self.__lock_seguimento:
+            self.__a_seguir = True
+        self.__executor.submeter(self.__iniciar_seguimento, *self.__parametros_grafico)
 
-    def user_submeteu_parametros(self, x: str, y: str, x_label: str, y_label: str):
-        self.logger.log_info(f"user_submeteu_parametros() - Parâmetros submetidos: x={x}, y={y}, x_label='{x_label}', y_label='{y_label}'")
-        self.model.gerar_grafico(self.tipo_grafico, x, y, x_label, y_label)
+    def user_cancela_tarefa(self) -> None:
+        """User cancelou a tarefa em curso."""
+        self.__executor.cancelar_todas()
+        self.view.mostra_mensagem_info("Operação cancelada.")
+        self.logger.log_info("user_cancela_tarefa() - Utilizador cancelou a tarefa em curso")
 
     def user_solicitou_gravacao(self):
         """User selecionou opção de gravar gráfico"""
@@ -115,9 +217,87 @@ class Controller:
         self.__mostra_dlg_grava_grafico_evt.invoke()
         self.logger.log_info("mostra_dlg_grava_grafico_evt - Utilizador solicitou guardar o gráfico")
 
-    def user_grava_grafico(self, caminho: str):
+    def user_grava_grafico(self, caminhos: List[str]):
         """User grava gráfico."""
-        # Notifica Model para gravar gráfico com a fullpath especificada
-        self.__grava_grafico_evt.invoke(caminho)
-        self.logger.log_info(f"grava_grafico_evt - Utilizador indicou caminho de gravação: {caminho}")
+        # Notifica Model para gravar gráfico nas fullpaths especificadas (uma por formato)
+        self.__grava_grafico_evt.invoke(caminhos)
+        self.logger.log_info(f"grava_grafico_evt - Utilizador indicou caminhos de gravação: {caminhos}")
+
+    # Execução em segundo plano
+    def __em_segundo_plano(self, funcao: Callable[..., None], substituir: bool = False) -> Callable[..., None]:
+        """Devolve um handler que submete a função ao executor em vez de a chamar."""
+        def submeter(*args) -> None:
+            self.__executor.submeter(funcao, *args, substituir=substituir)
+        submeter.__qualname__ = f"{funcao.__qualname__} (segundo plano)"
+        return submeter
+
+    # Tarefas executadas na thread de trabalho (o primeiro acesso a self.model importa-o lá)
+    def __importar_ficheiro(self, caminho: str) -> None:
+        with self.logger.medir_etapa("importar_ficheiro"):
+            self.model.importar_ficheiro(caminho)
+
+    def __notificar_colunas(self) -> None:
+        self.model.notifica_colunas_disponiveis()
+
+    def __gerar_grafico(self, tipo: str, x: str, y: str, x_label: str, y_label: str, barras_erro: str) -> None:
+        with self.logger.medir_etapa("gerar_grafico"):
+            self.model.gerar_grafico(tipo, x, y, x_label, y_label, barras_erro=barras_erro)
+
+    def __descartar_grafico(self) -> None:
+        # Sem Model ainda não há gráfico: não vale a pena criá-lo só para isto
+        if self.__model is not None:
+            self.model.descartar_grafico()
+
+    def __gerar_galeria(self, tipo: str, barras_erro: str) -> None:
+        with self.logger.medir_etapa("gerar_galeria"):
+            self.model.gerar_galeria(tipo, barras_erro=barras_erro)
+
+    def __alterar_aparencia(self, x_label: str, y_label: str, titulo: str, barras_erro: str) -> None:
+        self.model.alterar_aparencia(x_label, y_label, titulo, barras_erro)
+
+    def __gravar_grafico(self, caminhos: List[str]) -> None:
+        with self.logger.medir_etapa("gravar_grafico"):
+            self.model.gravar_grafico(caminhos)
+
+    def __iniciar_seguimento(self, tipo: str, x: str, y: str, x_label: str, y_label: str, barras_erro: str) -> None:
+        with self.logger.medir_etapa("iniciar_seguimento"):
+            self.model.iniciar_seguimento(tipo, x, y, x_label, y_label, barras_erro=barras_erro)
+        self.__agendar_seguimento()
+
+    def __atualizar_seguimento(self) -> None:
+        try:
+            self.model.atualizar_seguimento()
+        finally:
+            # Também depois de um cancelamento (só a verificação em curso é interrompida)
+            self.__agendar_seguimento()
+
+    # Seguimento do ficheiro
+    def __agendar_seguimento(self) -> None:
+        """Agenda a próxima verificação do ficheiro, se o seguimento continua ativo.
+
+        Cada verificação só é agendada depois de a anterior terminar: verificações lentas
+        nunca se acumulam na fila do executor.
+        """
+        with self.__lock_seguimento:
+            if not self.__a_seguir or not self.model.a_seguir:
+                return
+            self.__temporizador_seguimento = threading.Timer(INTERVALO_SEGUIMENTO_S, self.__submeter_seguimento)
+            self.__temporizador_seguimento.daemon = True
+            self.__temporizador_seguimento.start()
+
+    def __submeter_seguimento(self) -> None:
+        with self.__lock_seguimento:
+            if self.__a_seguir:
+                # Tarefa periódica: não mostra a indicação de tarefa em curso
+                self.__executor.submeter(self.__atualizar_seguimento, visivel=False)
 
+    def __parar_seguimento(self) -> None:
+        with self.__lock_seguimento:
+            if not self.__a_seguir:
+                return
+            self.__a_seguir = False
+            if self.__temporizador_seguimento is not None:
+                self.__temporizador_seguimento.cancel()
+                self.__temporizador_seguimento = None
+        # O estado do Model só é alterado na thread de trabalho
+        self.__executor.submeter(self.model.parar_seguimento, visivel=False)
@@ -1,4 +1,26 @@
-from typing import Callable, Any
+import time
+import weakref
+from typing import Callable, Any, List, Optional
+
+from .metricasEventos import registo_latencias
+
+
+class _Subscricao:
+    """Handler subscrito, com referência forte ou fraca (que não o mantém vivo)."""
+    def __init__(self, handler: Callable, fraca: bool) -> None:
+        self.nome: str = getattr(handler, "__qualname__", None) or repr(handler)
+        self.fraca = fraca
+        if not fraca:
+            self.__referencia = lambda: handler
+        elif hasattr(handler, "__self__") and hasattr(handler, "__func__"):
+            # Métodos ligados são recriados a cada acesso: é preciso um WeakMethod
+            self.__referencia = weakref.WeakMethod(handler)
+        else:
+            self.__referencia = weakref.ref(handler)
+
+    def handler(self) -> Optional[Callable]:
+        """O handler, ou None se era uma referência fraca e o objeto já foi destruído."""
+        return self.__referencia()
 
 
 class ControllerEvent:
@@ -7,26 +29,64 @@ class ControllerEvent:
     Esta classe pode ser instanciada na forma atual ou pode ser especializada de modo a 
     a especificar a assinatura do handler aceite de modo mais estrito (usando type-hints) 
     e/ou para implementar outras customizações desejadas.
+
+    Os handlers são notificados pela ordem de subscrição. A duração de cada invoke e de
+    cada handler é registada em histogramas quando a medição está ativa
+    ($GRAFICOS_LATENCIAS, ver metricasEventos.registo_latencias).
     """
     def __init__(self):
-        self.__handlers = set()
+        self.__handlers: List[_Subscricao] = []
+        self.__nome = type(self).__name__
 
     def add_handler(self, handler: Callable) -> None:
-        """Método chamado para realizar a subscrição de um evento."""
-        self.__handlers.add(handler)
-    
+        """Método chamado para realizar a subscrição de um evento.
+
+        Subscrever de novo um handler já subscrito não tem efeito.
+        """
+        self.__adicionar(handler, fraca=False)
+
+    def add_handler_fraco(self, handler: Callable) -> None:
+        """Subscrição por referência fraca: o evento não mantém o subscritor vivo.
+
+        Quando o objeto do método (ou a função) é destruído, o handler deixa de ser
+        notificado e é removido. Não usar com lambdas ou funções locais sem outra
+        referência, que seriam destruídas de imediato.
+        """
+        self.__adicionar(handler, fraca=True)
+
     def remove_handler(self, handler: Callable) -> None:
         """Remove um handler/subscritor por object identity.
         
         Se o handler não está presente, simplesmente retorna None.
         """
-        self.__handlers.discard(handler)
-    
+        self.__handlers = [s for s in self.__handlers if s.handler() != handler]
+
     def invoke(self, *args: Any, **kwargs: Any) -> None:
         """Realiza a notificação dos objectos subscritores.
 
         A classe/componente que implementa o evento chama este método quando a notificação
         dos subscritores deve ser realizada.
         """
-        for handler in self.__handlers:
-            handler(*args, **kwargs)
\ No newline at end of file
+        medir = registo_latencias.ativo
+        inicio_evento = time.perf_counter_ns() if medir else 0
+        # Cópia da lista: um handler pode subscrever ou remover handlers durante a notificação
+        for subscricao in list(self.__handlers):
+            handler = subscricao.handler()
+            if handler is None:
+                self.__handlers = [s for s in self.__handlers if s is not subscricao]
+                continue
+            if not medir:
+                handler(*args, **kwargs)
+                continue
+            inicio = time.perf_counter_ns()
+            try:
+                handler(*args, **kwargs)
+            finally:
+                registo_latencias.registar(self.__nome, time.perf_counter_ns() - inicio, subscricao.nome)
+        if medir:
+            registo_latencias.registar(self.__nome, time.perf_counter_ns() - inicio_evento)
+
+    def __adicionar(self, handler: Callable, fraca: bool) -> None:
+        if any(s.handler() == handler for s in self.__handlers):
+            return
+        self.__handlers.append(_Subscricao(handler, fraca))
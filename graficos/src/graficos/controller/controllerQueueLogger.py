@@ -0,0 +1,225 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .ILogger import ILogger
+
+TAMANHO_MAX_FICHEIRO_MB = 10     # Tamanho a partir do qual o ficheiro de log é rodado
+FICHEIROS_ROTACAO = 5            # Número de ficheiros antigos mantidos (log.1 ... log.5)
+REGISTOS_POR_LOTE = 1000         # Máximo de registos escritos de cada vez
+INTERVALO_ESCRITA_S = 0.2        # Tempo máximo que um registo espera na fila
+JANELA_REPETICOES_S = 1.0        # Janela do limite de mensagens repetidas
+MAX_REPETICOES = 5               # Repetições da mesma mensagem aceites por janela
+
+_FIM = object()  # Marca, na fila, o pedido de encerramento
+
+
+class ControllerQueueLogger(ILogger):
+    """Logger que não bloqueia quem regista: as mensagens vão para uma fila em memória.
+
+    Uma thread em segundo plano escreve-as em lotes, como JSON (uma linha por registo, com
+    data/hora, nível, thread e, nas etapas medidas, a duração), no stdout ou num ficheiro
+    rodado por tamanho. Mensagens iguais repetidas mais de MAX_REPETICOES vezes por segundo
+    são suprimidas e contadas num registo de resumo. fechar() escreve o que falta na fila e
+    é chamado automaticamente no fim do processo; os registos feitos depois disso são
+    escritos diretamente, por quem regista.
+    """
+    def __init__(self, caminho: Optional[str] = None, tamanho_max_bytes: int = TAMANHO_MAX_FICHEIRO_MB * 1024 * 1024,
+                 ficheiros_rotacao: int = FICHEIROS_ROTACAO, max_repeticoes: int = MAX_REPETICOES,
+                 janela_repeticoes_s: float = JANELA_REPETICOES_S) -> None:
+        """
+        :param caminho: Ficheiro de log; None (ou "-") escreve no stdout.
+        """
+        self.caminho = None if caminho in (None, "-") else caminho
+        self.tamanho_max_bytes = tamanho_max_bytes
+        self.ficheiros_rotacao = ficheiros_rotacao
+        self.max_repeticoes = max_repeticoes
+        self.janela_repeticoes_s = janela_repeticoes_s
+
+        self.__fila: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self.__destino: Optional[TextIO] = None
+        self.__fechado = False        # fechar() foi chamado: a fila deixa de ser escrita pela thread
+        self.__terminado = False      # fechar() terminou: os registos são escritos por quem regista
+        self.__lock_fechar = threading.Lock()
+        # Uma escrita de cada vez no destino (thread do logger, fechar() e registos depois de fechar)
+        self.__lock_escrita = threading.Lock()
+
+        # Limite de repetições: (nível, mensagem) -> aceites na janela atual, suprimidas
+        self.__repeticoes: Dict[Tuple[str, str], List[int]] = {}
+        self.__inicio_janela = time.monotonic()
+        self.__lock_repeticoes = threading.Lock()
+
+        self.__thread = threading.Thread(target=self.__escrever_em_lotes, name="logger", daemon=True)
+        self.__thread.start()
+        atexit.register(self.fechar)
+
+    # =========================================================================
+    # ILogger
+    # =========================================================================
+
+    def log_info(self, mensagem: str) -> None:
+        self.__registar("INFO", mensagem)
+
+    def log_erro(self, mensagem: str) -> None:
+        self.__registar("ERRO", mensagem)
+
+    @contextmanager
+    def medir_etapa(self, etapa: str) -> Iterator[None]:
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            self.__registar("INFO", f"{etapa} - Etapa concluída", etapa=etapa, duracao_ms=round(duracao_ms, 3))
+
+    def fechar(self) -> None:
+        """Escreve os registos pendentes e termina a thread. Pode ser chamado várias vezes."""
+        with self.__lock_fechar:
+            if self.__fechado:
+                return
+            self.__fechado = True
+        self.__fila.put(_FIM)
+        self.__thread.join()
+        atexit.unregister(self.fechar)
+        with self.__lock_escrita:
+            # Registos que entraram na fila enquanto a thread terminava
+            self.__escrever(self.__retirar_da_fila())
+            self.__fechar_destino()
+            self.__terminado = True
+
+    # =========================================================================
+    # Métodos auxiliares
+    # =========================================================================
+
+    def __registar(self, nivel: str, mensagem: str, **campos: Any) -> None:
+        # Chamado na thread de quem regista: apenas cria o registo e põe-o na fila
+        if self.__aceitar(nivel, mensagem):
+            self.__fila.put({"ts": time.time(), "nivel": nivel, "thread": threading.current_thread().name,
+                             "mensagem": mensagem, **campos})
+        if self.__fechado:
+            # Depois de fechar (ex.: mensagens no atexit de outros módulos) já não há thread
+            # a esvaziar a fila, onde também ficam os resumos das mensagens suprimidas
+            self.__escrever_depois_de_fechar()
+
+    def __escrever_depois_de_fechar(self) -> None:
+        with self.__lock_escrita:
+            # Enquanto fechar() não termina, é ele que escreve o que está na fila
+            if not self.__terminado:
+                return
+            self.__escrever(self.__retirar_da_fila())
+            self.__fechar_destino()
+
+    def __retirar_da_fila(self) -> List[Dict[str, Any]]:
+        registos = []
+        while True:
+            try:
+                registo = self.__fila.get_nowait()
+            except queue.Empty:
+                return registos
+            if registo is not _FIM:
+                registos.append(registo)
+
+    def __aceitar(self, nivel: str, mensagem: str) -> bool:
+        """Limite de mensagens repetidas: aceita as primeiras max_repeticoes por janela."""
+        with self.__lock_repeticoes:
+            agora = time.monotonic()
+            if agora - self.__inicio_janela >= self.janela_repeticoes_s:
+                self.__resumir_suprimidas()
+                self.__inicio_janela = agora
+            contadores = self.__repeticoes.setdefault((nivel, mensagem), [0, 0])
+            if contadores[0] < self.max_repeticoes:
+                contadores[0] += 1
+                return True
+            contadores[1] += 1
+            return False
+
+    def __resumir_suprimidas(self) -> None:
+        # Um registo por mensagem suprimida na janela que terminou; depois recomeça a contagem
+        for (nivel, mensagem), (_, suprimidas) in self.__repeticoes.items():
+            if suprimidas:
+                self.__fila.put({
+                    "ts": time.time(), "nivel": nivel, "thread": threading.current_thread().name,
+                    "mensagem": mensagem, "suprimidas": suprimidas,
+                })
+        self.__repeticoes = {}
+
+    def __escrever_em_lotes(self) -> None:
+        # Thread do logger: espera pelo primeiro registo e junta os que chegarem entretanto
+        while True:
+            try:
+                lote = [self.__fila.get(timeout=INTERVALO_ESCRITA_S)]
+            except queue.Empty:
+                continue
+            while len(lote) < REGISTOS_POR_LOTE:
+                try:
+                    lote.append(self.__fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            terminar = any(registo is _FIM for registo in lote)
+            if terminar:
+                with self.__lock_repeticoes:
+                    self.__resumir_suprimidas()
+                while True:
+                    try:
+                        lote.append(self.__fila.get_nowait())
+                    except queue.Empty:
+                        break
+            with self.__lock_escrita:
+                self.__escrever([registo for registo in lote if registo is not _FIM])
+            if terminar:
+                return
+
+    def __fechar_destino(self) -> None:
+        if self.__destino is not None and self.__destino is not sys.stdout:
+            self.__destino.close()
+        self.__destino = None
+
+    def __escrever(self, registos: List[Dict[str, Any]]) -> None:
+        # Chamado com o __lock_escrita
+        if not registos:
+            return
+        linhas = "".join(json.dumps(_formatar(registo), ensure_ascii=False) + "\n" for registo in registos)
+        try:
+            destino = self.__abrir_destino()
+            destino.write(linhas)
+            destino.flush()
+            if self.caminho is not None and destino.tell() >= self.tamanho_max_bytes:
+                self.__rodar()
+        except (OSError, ValueError) as e:
+            # Um problema no destino do log nunca pode interromper a aplicação
+            print(f"[ERRO] ControllerQueueLogger - Falha ao escrever o log: {e}", file=sys.stderr)
+
+    def __abrir_destino(self) -> TextIO:
+        if self.__destino is None:
+            if self.caminho is None:
+                self.__destino = sys.stdout
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+                self.__destino = open(self.caminho, "a", encoding="utf-8")
+        return self.__destino
+
+    def __rodar(self) -> None:
+        """log -> log.1 -> log.2 ...; o mais antigo é apagado."""
+        self.__fechar_destino()
+        for indice in range(self.ficheiros_rotacao - 1, 0, -1):
+            origem = f"{self.caminho}.{indice}"
+            if os.path.exists(origem):
+                os.replace(origem, f"{self.caminho}.{indice + 1}")
+        if self.ficheiros_rotacao > 0:
+            os.replace(self.caminho, f"{self.caminho}.1")
+        else:
+            os.remove(self.caminho)
+
+
+def _formatar(registo: Dict[str, Any]) -> Dict[str, Any]:
+    # A data/hora é formatada só na thread do logger (ISO 8601, UTC, milissegundos)
+    data = datetime.fromtimestamp(registo["ts"], tz=timezone.utc)
+    return {**registo, "ts": data.isoformat(timespec="milliseconds")}
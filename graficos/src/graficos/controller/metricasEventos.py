@@ -0,0 +1,106 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# =============================================================================
+# Histogramas de latência dos eventos e dos seus handlers
+# =============================================================================
+
+# Limites superiores (em microssegundos) dos intervalos do histograma: 1 µs, 2 µs, 4 µs,
+# ... ~67 s. Cada intervalo é o dobro do anterior, o que mantém o erro relativo dos
+# percentis abaixo de 2x com apenas 27 contadores por histograma.
+LIMITES_US: List[int] = [2 ** i for i in range(27)]
+
+
+class HistogramaLatencia:
+    """Histograma de latências com intervalos exponenciais (contagem, soma, máximo)."""
+    def __init__(self) -> None:
+        self.contagens: List[int] = [0] * (len(LIMITES_US) + 1)
+        self.total = 0
+        self.soma_ns = 0
+        self.maximo_ns = 0
+
+    def registar(self, duracao_ns: int) -> None:
+        # bit_length dá o índice do intervalo (potência de 2) sem pesquisa
+        indice = min((max(duracao_ns, 0) // 1000).bit_length(), len(LIMITES_US))
+        self.contagens[indice] += 1
+        self.total += 1
+        self.soma_ns += duracao_ns
+        if duracao_ns > self.maximo_ns:
+            self.maximo_ns = duracao_ns
+
+    @property
+    def media_ms(self) -> float:
+        return self.soma_ns / self.total / 1e6 if self.total else 0.0
+
+    def percentil_ms(self, percentil: float) -> float:
+        """Percentil aproximado (limite superior do intervalo onde se encontra)."""
+        if not self.total:
+            return 0.0
+        alvo = percentil / 100 * self.total
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo and contagem:
+                limite_us = LIMITES_US[indice] if indice < len(LIMITES_US) else self.maximo_ns / 1000
+                return min(limite_us / 1000, self.maximo_ns / 1e6)
+        return self.maximo_ns / 1e6
+
+
+class RegistoLatencias:
+    """
+    Latências de todos os eventos (ControllerEvent.invoke completo) e de cada handler,
+    agrupadas por nome. Partilhado por todos os eventos do processo e seguro entre threads.
+    Só mede quando está ativo: por omissão, apenas com $GRAFICOS_LATENCIAS definida (a mesma
+    variável que pede o despejo no fim); sem ela os eventos não pagam relógio nem lock.
+    """
+    def __init__(self, ativo: Optional[bool] = None) -> None:
+        self.ativo = bool(os.environ.get("GRAFICOS_LATENCIAS")) if ativo is None else ativo
+        self.__lock = threading.Lock()
+        self.__eventos: Dict[str, HistogramaLatencia] = {}
+        self.__handlers: Dict[Tuple[str, str], HistogramaLatencia] = {}
+
+    def registar(self, evento: str, duracao_ns: int, handler: Optional[str] = None) -> None:
+        """Regista a duração de um invoke (handler None) ou de um handler desse evento."""
+        with self.__lock:
+            if handler is None:
+                histograma = self.__eventos.setdefault(evento, HistogramaLatencia())
+            else:
+                histograma = self.__handlers.setdefault((evento, handler), HistogramaLatencia())
+            histograma.registar(duracao_ns)
+
+    def eventos(self) -> Dict[str, HistogramaLatencia]:
+        with self.__lock:
+            return dict(self.__eventos)
+
+    def handlers(self) -> Dict[Tuple[str, str], HistogramaLatencia]:
+        with self.__lock:
+            return dict(self.__handlers)
+
+    def limpar(self) -> None:
+        with self.__lock:
+            self.__eventos.clear()
+            self.__handlers.clear()
+
+    def despejar(self) -> str:
+        """
+        Tabela com as latências de cada evento e, abaixo dele, de cada handler, ordenada
+        pelo tempo total gasto (os mais lentos primeiro).
+        """
+        eventos, handlers = self.eventos(), self.handlers()
+        linhas = [f"{'Evento / handler':<60} {'n':>7} {'média':>9} {'p50':>9} {'p99':>9} {'máx':>9} (ms)"]
+        for evento, histograma in sorted(eventos.items(), key=lambda item: -item[1].soma_ns):
+            linhas.append(_linha(evento, histograma))
+            dele = [(nome, h) for (ev, nome), h in handlers.items() if ev == evento]
+            for nome, h in sorted(dele, key=lambda item: -item[1].soma_ns):
+                linhas.append(_linha(f"  {nome}", h))
+        return "\n".join(linhas)
+
+
+def _linha(nome: str, h: HistogramaLatencia) -> str:
+    return (f"{nome[:60]:<60} {h.total:>7} {h.media_ms:>9.3f} {h.percentil_ms(50):>9.3f} "
+            f"{h.percentil_ms(99):>9.3f} {h.maximo_ns / 1e6:>9.3f}")
+
+
+# Registo usado por todos os ControllerEvent
+registo_latencias = RegistoLatencias()
@@ -0,0 +1,157 @@
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from .ILogger import ILogger
+
+
+class TarefaCancelada(BaseException):
+    """Lançada dentro de uma tarefa quando esta foi cancelada.
+
+    Deriva de BaseException (tal como o asyncio.CancelledError) para não ser apanhada
+    pelos `except Exception` que convertem erros em eventos de falha.
+    """
+
+
+_contexto = threading.local()
+
+
+def tarefa_atual() -> Optional["Tarefa"]:
+    """Tarefa em execução na thread atual, ou None fora de uma tarefa (execução síncrona)."""
+    return getattr(_contexto, "tarefa", None)
+
+
+def verificar_cancelamento() -> None:
+    """Ponto de cancelamento: lança TarefaCancelada se a tarefa da thread atual foi cancelada.
+
+    Fora de uma tarefa não faz nada, por isso o Model pode chamá-lo sempre.
+    """
+    tarefa = tarefa_atual()
+    if tarefa is not None and tarefa.cancelada:
+        raise TarefaCancelada()
+
+
+class Tarefa:
+    """Trabalho submetido ao ExecutorTarefas, com identificador e pedido de cancelamento."""
+    def __init__(self, identificador: int, descricao: str, visivel: bool = True) -> None:
+        self.identificador = identificador
+        self.descricao = descricao
+        self.visivel = visivel
+        self.__cancelamento = threading.Event()
+        self.futuro: Optional[Future] = None
+
+    @property
+    def cancelada(self) -> bool:
+        return self.__cancelamento.is_set()
+
+    def cancelar(self) -> None:
+        """Pede o cancelamento: uma tarefa pendente não chega a correr; uma em curso para
+        no próximo ponto de cancelamento e os seus eventos deixam de chegar à View."""
+        self.__cancelamento.set()
+        if self.futuro is not None:
+            self.futuro.cancel()
+
+
+class ExecutorTarefas:
+    """Executa as operações demoradas (importar, gerar, gravar) numa thread de trabalho.
+
+    Uma única thread garante que as tarefas correm pela ordem de submissão e que o estado
+    do Model nunca é alterado por duas tarefas em simultâneo.
+    """
+    def __init__(self, logger: ILogger, ao_mudar_estado: Optional[Callable[[bool], None]] = None) -> None:
+        self.logger = logger
+        self.__ao_mudar_estado = ao_mudar_estado
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graficos-tarefas")
+        self.__identificadores = itertools.count(1)
+        self.__tarefas: List[Tarefa] = []
+        self.__lock = threading.Lock()
+
+    def submeter(self, funcao: Callable[..., Any], *args: Any, substituir: bool = False, visivel: bool = True) -> Tarefa:
+        """Submete uma função para execução em segundo plano.
+
+        :param substituir: Cancela primeiro todas as tarefas pendentes ou em curso (os seus
+                           resultados passam a ser obsoletos).
+        :param visivel: False para tarefas periódicas e curtas (ex.: seguimento de um ficheiro),
+                        que não mostram a indicação de tarefa em curso.
+        """
+        if substituir:
+            self.cancelar_todas()
+
+        tarefa = Tarefa(next(self.__identificadores), getattr(funcao, "__name__", str(funcao)), visivel)
+        with self.__lock:
+            self.__tarefas.append(tarefa)
+            primeira = visivel and sum(t.visivel for t in self.__tarefas) == 1
+        if primeira:
+            self.__notificar_estado(True)
+
+        tarefa.futuro = self.__executor.submit(self.__executar, tarefa, funcao, args)
+        tarefa.futuro.add_done_callback(lambda _: self.__terminar(tarefa))
+        return tarefa
+
+    def cancelar_todas(self) -> None:
+        with self.__lock:
+            tarefas = list(self.__tarefas)
+        for tarefa in tarefas:
+            tarefa.cancelar()
+        if tarefas:
+            self.logger.log_info(f"ExecutorTarefas - {len(tarefas)} tarefa(s) cancelada(s)")
+
+    def encerrar(self) -> None:
+        self.cancelar_todas()
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __executar(self, tarefa: Tarefa, funcao: Callable[..., Any], args: tuple) -> None:
+        if tarefa.cancelada:
+            return
+        _contexto.tarefa = tarefa
+        try:
+            funcao(*args)
+        except TarefaCancelada:
+            self.logger.log_info(f"ExecutorTarefas - Tarefa {tarefa.identificador} ({tarefa.descricao}) interrompida")
+        except Exception as e:
+            self.logger.log_erro(f"ExecutorTarefas - Erro na tarefa {tarefa.identificador} ({tarefa.descricao}): {e}")
+        finally:
+            _contexto.tarefa = None
+
+    def __terminar(self, tarefa: Tarefa) -> None:
+        with self.__lock:
+            if tarefa in self.__tarefas:
+                self.__tarefas.remove(tarefa)
+            vazia = tarefa.visivel and not any(t.visivel for t in self.__tarefas)
+        if vazia:
+            self.__notificar_estado(False)
+
+    def __notificar_estado(self, em_curso: bool) -> None:
+        if self.__ao_mudar_estado is not None:
+            self.__ao_mudar_estado(em_curso)
+
+
+class ViewNaInterface:
+    """Envolve a View para que as chamadas vindas das tarefas corram na thread da interface.
+
+    Cada método chamado é encaminhado através de `view.executar_na_interface`. As chamadas
+    feitas por uma tarefa entretanto cancelada (ex.: uma importação substituída por outra)
+    são descartadas, para que resultados obsoletos nunca cheguem ao ecrã.
+    """
+    def __init__(self, view: Any) -> None:
+        self.__view = view
+
+    def __getattr__(self, nome: str) -> Any:
+        atributo = getattr(self.__view, nome)
+        if not callable(atributo):
+            return atributo
+
+        def encaminhar(*args: Any, **kwargs: Any) -> None:
+            tarefa = tarefa_atual()
+
+            def executar() -> None:
+                if tarefa is not None and tarefa.cancelada:
+                    return
+                atributo(*args, **kwargs)
+            self.__view.executar_na_interface(executar)
+
+        encaminhar.__name__ = nome
+        # Nome do método da View nas métricas dos eventos (o tempo medido é só o do encaminhamento)
+        encaminhar.__qualname__ = getattr(atributo, "__qualname__", nome)
+        return encaminhar
@@ -0,0 +1,89 @@
+from typing import Callable, List, Optional, Sequence
+
+import pandas as pd
+
+# =============================================================================
+# Armazenamento colunar dos dados importados
+# =============================================================================
+
+# Função que lê do ficheiro apenas as colunas pedidas (projeção na leitura)
+CarregadorColunas = Callable[[List[str]], pd.DataFrame]
+
+
+class DadosColunares:
+    """
+    Armazena os dados importados em formato colunar (um array por coluna).
+
+    As operações seguintes (listar colunas, gerar gráficos) leem diretamente as colunas,
+    sem reconstruir DataFrames nem criar um dicionário Python por linha.
+
+    Quando é criado com um carregador (importação em duas fases), apenas os nomes das
+    colunas são conhecidos à partida: cada coluna só é lida do ficheiro quando é pedida
+    pela primeira vez e fica depois guardada para os pedidos seguintes.
+    """
+    def __init__(self, frame: Optional[pd.DataFrame] = None, colunas: Optional[Sequence[str]] = None,
+                 carregador: Optional[CarregadorColunas] = None) -> None:
+        self.__frame: pd.DataFrame = frame if frame is not None else pd.DataFrame()
+        self.__colunas: List[str] = list(colunas) if colunas is not None else [str(c) for c in self.__frame.columns]
+        self.__carregador = carregador
+
+    @classmethod
+    def vazio(cls) -> "DadosColunares":
+        return cls()
+
+    @classmethod
+    def preguicoso(cls, colunas: Sequence[str], carregador: CarregadorColunas) -> "DadosColunares":
+        """Cria um armazenamento que só conhece o esquema; as colunas são lidas a pedido."""
+        return cls(colunas=colunas, carregador=carregador)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """DataFrame com as colunas já carregadas (não é copiado)."""
+        return self.__frame
+
+    @property
+    def colunas(self) -> List[str]:
+        """Todas as colunas disponíveis, carregadas ou não."""
+        return list(self.__colunas)
+
+    @property
+    def colunas_carregadas(self) -> List[str]:
+        return [str(coluna) for coluna in self.__frame.columns]
+
+    @property
+    def n_linhas(self) -> int:
+        return len(self.__frame)
+
+    def tem_colunas(self, *colunas: str) -> bool:
+        return all(coluna in self.__colunas for coluna in colunas)
+
+    def garantir_colunas(self, colunas: Sequence[str]) -> pd.DataFrame:
+        """
+        Garante que as colunas pedidas estão em memória, lendo do ficheiro apenas as que
+        ainda faltam, e devolve um DataFrame só com essas colunas.
+        """
+        em_falta = [coluna for coluna in dict.fromkeys(colunas) if coluna not in self.__frame.columns]
+        if em_falta:
+            if self.__carregador is None:
+                raise KeyError(f"Colunas inexistentes: {', '.join(em_falta)}")
+            lidas = self.__carregador(em_falta)
+            if self.__frame.columns.empty:
+                self.__frame = lidas
+            else:
+                self.__frame = pd.concat([self.__frame, lidas.set_axis(self.__frame.index)], axis=1)
+        return self.__frame[list(colunas)]
+
+    def coluna(self, nome: str) -> pd.Series:
+        """Devolve a coluna pedida sem copiar os dados (lendo-a do ficheiro se necessário)."""
+        return self.garantir_colunas([nome])[nome]
+
+    def memoria_bytes(self) -> int:
+        """Memória ocupada pelas colunas carregadas (inclui o conteúdo das strings)."""
+        return int(self.__frame.memory_usage(index=True, deep=True).sum())
+
+    def __len__(self) -> int:
+        return self.n_linhas
+
+    def __bool__(self) -> bool:
+        # Num armazenamento preguiçoso existem dados desde que o esquema tenha colunas
+        return bool(self.__colunas) and (self.__carregador is not None or self.n_linhas > 0)
@@ -0,0 +1,124 @@
+import codecs
+import csv
+from typing import Dict, List, Sequence
+
+import pandas as pd
+
+from graficos.compressao import FicheiroCSV
+
+# =============================================================================
+# Sonda do esquema do ficheiro CSV (cabeçalho + amostra)
+# =============================================================================
+
+COLUNAS_OMISSAO = ("Categoria", "Valor")  # Eixos X/Y quando o utilizador não escolhe as colunas
+LINHAS_AMOSTRA = 1000                 # Linhas lidas para inferir os tipos das colunas
+BYTES_AMOSTRA = 64 * 1024             # Bytes lidos para detetar encoding e delimitador
+DELIMITADORES_CANDIDATOS = ",;\t|"
+ENCODINGS_CANDIDATOS = ("utf-8", "cp1252", "latin-1")
+
+
+class EsquemaCSV:
+    """
+    Resultado da sonda de um ficheiro CSV: delimitador, encoding, nomes das colunas e
+    tipos prováveis, obtidos a partir do cabeçalho e de uma pequena amostra de linhas.
+    """
+    def __init__(self, caminho: str, delimitador: str, encoding: str, amostra: pd.DataFrame, decimal: str = ".",
+                 bytes_cabecalho: int = 0, bytes_por_linha: float = 0.0) -> None:
+        self.caminho = caminho
+        self.delimitador = delimitador
+        self.encoding = encoding
+        self.decimal = decimal
+        self.amostra = amostra
+        self.bytes_cabecalho = bytes_cabecalho   # Tamanho da linha de cabeçalho no ficheiro (descomprimido)
+        self.bytes_por_linha = bytes_por_linha   # Tamanho médio de uma linha de dados no início do ficheiro
+        self.colunas: List[str] = [str(coluna) for coluna in amostra.columns]
+        self.tipos: Dict[str, str] = {str(coluna): str(tipo) for coluna, tipo in amostra.dtypes.items()}
+
+    def colunas_em_falta(self, obrigatorias: Sequence[str] = COLUNAS_OMISSAO) -> List[str]:
+        return [coluna for coluna in obrigatorias if coluna not in self.colunas]
+
+    def colunas_numericas_no_cabecalho(self) -> List[str]:
+        """Nomes de colunas que são números: o cabeçalho é, provavelmente, uma linha de dados."""
+        nomes = pd.to_numeric(pd.Series(self.colunas, dtype=object), errors="coerce")
+        return [coluna for coluna, numero in zip(self.colunas, nomes) if pd.notna(numero)]
+
+    def opcoes_leitura(self) -> Dict[str, str]:
+        """Argumentos a passar ao pd.read_csv para ler o ficheiro completo."""
+        return {"sep": self.delimitador, "encoding": self.encoding, "decimal": self.decimal}
+
+    def __repr__(self) -> str:
+        return (f"EsquemaCSV(delimitador={self.delimitador!r}, encoding={self.encoding!r}, "
+                f"decimal={self.decimal!r}, tipos={self.tipos!r})")
+
+
+def sondar_esquema(caminho: str, linhas_amostra: int = LINHAS_AMOSTRA) -> EsquemaCSV:
+    """
+    Lê apenas o início do ficheiro e deteta encoding, delimitador, colunas e tipos.
+    Nos ficheiros comprimidos só esse início é descomprimido.
+    Lança pd.errors.EmptyDataError se o ficheiro estiver vazio.
+    :param caminho: Caminho do ficheiro CSV.
+    :param linhas_amostra: Número de linhas de dados usadas para inferir os tipos.
+    """
+    with FicheiroCSV(caminho) as ficheiro:
+        inicio = ficheiro.dados.read(BYTES_AMOSTRA)
+    if not inicio.strip():
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+
+    encoding, texto = _detetar_encoding(inicio)
+    delimitador = _detetar_delimitador(texto)
+    amostra = _ler_amostra(caminho, linhas_amostra, sep=delimitador, encoding=encoding)
+
+    # Ficheiros exportados com ';' usam normalmente a vírgula como separador decimal
+    decimal = "."
+    if delimitador != "," and _usa_virgula_decimal(amostra):
+        decimal = ","
+        amostra = _ler_amostra(caminho, linhas_amostra, sep=delimitador, encoding=encoding, decimal=decimal)
+    return EsquemaCSV(caminho, delimitador, encoding, amostra, decimal, *_tamanho_linhas(inicio))
+
+
+def _tamanho_linhas(inicio: bytes):
+    """Bytes do cabeçalho e bytes médios por linha de dados, medidos nas linhas completas do início."""
+    cabecalho = inicio.find(b"\n") + 1 or len(inicio)
+    fim = inicio.rfind(b"\n") + 1
+    linhas = inicio.count(b"\n", cabecalho, fim)
+    if not linhas:
+        # Nenhuma linha de dados completa no início: cada linha tem pelo menos o que foi lido
+        return cabecalho, float(max(len(inicio) - cabecalho, 1))
+    return cabecalho, (fim - cabecalho) / linhas
+
+
+def _ler_amostra(caminho: str, linhas: int, **opcoes: str) -> pd.DataFrame:
+    with FicheiroCSV(caminho) as ficheiro:
+        return pd.read_csv(ficheiro.dados, nrows=linhas, **opcoes)
+
+
+def _detetar_encoding(inicio: bytes):
+    if inicio.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig", inicio[len(codecs.BOM_UTF8):].decode("utf-8", errors="replace")
+    for encoding in ENCODINGS_CANDIDATOS:
+        # Decoder incremental: um carácter multibyte cortado no fim da amostra não é erro
+        try:
+            return encoding, codecs.getincrementaldecoder(encoding)().decode(inicio, final=False)
+        except UnicodeDecodeError:
+            continue
+    return "latin-1", inicio.decode("latin-1")
+
+
+def _usa_virgula_decimal(amostra: pd.DataFrame) -> bool:
+    for coluna in amostra.columns:
+        valores = amostra[coluna]
+        if pd.api.types.is_numeric_dtype(valores):
+            continue
+        valores = valores.dropna().astype(str)
+        if len(valores) and valores.str.fullmatch(r"-?\d+(,\d+)?").all() and valores.str.contains(",").any():
+            return True
+    return False
+
+
+def _detetar_delimitador(texto: str) -> str:
+    linhas = texto.splitlines()[:20]
+    try:
+        return csv.Sniffer().sniff("\n".join(linhas), delimiters=DELIMITADORES_CANDIDATOS).delimiter
+    except csv.Error:
+        # Sem delimitador reconhecível (ex.: ficheiro com uma só coluna)
+        return ","
@@ -0,0 +1,86 @@
+import os
+import secrets
+import time
+from typing import List, Optional, Sequence, Union
+
+from matplotlib.figure import Figure
+
+from graficos.opcoes import FORMATOS_EXPORTACAO
+
+# =============================================================================
+# Exportação de uma figura para vários ficheiros/formatos
+# =============================================================================
+
+
+class FormatoNaoSuportadoErro(ValueError):
+    """Erro lançado quando a extensão de um destino não é um formato de exportação suportado."""
+
+
+class ResultadoExportacao:
+    """Resultado da gravação da figura num destino: formato, duração e tamanho (ou o erro)."""
+    def __init__(self, caminho: str, formato: str, segundos: float, tamanho_bytes: int = 0,
+                 erro: Optional[str] = None) -> None:
+        self.caminho = caminho
+        self.formato = formato
+        self.segundos = segundos
+        self.tamanho_bytes = tamanho_bytes
+        self.erro = erro
+
+    @property
+    def sucesso(self) -> bool:
+        return self.erro is None
+
+
+def normalizar_destinos(caminhos: Union[str, Sequence[str]]) -> List[str]:
+    """Aceita um caminho ou uma lista de caminhos; remove repetidos mantendo a ordem."""
+    if isinstance(caminhos, str):
+        caminhos = [caminhos]
+    return list(dict.fromkeys(caminhos))
+
+
+def formato_do_caminho(caminho: str) -> str:
+    formato = os.path.splitext(caminho)[1].lower().lstrip(".")
+    formato = "jpg" if formato == "jpeg" else formato
+    if formato not in FORMATOS_EXPORTACAO:
+        raise FormatoNaoSuportadoErro(
+            f"Formato não suportado: '{os.path.basename(caminho)}' (use {', '.join(FORMATOS_EXPORTACAO)})"
+        )
+    return formato
+
+
+def exportar_figura(figura: Figure, caminhos: Union[str, Sequence[str]]) -> List[ResultadoExportacao]:
+    """
+    Grava a mesma figura em todos os destinos (o formato vem da extensão de cada um).
+
+    Cada ficheiro é escrito primeiro num temporário, na mesma pasta, e só depois renomeado
+    para o destino (os.replace é atómico): um destino nunca fica com um ficheiro a meio,
+    mesmo que a gravação falhe ou seja interrompida. Uma falha num destino não impede os
+    restantes; fica registada no resultado desse destino.
+    """
+    resultados = []
+    for caminho in normalizar_destinos(caminhos):
+        inicio = time.perf_counter()
+        try:
+            formato = formato_do_caminho(caminho)
+        except FormatoNaoSuportadoErro as e:
+            resultados.append(ResultadoExportacao(caminho, "", 0.0, erro=str(e)))
+            continue
+
+        # Nome único na mesma pasta (o rename só é atómico dentro do mesmo sistema de ficheiros)
+        diretorio, nome = os.path.split(os.path.abspath(caminho))
+        temporario = os.path.join(diretorio, f".{nome}.{secrets.token_hex(4)}.tmp")
+        try:
+            with open(temporario, "xb") as ficheiro:
+                figura.savefig(ficheiro, format=formato)
+            os.replace(temporario, caminho)
+            resultados.append(
+                ResultadoExportacao(caminho, formato, time.perf_counter() - inicio, os.path.getsize(caminho))
+            )
+        except BaseException as e:
+            # Inclui o cancelamento da tarefa (TarefaCancelada): o temporário nunca fica para trás
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            if not isinstance(e, Exception):
+                raise
+            resultados.append(ResultadoExportacao(caminho, formato, time.perf_counter() - inicio, erro=str(e)))
+    return resultados
@@ -0,0 +1,214 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from graficos.agregacao import tabela_pontos
+from graficos.importacao import AgregadorCategorias
+from graficos.perfil import PONTOS, PerfilDados
+from graficos.validacao import RegrasValidacao, converter_numeros, tratar_invalidos
+
+# =============================================================================
+# Galeria de miniaturas: um gráfico por par de colunas, desenhados num pool de processos
+# =============================================================================
+
+# Modos de escolha dos pares
+PARES = "pares"          # Todos os pares X/Y que fazem sentido (começando pela coluna de categoria)
+CATEGORIA = "categoria"  # Só a coluna de categoria contra cada coluna numérica
+MODOS_GALERIA = (PARES, CATEGORIA)
+
+TAMANHO_MINIATURA = (2.4, 1.6)   # Polegadas
+DPI_MINIATURA = 80               # 192x128 píxeis
+TAMANHO_LETRA_MINIATURA = 6
+MAX_MINIATURAS = 36
+# Um X de texto com mais valores distintos do que este limite (ex.: identificadores) não
+# dá uma miniatura legível: só entra como X se for numérico e o gráfico for de linhas
+MAX_CATEGORIAS_MINIATURA = 50
+
+# Par (x, y) de uma miniatura
+Par = Tuple[str, str]
+# Notificação de cada miniatura concluída: (índice do par, PNG ou None, mensagem de erro ou None)
+MiniaturaConcluida = Callable[[int, Optional[bytes], Optional[str]], None]
+
+
+def pares_galeria(perfil: PerfilDados, tipo: str, modo: str = PARES, maximo: int = MAX_MINIATURAS) -> List[Par]:
+    """
+    Pares (x, y) a desenhar, escolhidos pelo perfil (sem ler os dados): y é sempre uma
+    coluna numérica; primeiro a coluna de categoria sugerida contra cada coluna numérica
+    e, no modo PARES, depois os restantes X. Só entram os X que fazem sentido para o tipo
+    de gráfico (ver MAX_CATEGORIAS_MINIATURA), incluindo o sugerido.
+    """
+    if modo not in MODOS_GALERIA:
+        raise ValueError(f"Modo de galeria desconhecido: {modo}")
+    linhas = tipo.lower() == "linhas"
+
+    def x_legivel(x: str) -> bool:
+        return perfil[x].distintos <= MAX_CATEGORIAS_MINIATURA or (linhas and perfil[x].numerica)
+
+    x_sugerido, _ = perfil.sugerir_eixos()
+    numericas = perfil.colunas_numericas()
+    pares = [(x_sugerido, y) for y in numericas if y != x_sugerido] if x_sugerido and x_legivel(x_sugerido) else []
+    if modo == PARES:
+        eixos_x = [x for x in perfil.colunas if x != x_sugerido and x_legivel(x)]
+        pares += [(x, y) for x in eixos_x for y in numericas if y != x]
+    return pares[:maximo]
+
+
+class DadosPartilhados:
+    """
+    Colunas de uma galeria copiadas uma vez para um bloco de memória partilhada
+    (multiprocessing.shared_memory), que os processos de trabalho mapeiam sem cópia:
+    cada tarefa envia apenas o par de colunas, nunca os dados.
+
+      - colunas X numéricas: os valores, tal como estão;
+      - restantes colunas X: os códigos do factorize (os valores distintos, muito menos,
+        vão para os processos uma única vez, na inicialização);
+      - colunas Y: os números (float64) e a máscara dos valores em falta, já convertidos
+        (ver validacao.converter_numeros), prontos para a política de validação.
+
+    Quem cria o bloco é quem o liberta (close), no fim da galeria.
+    """
+    def __init__(self, frame: pd.DataFrame, colunas_x: Sequence[str], colunas_y: Sequence[str]) -> None:
+        arrays: Dict[Tuple[str, str], np.ndarray] = {}
+        self.categorias: Dict[str, pd.Index] = {}
+        for coluna in colunas_x:
+            serie = frame[coluna]
+            if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "biuf":
+                arrays[("x", coluna)] = serie.to_numpy()
+            else:
+                codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+                arrays[("x", coluna)] = codigos
+                self.categorias[coluna] = pd.Index(unicos)
+        for coluna in colunas_y:
+            arrays[("y", coluna)], arrays[("em_falta", coluna)] = converter_numeros(frame[coluna])
+
+        # Cada array começa num múltiplo de 8 bytes (alinhamento de int64/float64)
+        self.disposicao: Dict[Tuple[str, str], Tuple[int, str, int]] = {}
+        desvio = 0
+        for chave, array in arrays.items():
+            desvio += -desvio % 8
+            self.disposicao[chave] = (desvio, array.dtype.str, len(array))
+            desvio += array.nbytes
+        self.memoria = SharedMemory(create=True, size=max(desvio, 1))
+        try:
+            for chave, array in arrays.items():
+                _vista(self.memoria, self.disposicao[chave])[:] = array
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def nome(self) -> str:
+        return self.memoria.name
+
+    def close(self) -> None:
+        self.memoria.close()
+        self.memoria.unlink()
+
+    def __enter__(self) -> "DadosPartilhados":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _vista(memoria: SharedMemory, posicao: Tuple[int, str, int]) -> np.ndarray:
+    desvio, tipo, linhas = posicao
+    return np.ndarray((linhas,), dtype=np.dtype(tipo), buffer=memoria.buf, offset=desvio)
+
+
+# Estado de cada processo de trabalho, preenchido uma vez por _ligar
+_memoria: Optional[SharedMemory] = None
+_disposicao: Dict[Tuple[str, str], Tuple[int, str, int]] = {}
+_categorias: Dict[str, pd.Index] = {}
+
+
+def _ligar(nome: str, disposicao: Dict[Tuple[str, str], Tuple[int, str, int]], categorias: Dict[str, pd.Index]) -> None:
+    """Inicialização do processo de trabalho: mapeia o bloco de memória partilhada."""
+    global _memoria, _disposicao, _categorias
+    # track=False: o bloco pertence a quem o criou; este processo não o deve apagar ao sair
+    _memoria = SharedMemory(name=nome, track=False)
+    _disposicao, _categorias = disposicao, categorias
+
+
+def _coluna_x(coluna: str) -> pd.Series:
+    valores = _vista(_memoria, _disposicao[("x", coluna)])
+    if coluna in _categorias:
+        # Os códigos -1 (valor em falta) ficam NaN e são ignorados, como no groupby
+        return pd.Series(pd.Categorical.from_codes(valores, categories=_categorias[coluna]), name=coluna)
+    return pd.Series(valores, name=coluna, copy=False)
+
+
+def _desenhar_miniatura(tipo: str, x: str, y: str, estrategia: str, regras: RegrasValidacao, politica: str,
+                        barras_erro: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """Tarefa do processo de trabalho: calcula a tabela do par e devolve o gráfico em PNG."""
+    # Importados aqui: o processo principal não precisa do matplotlib para preparar a galeria
+    import matplotlib
+    from graficos.renderizacao import renderizar_grafico
+
+    try:
+        numeros, ficam = tratar_invalidos(_vista(_memoria, _disposicao[("y", y)]),
+                                          _vista(_memoria, _disposicao[("em_falta", y)]), y, regras, politica)
+    except ValueError as e:
+        return None, str(e)
+    categorias = _coluna_x(x)
+    if ficam is not None:
+        categorias = categorias[ficam]
+    valores = pd.Series(numeros, index=categorias.index, name=y)
+    if estrategia == PONTOS:
+        tabela = tabela_pontos(valores, categorias, x)
+    else:
+        agregador = AgregadorCategorias(x, y)
+        agregador.adicionar(pd.DataFrame({x: categorias, y: valores}))
+        tabela = agregador.resultado()
+    if tabela.empty:
+        return None, "Sem valores para desenhar."
+
+    with matplotlib.rc_context({"font.size": TAMANHO_LETRA_MINIATURA}):
+        grafico = renderizar_grafico(tipo, tabela, x, x, y, f"{y} por {x}", barras_erro,
+                                     tamanho=TAMANHO_MINIATURA, dpi=DPI_MINIATURA)
+        imagem = io.BytesIO()
+        grafico.figura.savefig(imagem, format="png", dpi=DPI_MINIATURA)
+    return imagem.getvalue(), None
+
+
+def gerar_miniaturas(frame: pd.DataFrame, tipo: str, pares: Sequence[Par], estrategias: Sequence[str],
+                     regras: RegrasValidacao, politica: str, barras_erro: str, processos: int,
+                     concluida: MiniaturaConcluida) -> None:
+    """
+    Desenha a miniatura de cada par num pool de processos e chama `concluida` à medida
+    que cada uma termina (pela ordem de conclusão, não pela dos pares). Os dados são
+    passados aos processos em memória partilhada (ver DadosPartilhados).
+    `concluida` pode interromper a galeria (ex.: tarefa cancelada): as miniaturas que
+    ainda não começaram são canceladas e a memória partilhada é libertada. Um erro numa
+    miniatura (desenho, processo de trabalho que terminou) é entregue como a mensagem de
+    erro dessa miniatura; as restantes continuam a chegar.
+    """
+    if not pares:
+        return
+    colunas_x = list(dict.fromkeys(x for x, _ in pares))
+    colunas_y = list(dict.fromkeys(y for _, y in pares))
+    with DadosPartilhados(frame, colunas_x, colunas_y) as partilhados:
+        # "spawn" evita fazer fork de um processo com threads (interface, tarefas em segundo plano)
+        contexto = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=min(processos, len(pares)), mp_context=contexto, initializer=_ligar,
+                                   initargs=(partilhados.nome, partilhados.disposicao, partilhados.categorias))
+        try:
+            futuros = {
+                pool.submit(_desenhar_miniatura, tipo, x, y, estrategia, regras, politica, barras_erro): indice
+                for indice, ((x, y), estrategia) in enumerate(zip(pares, estrategias))
+            }
+            for futuro in as_completed(futuros):
+                try:
+                    imagem, erro = futuro.result()
+                except Exception as e:
+                    imagem, erro = None, str(e) or type(e).__name__
+                concluida(futuros[futuro], imagem, erro)
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
@@ -0,0 +1,108 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from graficos.agregacao import COLUNAS_RESUMO, combinar, estatisticas, resumir
+from graficos.compressao import FicheiroCSV
+
+# =============================================================================
+# Leitura de ficheiros CSV por blocos (streaming)
+# =============================================================================
+
+# Número de linhas lidas de cada vez no modo streaming. Limita o pico de memória
+# independentemente do tamanho total do ficheiro.
+LINHAS_POR_BLOCO = 100_000
+# Número de resumos parciais acumulados antes de serem combinados num só
+PARCIAIS_ANTES_DE_COMBINAR = 16
+
+
+def ler_csv_por_blocos(caminho: str, linhas_por_bloco: int = LINHAS_POR_BLOCO, **opcoes: Any) -> Iterator[Tuple[pd.DataFrame, int, int]]:
+    """
+    Lê um ficheiro CSV (comprimido ou não, ver compressao.py) em blocos de tamanho limitado.
+
+    Para cada bloco devolve um tuplo (bloco, bytes_lidos, bytes_totais), permitindo
+    a quem chama reportar o progresso da leitura. Nos ficheiros comprimidos os bytes
+    são os do ficheiro em disco (o tamanho descomprimido não é conhecido à partida).
+    :param caminho: Caminho do ficheiro CSV.
+    :param linhas_por_bloco: Número máximo de linhas por bloco.
+    :param opcoes: Argumentos adicionais para o pd.read_csv (ex.: sep, encoding).
+    """
+    bytes_totais = max(1, _tamanho_ficheiro(caminho))
+    with FicheiroCSV(caminho) as ficheiro:
+        with pd.read_csv(ficheiro.dados, chunksize=linhas_por_bloco, **opcoes) as leitor:
+            for bloco in leitor:
+                # O parser lê à frente em buffers, por isso a posição é aproximada
+                bytes_lidos = min(ficheiro.bytes_lidos(), bytes_totais)
+                yield bloco, bytes_lidos, bytes_totais
+
+
+def ler_csv(caminho: str, **opcoes: Any) -> pd.DataFrame:
+    """Lê o ficheiro CSV completo (comprimido ou não) de uma só vez."""
+    with FicheiroCSV(caminho) as ficheiro:
+        return pd.read_csv(ficheiro.dados, **opcoes)
+
+
+def _tamanho_ficheiro(caminho: str) -> int:
+    with open(caminho, "rb") as ficheiro:
+        ficheiro.seek(0, 2)
+        return ficheiro.tell()
+
+
+class ValoresNaoNumericosErro(ValueError):
+    """Erro lançado quando a coluna de valores contém entradas não numéricas."""
+
+
+class AgregadorCategorias:
+    """
+    Agrega incrementalmente (bloco a bloco) a contagem, a soma, a média e a variância
+    dos valores por categoria.
+
+    Apenas o resumo agregado é mantido em memória, por isso o consumo de memória
+    depende do número de categorias distintas e não do número de linhas do ficheiro.
+    """
+    def __init__(self, coluna_categoria: str = "Categoria", coluna_valor: str = "Valor") -> None:
+        self.coluna_categoria = coluna_categoria
+        self.coluna_valor = coluna_valor
+        self.linhas = 0
+        self.__parciais: List[pd.DataFrame] = []
+
+    def adicionar(self, bloco: pd.DataFrame) -> None:
+        """Agrega um novo bloco de dados ao resultado acumulado."""
+        valores = bloco[self.coluna_valor]
+        if not pd.api.types.is_numeric_dtype(valores):
+            convertidos = pd.to_numeric(valores, errors="coerce")
+            if (convertidos.isna() & valores.notna()).any():
+                raise ValoresNaoNumericosErro(f"A coluna '{self.coluna_valor}' contém valores não numéricos.")
+            valores = convertidos
+
+        self.__acumular(resumir(valores, bloco[self.coluna_categoria]), len(bloco))
+
+    def juntar(self, outro: "AgregadorCategorias") -> None:
+        """Junta o resultado parcial de outro agregador (ex.: calculado noutro processo)."""
+        resumo = outro.__resumo()
+        if resumo is not None:
+            self.__acumular(resumo, outro.linhas)
+
+    def __acumular(self, resumo: pd.DataFrame, linhas: int) -> None:
+        # Os parciais são combinados em lote: combinar a cada bloco repetiria o trabalho
+        # sobre todas as categorias já vistas (quadrático com muitas categorias)
+        self.__parciais.append(resumo)
+        if len(self.__parciais) >= PARCIAIS_ANTES_DE_COMBINAR:
+            self.__parciais = [combinar(self.__parciais)]
+        self.linhas += linhas
+
+    def __resumo(self) -> Optional[pd.DataFrame]:
+        if not self.__parciais:
+            return None
+        self.__parciais = [combinar(self.__parciais)]
+        return self.__parciais[0]
+
+    def resultado(self) -> pd.DataFrame:
+        """
+        Devolve um DataFrame com uma linha por categoria (pela ordem de aparição) e as
+        estatísticas respetivas: media, soma, contagem, desvio_padrao, erro_padrao e margem_ic.
+        """
+        resumo = self.__resumo()
+        if resumo is None:
+            return estatisticas(pd.DataFrame(columns=COLUNAS_RESUMO), self.coluna_categoria)
+        return estatisticas(resumo, self.coluna_categoria)
@@ -1,13 +1,34 @@
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple, Union
 from graficos.controller.controllerEvent import ControllerEvent
 from graficos.controller.ILogger import ILogger
+from graficos.controller.tarefas import verificar_cancelamento
 from graficos.view.IUserView import IUserView
 
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import traceback
 import os
+from functools import partial
+
+from graficos.admissao import REJEITAR, decidir_admissao
+from graficos.agregacao import BARRAS_ERRO_OMISSAO, tabela_pontos
+from graficos.cache import CacheImportacao
+from graficos.cache_graficos import CacheGraficos, impressao_digital
+from graficos.compressao import detetar_compressao, tamanho_dados
+from graficos.dados import DadosColunares
+from graficos.exportacao import exportar_figura
+from graficos.galeria import PARES, gerar_miniaturas, pares_galeria
+from graficos.esquema import COLUNAS_OMISSAO, EsquemaCSV, sondar_esquema
+from graficos.importacao import AgregadorCategorias, ValoresNaoNumericosErro, ler_csv, ler_csv_por_blocos
+from graficos.opcoes import POLITICA_VALIDACAO_OMISSAO
+from graficos.paralelo import (agregar_csv_paralelo, analisar_csv_paralelo, ler_csv_paralelo, numero_processos,
+                               usar_leitura_paralela)
+from graficos.perfil import AGREGAR, PONTOS, PerfilDados
+from graficos.renderizacao import TIPOS_GRAFICO, GraficoRenderizado, TipoGraficoNaoSuportadoErro, renderizar_grafico
+from graficos.seguimento import JANELA_LINHAS, AgregadoAoVivo, GraficoAoVivo, LeitorIncremental
+from graficos.tipos import otimizar_tipos
+from graficos.validacao import RegrasValidacao, RelatorioValidacao, ValoresInvalidosErro, aplicar_politica
+
 
 # =============================================================================
 # Eventos Utilizados pelo Model
@@ -46,12 +67,12 @@ class ImportacaoConcluidaEvt(ControllerEvent):
 class GraficoGravadoEvt(ControllerEvent):
     """
     Evento para notificar que a gravação do gráfico foi concluída com sucesso.
-    (Sem argumentos)
+    Recebe a lista de ficheiros gravados.
     """
-    def add_handler(self, handler: Callable[[], None]) -> None:
+    def add_handler(self, handler: Callable[[List[str]], None]) -> None:
         super().add_handler(handler)
-    def invoke(self) -> None:
-        super().invoke()
+    def invoke(self, caminhos: List[str]) -> None:
+        super().invoke(caminhos)
 
 class GraficoDisponivelEvt(ControllerEvent):
     """
@@ -66,12 +87,67 @@ class GraficoDisponivelEvt(ControllerEvent):
 class GraficoGeradoEvt(ControllerEvent):
     """
     Evento emitido quando o gráfico está gerado e pronto para ser mostrado.
-    Os handlers recebem uma lista de strings com os gráficos disponíveis.
+    Os handlers recebem a Figure do matplotlib com o gráfico desenhado.
     """
-    def add_handler(self, handler: Callable[[List[str]], None]) -> None:
+    def add_handler(self, handler: Callable[[Figure], None]) -> None:
         super().add_handler(handler)
-    def invoke(self) -> None:
-        super().invoke()
+    def invoke(self, figura: Figure) -> None:
+        super().invoke(figura)
+
+class AparenciaAlteradaEvt(ControllerEvent):
+    """
+    Evento emitido quando mudam apenas os rótulos, o título ou o modo das barras de erro.
+    Os handlers recebem o gráfico já mostrado e a nova aparência, e devem chamar
+    grafico.alterar_aparencia(...) na thread que desenha a figura (os dados não são redesenhados).
+    """
+    def add_handler(self, handler: Callable[[Union[GraficoRenderizado, GraficoAoVivo], str, str, str, str], None]) -> None:
+        super().add_handler(handler)
+    def invoke(self, grafico: Union[GraficoRenderizado, GraficoAoVivo], x_label: str, y_label: str, titulo: str,
+               barras_erro: str) -> None:
+        super().invoke(grafico, x_label, y_label, titulo, barras_erro)
+
+class GraficoAtualizadoEvt(ControllerEvent):
+    """
+    Evento emitido no modo de seguimento quando chegam linhas novas ao ficheiro.
+    Os handlers recebem o gráfico ao vivo (já mostrado) e as estatísticas atuais, e
+    devem chamar grafico.atualizar(tabela) na thread que desenha a figura.
+    """
+    def add_handler(self, handler: Callable[[GraficoAoVivo, pd.DataFrame], None]) -> None:
+        super().add_handler(handler)
+    def invoke(self, grafico: GraficoAoVivo, tabela: pd.DataFrame) -> None:
+        super().invoke(grafico, tabela)
+
+class ColunasDisponiveisEvt(ControllerEvent):
+    """
+    Evento emitido com as colunas que podem ser escolhidas no formulário de parâmetros.
+    Os handlers recebem todas as colunas e as que podem ir para o eixo Y (numéricas).
+    """
+    def add_handler(self, handler: Callable[[List[str], List[str]], None]) -> None:
+        super().add_handler(handler)
+    def invoke(self, colunas: List[str], colunas_y: List[str]) -> None:
+        super().invoke(colunas, colunas_y)
+
+class GaleriaIniciadaEvt(ControllerEvent):
+    """
+    Evento emitido quando começa a geração de uma galeria de miniaturas.
+    Os handlers recebem o número da galeria (diferente em cada galeria gerada), o tipo de
+    gráfico e os pares (x, y), pela ordem da galeria.
+    """
+    def add_handler(self, handler: Callable[[int, str, List[Tuple[str, str]]], None]) -> None:
+        super().add_handler(handler)
+    def invoke(self, galeria: int, tipo: str, pares: List[Tuple[str, str]]) -> None:
+        super().invoke(galeria, tipo, pares)
+
+class MiniaturaGeradaEvt(ControllerEvent):
+    """
+    Evento emitido por cada miniatura da galeria, à medida que fica pronta (por qualquer ordem).
+    Os handlers recebem o número da galeria a que pertence, o índice do par, a imagem em PNG
+    e a mensagem de erro (um dos dois é None).
+    """
+    def add_handler(self, handler: Callable[[int, int, Optional[bytes], Optional[str]], None]) -> None:
+        super().add_handler(handler)
+    def invoke(self, galeria: int, indice: int, imagem: Optional[bytes], erro: Optional[str]) -> None:
+        super().invoke(galeria, indice, imagem, erro)
 
 # --- Novos eventos para diferenciar os tipos de falha ---
 class FalhaImportacaoEvt(ControllerEvent):
@@ -120,12 +196,30 @@ class ErroInternoEvt(ControllerEvent):
 # =============================================================================
 
 class Model:
-    def __init__(self, view: IUserView, logger: ILogger) -> None:
+    def __init__(self, view: IUserView, logger: ILogger, cache_importacao: Optional[CacheImportacao] = None,
+                 cache_graficos: Optional[CacheGraficos] = None) -> None:
         self.view = view
         self.logger = logger
-        self.dados: List[Dict[str, Any]] = []   # Armazena os dados importados
+        # Cache persistente das importações (pode ser desativada atribuindo None)
+        self.cache_importacao: Optional[CacheImportacao] = cache_importacao or CacheImportacao.por_omissao()
+        # Cache em memória (LRU) das estatísticas que alimentam os gráficos (pode ser desativada atribuindo None)
+        self.cache_graficos: Optional[CacheGraficos] = cache_graficos if cache_graficos is not None else CacheGraficos()
+        self.dados: DadosColunares = DadosColunares.vazio()   # Armazena os dados importados (colunar)
+        self.esquema: Optional[EsquemaCSV] = None  # Esquema (colunas, tipos) obtido pela sonda do cabeçalho
+        self.perfil: Optional[PerfilDados] = None  # Perfil das colunas (tipos, mínimo/máximo, distintos), da importação
+        self.validacao: Optional[RelatorioValidacao] = None  # Problemas encontrados nos valores, da importação
+        self.regras_validacao: RegrasValidacao = RegrasValidacao()  # Intervalo aceite, negativos permitidos
+        self.politica_validacao: str = POLITICA_VALIDACAO_OMISSAO   # Valores inválidos: "coagir", "descartar" ou "rejeitar"
+        self.orcamento_memoria_mb: Optional[float] = None  # Memória para os dados (None: ver admissao.orcamento_memoria_mb)
+        self.__streaming: bool = False             # Dados lidos por blocos e agregados (ficheiros grandes)
+        self.__impressao_dados: str = ""            # Identifica os dados importados na cache de gráficos
+        self.barras_erro: str = BARRAS_ERRO_OMISSAO  # Modo das barras de erro por omissão ("ic", "dp", "ep", "nenhum")
         self.graficos: List[str] = []             # Lista de gráficos gerados
-        self.__figura: Optional[plt.Figure] = None  # Figura gerada para posterior gravação
+        self.__grafico: Optional[Union[GraficoRenderizado, GraficoAoVivo]] = None  # Gráfico entregue à View
+        self.__ultimo_grafico: Optional[Tuple[Any, ...]] = None  # Argumentos de renderizar_grafico, para a gravação
+        # Modo de seguimento (ficheiro a crescer): leitor, estatísticas e gráfico atualizados no lugar
+        self.__seguimento: Optional[Tuple[LeitorIncremental, AgregadoAoVivo, GraficoAoVivo, Tuple[Any, ...]]] = None
+        self.__galerias: int = 0  # Galerias geradas: identifica a galeria de cada miniatura
 
         # Existe Handlers para tratamentos específicos e restantes são tratados como genericos
         # Eventos de sucesso e estado
@@ -133,17 +227,30 @@ class Model:
         self.__estado_processamento_evt.add_handler(view.mostra_mensagem_info)
         self.__importacao_concluida_evt: ImportacaoConcluidaEvt = ImportacaoConcluidaEvt()
         self.__grafico_gravado_evt: GraficoGravadoEvt = GraficoGravadoEvt()
+        self.__grafico_gravado_evt.add_handler(view.mostra_grafico_gravado)
         self.__grafico_disponivel_evt: GraficoDisponivelEvt = GraficoDisponivelEvt()
         self.__grafico_disponivel_evt.add_handler(view.atualiza_lista_graficos)
+        self.__colunas_disponiveis_evt: ColunasDisponiveisEvt = ColunasDisponiveisEvt()
+        self.__colunas_disponiveis_evt.add_handler(view.mostra_formulario_parametros)
         self.__grafico_gerado_evt: GraficoGeradoEvt = GraficoGeradoEvt()
         self.__grafico_gerado_evt.add_handler(view.mostrar_grafico)
+        self.__grafico_atualizado_evt: GraficoAtualizadoEvt = GraficoAtualizadoEvt()
+        self.__grafico_atualizado_evt.add_handler(view.atualizar_grafico)
+        self.__aparencia_alterada_evt: AparenciaAlteradaEvt = AparenciaAlteradaEvt()
+        self.__aparencia_alterada_evt.add_handler(view.alterar_aparencia_grafico)
+        self.__galeria_iniciada_evt: GaleriaIniciadaEvt = GaleriaIniciadaEvt()
+        self.__galeria_iniciada_evt.add_handler(view.mostra_galeria)
+        self.__miniatura_gerada_evt: MiniaturaGeradaEvt = MiniaturaGeradaEvt()
+        self.__miniatura_gerada_evt.add_handler(view.mostra_miniatura)
         
         # Eventos para falhas diferenciadas
         #TODO: Dividir o evento genérico de ficheiro inválido, em diversos eventos
         self.__falha_importacao_evt: FalhaImportacaoEvt = FalhaImportacaoEvt()
         self.__falha_importacao_evt.add_handler(view.mostra_erro_importacao)
         self.__falha_gravacao_evt: FalhaGravacaoEvt = FalhaGravacaoEvt()
+        self.__falha_gravacao_evt.add_handler(view.mostra_erro_gravacao)
         self.__falha_geracao_evt : FalhaGeracaoEvt = FalhaGeracaoEvt()
+        self.__falha_geracao_evt.add_handler(view.mostra_erro_geracao)
 
         # Evento genérico de ficheiro inválido:
         self.__ficheiro_invalido_evt: FicheiroInvalidoEvt = FicheiroInvalidoEvt()
@@ -172,6 +279,10 @@ class Model:
     def grafico_disponivel_evt(self) -> GraficoDisponivelEvt:
         return self.__grafico_disponivel_evt
 
+    @property
+    def colunas_disponiveis_evt(self) -> ColunasDisponiveisEvt:
+        return self.__colunas_disponiveis_evt
+
     @property
     def falha_importacao_evt(self) -> FalhaImportacaoEvt:
         return self.__falha_importacao_evt
@@ -196,6 +307,22 @@ class Model:
     def grafico_gerado_evt(self) -> GraficoGeradoEvt:
         return self.__grafico_gerado_evt
 
+    @property
+    def grafico_atualizado_evt(self) -> GraficoAtualizadoEvt:
+        return self.__grafico_atualizado_evt
+
+    @property
+    def aparencia_alterada_evt(self) -> AparenciaAlteradaEvt:
+        return self.__aparencia_alterada_evt
+
+    @property
+    def galeria_iniciada_evt(self) -> GaleriaIniciadaEvt:
+        return self.__galeria_iniciada_evt
+
+    @property
+    def miniatura_gerada_evt(self) -> MiniaturaGeradaEvt:
+        return self.__miniatura_gerada_evt
+
 
     # =========================================================================
     # Métodos de Notificação (Invokes encapsulados)
@@ -214,11 +341,11 @@ class Model:
         """
         self.__importacao_concluida_evt.invoke()
 
-    def mensagem_grafico_gravado(self) -> None:
+    def mensagem_grafico_gravado(self, caminhos: List[str]) -> None:
         """
         Notifica que a gravação do gráfico foi concluída com sucesso.
         """
-        self.__grafico_gravado_evt.invoke()
+        self.__grafico_gravado_evt.invoke(caminhos)
 
     def notifica_graficos_disponiveis(self) -> None:
         """
@@ -226,6 +353,16 @@ class Model:
         """
         self.__grafico_disponivel_evt.invoke(self.graficos)
 
+    def notifica_colunas_disponiveis(self) -> None:
+        """
+        Notifica as colunas para o formulário de parâmetros: todas no eixo X e, no eixo Y,
+        só as numéricas (do perfil calculado na importação).
+        """
+        colunas = self.get_colunas_disponiveis()
+        colunas_y = self.get_colunas_numericas()
+        self.logger.log_info(f"notifica_colunas_disponiveis() - Colunas disponíveis: {colunas} (Y: {colunas_y})")
+        self.__colunas_disponiveis_evt.invoke(colunas, colunas_y)
+
     # --- Novos métodos de notificação de falhas diferenciadas ---
     def mensagem_falha_importacao(self, mensagem: str = "Falha de importação do ficheiro.") -> None:
         """
@@ -249,53 +386,109 @@ class Model:
     # Métodos de dados (Importação, Geração, Gravação)
     # =========================================================================
 
-    def importar_ficheiro(self, caminho: str) -> None:
+    def importar_ficheiro(self, caminho: str, streaming: Optional[bool] = None) -> None:
         """
         Importa e processa o ficheiro de dados.        
+        A importação é feita em duas fases: aqui o esquema (cabeçalho e amostra) é lido e
+        validado e, numa passagem pelo ficheiro, são calculados o perfil das colunas e a
+        validação dos valores (ver validacao.py); as colunas escolhidas para o gráfico são
+        lidas em gerar_grafico. Valores inválidos (não numéricos, fora do intervalo) nas
+        colunas de valores rejeitam o ficheiro ou são tratados na geração, conforme
+        self.politica_validacao.
+        O modo de leitura é decidido pelo controlo de admissão (ver admissao.py): a memória
+        que os dados vão ocupar é estimada a partir da amostra e comparada com o orçamento
+        (self.orcamento_memoria_mb). Se não couberem, o ficheiro é lido por blocos e agregado
+        à medida que é lido, mantendo o pico de memória constante; se nem um bloco couber,
+        o ficheiro é recusado.
+        Ficheiros comprimidos (gzip, bzip2, zstd, zip; detetados pelo conteúdo, não pela
+        extensão) são descomprimidos à medida que são lidos, sem cópia em disco; a
+        estimativa usa o tamanho descomprimido.
         :param caminho: Caminho do ficheiro a importar.
+        :param streaming: Força (True) ou impede (False) o modo streaming. Por omissão é
+                          escolhido pelo controlo de admissão.
         """
-        #TODO: Adicionar validação para o tamanho máximo de ficheiro
-        MAX_TAMANHO_MB = 10  # Tamanho máximo em MB
-
         self.mensagem_estado_processamento("Início da importação")
         self.logger.log_info("importar_ficheiro() - Início da importação")
         try:
-            if not caminho.endswith(".csv"):
+            compressao = detetar_compressao(caminho)
+            if compressao is None and not caminho.endswith(".csv"):
                 self.__ficheiro_invalido_evt.invoke("Ficheiro selecionado não é CSV.")
                 self.logger.log_erro("importar_ficheiro() - Ficheiro não é CSV")
                 return
 
-            # Validação do tamanho do ficheiro (em bytes)
-            tamanho_bytes = os.path.getsize(caminho)
-            tamanho_mb = tamanho_bytes / (1024 * 1024)
-            # Verifica se o tamanho do ficheiro excede o máximo permitido
-            if tamanho_mb > MAX_TAMANHO_MB:
-                self.__ficheiro_invalido_evt.invoke(f"O ficheiro excede o tamanho máximo de {MAX_TAMANHO_MB} MB.")
-                self.logger.log_erro(f"importar_ficheiro() - Ficheiro excede {MAX_TAMANHO_MB} MB")
+            # Sonda do cabeçalho e de uma amostra: ficheiros mal formatados falham
+            # antes de o ficheiro completo ser lido
+            esquema = sondar_esquema(caminho)
+            self.logger.log_info(f"importar_ficheiro() - {esquema}")
+            verificar_cancelamento()
+
+            if esquema.amostra.empty:
+                self.mensagem_falha_importacao("Ficheiro CSV está vazio.")
+                self.logger.log_erro("importar_ficheiro() - Ficheiro CSV está vazio")
                 return
 
-            self.dados = pd.read_csv(caminho).to_dict(orient="records")
-            self.logger.log_info(f"importar_ficheiro() - {len(self.dados)} registos carregados do CSV")
+            # Estrutura verificada na amostra, antes de qualquer passagem pelo ficheiro
+            problema = self.__problema_estrutura(esquema)
+            if problema:
+                self.mensagem_falha_importacao("Ficheiro CSV mal formatado.")
+                self.logger.log_erro(f"importar_ficheiro() - Ficheiro CSV mal formatado ({problema})")
+                return
 
-            df = pd.DataFrame(self.dados)
+            # Controlo de admissão: memória estimada a partir da amostra contra o orçamento
+            tamanho = tamanho_dados(caminho)
+            admissao = decidir_admissao(esquema, tamanho, self.orcamento_memoria_mb)
+            self.logger.log_info(f"importar_ficheiro() - Admissão: {admissao.modo} ({admissao})")
+            if streaming is None:
+                if admissao.modo == REJEITAR:
+                    self.mensagem_falha_importacao(f"Ficheiro demasiado grande para a memória disponível: {admissao}.")
+                    self.logger.log_erro(f"importar_ficheiro() - Ficheiro recusado pelo controlo de admissão: {admissao}")
+                    return
+                streaming = admissao.streaming
+                self.mensagem_estado_processamento(f"Memória estimada: {admissao}")
 
-            # Verifica se o DataFrame contém as colunas necessárias
-            # Neste momento está fixo porém podemos por a view a enviar esses valores.            
-            if "Categoria" not in df.columns or "Valor" not in df.columns:
-                self.mensagem_falha_importacao("Ficheiro CSV mal formatado.")
-                self.logger.log_erro("importar_ficheiro() - Ficheiro CSV mal formatado (faltam colunas obrigatórias)")
-                return                        
-            
-            if not self.dados:
-                self.mensagem_falha_importacao("Ficheiro CSV está vazio.")
-                self.logger.log_erro("importar_ficheiro() - Ficheiro CSV está vazio")
+            # Importação em duas fases: nesta fase apenas o esquema fica em memória.
+            # As colunas são lidas (com projeção) quando o gráfico é gerado.
+            # As opções de leitura fazem parte da chave da cache: alterá-las invalida-a
+            variante_cache = f"{sorted(esquema.opcoes_leitura().items())}"
+            perfil, validacao = self.__analisar(caminho, esquema, variante_cache)
+
+            # Validação das colunas de valores (as numéricas, que podem ir para o eixo Y)
+            colunas_valores = perfil.colunas_numericas()
+            for problema in validacao.descrever(colunas_valores):
+                self.logger.log_info(f"importar_ficheiro() - Validação: {problema}")
+            invalidas = [coluna for coluna in colunas_valores if validacao.invalidos(coluna)]
+            if invalidas and self.politica_validacao == "rejeitar":
+                self.mensagem_falha_importacao("Dados inválidos: " + "; ".join(validacao.descrever(invalidas, apenas_invalidos=True)))
+                self.logger.log_erro(f"importar_ficheiro() - Valores inválidos nas colunas: {', '.join(invalidas)}")
                 return
 
+            # Último ponto de cancelamento: a partir daqui o estado do Model é substituído
+            verificar_cancelamento()
+            impressao = impressao_digital(caminho, variante_cache)
+            self.parar_seguimento()
+            self.__streaming = streaming
+            self.__impressao_dados = impressao
+            self.esquema = esquema
+            self.perfil = perfil
+            self.validacao = validacao
+            self.dados = DadosColunares.preguicoso(
+                esquema.colunas, partial(self.__carregar_colunas, caminho, esquema, variante_cache)
+            )
+            tamanho_mb = tamanho / (1024 * 1024)
+            modo = f"streaming, {tamanho_mb:.1f} MB" if streaming else f"{tamanho_mb:.1f} MB"
+            if compressao is not None:
+                modo += f" descomprimidos de {os.path.getsize(caminho) / (1024 * 1024):.1f} MB ({compressao})"
+            self.logger.log_info(f"importar_ficheiro() - Esquema importado ({len(esquema.colunas)} colunas, {modo})")
+
             # Atualiza os gráficos disponíveis (exemplo fixo para já)
             self.graficos = ["Barras", "Linhas"]
             self.notifica_graficos_disponiveis()
             self.mensagem_importacao_concluida()
-            self.mensagem_estado_processamento("Importação concluída")
+            problemas = validacao.descrever(colunas_valores)
+            if problemas:
+                self.mensagem_estado_processamento(f"Importação concluída ({self.politica_validacao}): " + "; ".join(problemas))
+            else:
+                self.mensagem_estado_processamento("Importação concluída")
 
         except pd.errors.EmptyDataError:
         # CSV completamente vazio: ficheiro vazio!
@@ -310,42 +503,307 @@ class Model:
             self.mensagem_falha_importacao(f"Erro ao importar: {str(e)}")
             self.logger.log_erro(f"importar_ficheiro() - Erro inesperado: {str(e)}")
 
-    def gerar_grafico(self, tipo: str, x: str, y: str, x_label: Optional[str] = "", y_label: Optional[str] = "", titulo: Optional[str] = "") -> None:
+    @staticmethod
+    def __problema_estrutura(esquema: EsquemaCSV) -> Optional[str]:
+        """
+        Verifica a estrutura do ficheiro com a sonda (cabeçalho e amostra), sem o percorrer:
+        as colunas X e Y são escolhidas no formulário, por isso é preciso pelo menos uma
+        coluna numérica (eixo Y) e outra coluna (eixo X), com um cabeçalho verdadeiro.
+        Devolve a descrição do problema, ou None se o ficheiro serve.
+        """
+        if len(esquema.colunas) < 2:
+            return "são precisas pelo menos duas colunas"
+        numericas = esquema.colunas_numericas_no_cabecalho()
+        if numericas:
+            return f"o cabeçalho parece uma linha de dados: {', '.join(numericas)}"
+        amostra = PerfilDados(esquema.colunas)
+        amostra.adicionar(esquema.amostra)
+        if not amostra.colunas_numericas():
+            return "nenhuma coluna numérica na amostra"
+        return None
+
+    def __analisar(self, caminho: str, esquema: EsquemaCSV, variante: str) -> Tuple[PerfilDados, RelatorioValidacao]:
+        """
+        Perfil e validação de todas as colunas, numa única passagem pelo ficheiro (por
+        blocos, ou por partes em paralelo nos ficheiros grandes). Ficam na cache persistente:
+        importar de novo o mesmo ficheiro, com as mesmas regras, não o volta a percorrer.
+        """
+        regras = self.regras_validacao
+        variante_perfil, variante_validacao = f"perfil|{variante}", f"validacao|{regras!r}|{variante}"
+        perfil_cache = self.__ler_cache(caminho, variante_perfil)
+        validacao_cache = self.__ler_cache(caminho, variante_validacao)
+        if all(frame is not None and not frame.columns.empty for frame in (perfil_cache, validacao_cache)):
+            return PerfilDados.de_frame(perfil_cache), RelatorioValidacao.de_frame(validacao_cache, regras)
+
+        if usar_leitura_paralela(caminho):
+            perfil, validacao = analisar_csv_paralelo(
+                caminho, esquema.colunas, esquema.opcoes_leitura(), regras,
+                progresso=lambda feitas, total: self.__progresso(f"A analisar colunas... {100 * feitas // total}%"),
+            )
+        else:
+            perfil, validacao = PerfilDados(esquema.colunas), RelatorioValidacao(esquema.colunas, regras)
+            for bloco, lidos, total in ler_csv_por_blocos(caminho, **esquema.opcoes_leitura()):
+                perfil.adicionar(bloco)
+                validacao.adicionar(bloco)
+                self.__progresso(f"A analisar colunas... {100 * lidos // total}%")
+        self.logger.log_info(f"importar_ficheiro() - {perfil.linhas} linhas, {perfil}")
+        self.__gravar_cache(caminho, perfil.para_frame(), variante_perfil)
+        self.__gravar_cache(caminho, validacao.para_frame(), variante_validacao)
+        return perfil, validacao
+
+    def __carregar_colunas(self, caminho: str, esquema: EsquemaCSV, variante: str, colunas: List[str]) -> pd.DataFrame:
+        """
+        Lê do ficheiro apenas as colunas pedidas (projeção na leitura). As colunas já
+        presentes na cache persistente não voltam a ser lidas do CSV.
+        """
+        em_cache = self.__ler_cache(caminho, variante, colunas)
+        em_falta = [coluna for coluna in colunas if em_cache is None or coluna not in em_cache.columns]
+        if not em_falta:
+            return em_cache[colunas]
+
+        self.mensagem_estado_processamento(f"A ler colunas: {', '.join(em_falta)}")
+        if usar_leitura_paralela(caminho):
+            # Ficheiros grandes: intervalos de bytes lidos num pool de processos
+            lidas = ler_csv_paralelo(
+                caminho, esquema.colunas, {"usecols": em_falta, **esquema.opcoes_leitura()},
+                progresso=lambda feitas, total: self.__progresso(f"A ler colunas... {100 * feitas // total}%"),
+            )
+        else:
+            lidas = ler_csv(caminho, usecols=em_falta, **esquema.opcoes_leitura())
+        verificar_cancelamento()
+        self.logger.log_info(f"gerar_grafico() - {len(lidas)} registos lidos do CSV (colunas: {', '.join(em_falta)})")
+
+        # Tipos compactos (categóricas, inteiros/decimais reduzidos) sem perda de informação
+        lidas, antes, depois = otimizar_tipos(lidas)
+        self.mensagem_estado_processamento(f"Memória dos dados: {antes / 2**20:.1f} MB -> {depois / 2**20:.1f} MB")
+        self.logger.log_info(
+            f"gerar_grafico() - Tipos otimizados ({antes / 2**20:.1f} MB -> {depois / 2**20:.1f} MB): "
+            f"{ {str(nome): str(tipo) for nome, tipo in lidas.dtypes.items()} }"
+        )
+        self.__gravar_cache(caminho, lidas, variante)
+
+        if em_cache is not None and not em_cache.columns.empty:
+            lidas = pd.concat([em_cache, lidas], axis=1)
+        return lidas[colunas]
+
+    def __progresso(self, mensagem: str) -> None:
+        """Notifica o progresso de uma leitura longa; é também um ponto de cancelamento."""
+        verificar_cancelamento()
+        self.mensagem_estado_processamento(mensagem)
+
+    def __ler_cache(self, caminho: str, variante: str, colunas: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Tenta obter colunas da cache persistente. Erros na cache nunca impedem a leitura."""
+        if self.cache_importacao is None:
+            return None
+        try:
+            dados = self.cache_importacao.obter(caminho, variante, colunas)
+        except Exception as e:
+            self.logger.log_erro(f"Cache ignorada: {str(e)}")
+            return None
+        if dados is not None and not dados.columns.empty:
+            self.logger.log_info(f"Colunas carregadas da cache: {', '.join(map(str, dados.columns))}")
+        return dados
+
+    def __gravar_cache(self, caminho: str, frame: pd.DataFrame, variante: str) -> None:
+        """Guarda colunas acabadas de ler na cache persistente."""
+        if self.cache_importacao is None:
+            return
+        try:
+            if self.cache_importacao.guardar(caminho, frame, variante):
+                self.logger.log_info(f"Colunas guardadas na cache: {', '.join(map(str, frame.columns))}")
+        except Exception as e:
+            self.logger.log_erro(f"Falha ao gravar a cache: {str(e)}")
+
+    def __colunas_grafico(self, metodo: str, x: Optional[str], y: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Colunas X e Y a desenhar: as escolhidas no formulário ou, se nenhuma foi escolhida
+        (rótulos personalizados), as colunas por omissão Categoria/Valor, que o ficheiro tem
+        de ter; se só uma foi escolhida, a outra é a sugerida pelo perfil.
+        As colunas são validadas com o perfil, sem ler os dados. Se não servirem, emite a
+        falha de geração e devolve None.
+        """
+        em_falta: List[str] = []
+        if x is None and y is None:
+            em_falta = self.esquema.colunas_em_falta()
+            x, y = COLUNAS_OMISSAO
+        sugestao_x, sugestao_y = self.perfil.sugerir_eixos()
+        x, y = x or sugestao_x, y or sugestao_y
+        inexistentes = [coluna for coluna in (x, y) if coluna is not None and coluna not in self.perfil]
+        if em_falta:
+            mensagem = f"Faltam as colunas {', '.join(em_falta)}: tem de selecionar colunas para os eixos."
+        elif x is None or y is None or inexistentes:
+            mensagem = (f"Coluna inexistente no ficheiro: {', '.join(inexistentes)}." if inexistentes
+                        else "Tem de selecionar colunas para os eixos.")
+        elif x == y:
+            mensagem = "As colunas dos eixos X e Y têm de ser diferentes."
+        elif not self.perfil[y].numericos:
+            mensagem = f"A coluna '{y}' não tem valores."
+        else:
+            return x, y
+        self.mensagem_falha_geracao(mensagem)
+        self.logger.log_erro(f"{metodo}() - {mensagem}")
+        return None
+
+    def __dados_grafico(self, x: str, y: str, estrategia: str = AGREGAR) -> Optional[pd.DataFrame]:
+        """
+        Obtém os dados a desenhar, lidos por blocos em modo streaming ou a partir das
+        colunas em memória: as estatísticas de y por valor de x (uma linha por x) ou, na
+        estratégia PONTOS, os pontos tal como estão no ficheiro (ver PerfilDados.estrategia).
+        Tal como no seaborn, valores de x repetidos são representados pela média.
+        Os valores de y são tratados segundo a política de validação; se forem rejeitados,
+        emite a falha de geração e devolve None.
+        Os dados ficam na cache de gráficos: gerar de novo o mesmo gráfico, ou outro
+        tipo de gráfico com as mesmas colunas, não volta a ler nem a agregar os dados.
+        """
+        chave = (self.__impressao_dados, x, y, estrategia, self.__variante_validacao())
+        if self.cache_graficos is not None:
+            em_cache = self.cache_graficos.obter(chave)
+            self.logger.log_info(f"gerar_grafico() - Cache de gráficos: {self.cache_graficos.resumo()}")
+            if em_cache is not None:
+                return em_cache
+
+        try:
+            if estrategia == PONTOS:
+                agregado = self.__pontos_por_blocos(x, y) if self.__streaming else self.__pontos_em_memoria(x, y)
+            elif self.__streaming:
+                agregado = self.__agregar_por_blocos(x, y)
+            else:
+                agregado = self.__agregar_em_memoria(x, y)
+        except (ValoresNaoNumericosErro, ValoresInvalidosErro) as e:
+            self.mensagem_falha_geracao(str(e))
+            self.logger.log_erro(f"gerar_grafico() - {e}")
+            return None
+        if agregado is not None and self.cache_graficos is not None:
+            self.cache_graficos.guardar(chave, agregado)
+        return agregado
+
+    def __variante_validacao(self) -> str:
+        # A política e as regras mudam os dados desenhados: fazem parte das chaves das caches
+        return f"{self.politica_validacao}|{self.regras_validacao!r}"
+
+    def __validar(self, bloco: pd.DataFrame, y: str) -> pd.DataFrame:
+        return aplicar_politica(bloco, y, self.regras_validacao, self.politica_validacao)
+
+    def __agregar_em_memoria(self, x: str, y: str) -> pd.DataFrame:
+        """
+        Calcula as estatísticas de y por categoria de x (média, soma, contagem, intervalo
+        de confiança analítico) numa única passagem sobre as colunas em memória.
+        """
+        agregador = AgregadorCategorias(x, y)
+        agregador.adicionar(self.__validar(self.dados.garantir_colunas([x, y]), y))
+        self.logger.log_info(f"gerar_grafico() - {agregador.linhas} linhas agregadas por '{x}'")
+        return agregador.resultado()
+
+    def __pontos_em_memoria(self, x: str, y: str) -> pd.DataFrame:
+        frame = self.__validar(self.dados.garantir_colunas([x, y]), y)
+        self.logger.log_info(f"gerar_grafico() - {len(frame)} pontos, sem agregação ('{x}' quase sem repetidos)")
+        return tabela_pontos(frame[y], frame[x], x)
+
+    def __pontos_por_blocos(self, x: str, y: str) -> pd.DataFrame:
+        """Lê apenas as colunas x e y, por blocos (ou por partes em paralelo), sem agregar."""
+        caminho, esquema = self.esquema.caminho, self.esquema
+        variante = f"pontos|{x}|{y}|{self.__variante_validacao()}|{sorted(esquema.opcoes_leitura().items())}"
+        em_cache = self.__ler_cache(caminho, variante)
+        if em_cache is not None and not em_cache.columns.empty:
+            return em_cache
+
+        opcoes = {"usecols": [x, y], **esquema.opcoes_leitura()}
+        if usar_leitura_paralela(caminho):
+            frame = ler_csv_paralelo(
+                caminho, esquema.colunas, opcoes,
+                progresso=lambda feitas, total: self.__progresso(f"A ler dados... {100 * feitas // total}%"),
+            )
+            frame = self.__validar(frame, y)
+            resultado = tabela_pontos(frame[y], frame[x], x)
+        else:
+            partes = []
+            for bloco, lidos, total in ler_csv_por_blocos(caminho, **opcoes):
+                bloco = self.__validar(bloco, y)
+                partes.append(tabela_pontos(bloco[y], bloco[x], x))
+                self.__progresso(f"A ler dados... {100 * lidos // total}%")
+            resultado = pd.concat(partes, ignore_index=True)
+        self.logger.log_info(f"gerar_grafico() - {len(resultado)} pontos, sem agregação ('{x}' quase sem repetidos)")
+        self.__gravar_cache(caminho, resultado, variante)
+        return resultado
+
+    def __agregar_por_blocos(self, x: str, y: str) -> pd.DataFrame:
+        """
+        Lê o ficheiro por blocos, apenas com as colunas x e y, validando e agregando cada
+        bloco à medida que chega. Devolve as estatísticas de y por categoria de x.
+        """
+        caminho, esquema = self.esquema.caminho, self.esquema
+        variante = f"estatisticas|{x}|{y}|{self.__variante_validacao()}|{sorted(esquema.opcoes_leitura().items())}"
+        em_cache = self.__ler_cache(caminho, variante)
+        if em_cache is not None and not em_cache.columns.empty:
+            return em_cache
+
+        if usar_leitura_paralela(caminho):
+            # Cada processo agrega o seu intervalo do ficheiro; os parciais são juntos
+            agregador = agregar_csv_paralelo(
+                caminho, esquema.colunas, {"usecols": [x, y], **esquema.opcoes_leitura()}, x, y,
+                progresso=lambda feitas, total: self.__progresso(f"A ler dados... {100 * feitas // total}%"),
+                validacao=(self.regras_validacao, self.politica_validacao),
+            )
+        else:
+            agregador = AgregadorCategorias(x, y)
+            blocos = ler_csv_por_blocos(caminho, usecols=[x, y], **esquema.opcoes_leitura())
+            for bloco, lidos, total in blocos:
+                agregador.adicionar(self.__validar(bloco, y))
+                self.__progresso(f"A ler dados... {100 * lidos // total}% ({agregador.linhas} linhas)")
+
+        self.logger.log_info(f"gerar_grafico() - {agregador.linhas} linhas agregadas por '{x}'")
+        resultado = agregador.resultado()
+        self.__gravar_cache(caminho, resultado, variante)
+        return resultado
+
+    def gerar_grafico(self, tipo: str, x: str, y: str, x_label: Optional[str] = "", y_label: Optional[str] = "", titulo: Optional[str] = "",
+                      barras_erro: Optional[str] = None) -> None:
         """
         Gera um gráfico a partir dos dados importados.
         Armazena internamente a figura para posterior gravação.
+        O gráfico é desenhado a partir das estatísticas já agregadas por x (sem o bootstrap
+        do seaborn), numa Figure própria e sem usar o pyplot: pode correr numa thread de
+        trabalho e a figura é entregue à View no evento grafico_gerado.
+        :param barras_erro: Modo das barras de erro ("ic", "dp", "ep" ou "nenhum"). Por omissão
+                            é usado self.barras_erro.
         """
         self.mensagem_estado_processamento("A gerar gráfico")
         self.logger.log_info(f"gerar_grafico() - A gerar gráfico do tipo '{tipo}'")
+        self.parar_seguimento()
         try:
             if not self.dados:
                 self.mensagem_falha_geracao("Não há dados para gerar gráfico.")
                 self.logger.log_erro("gerar_grafico() - Não há dados para gerar gráfico")
                 return
 
-            df = pd.DataFrame(self.dados)
-
-            plt.figure(figsize=(6, 4))
-            if tipo.lower() == "barras":
-                sns.barplot(x="Categoria", y="Valor", data=df)
-            elif tipo.lower() == "linhas":
-                sns.lineplot(x="Categoria", y="Valor", data=df)
-            else:
-                self.mensagem_falha_geracao(f"Tipo de gráfico não suportado: {tipo}")
-                self.logger.log_erro(f"gerar_grafico() - Tipo de gráfico não suportado: {tipo}")
+            colunas = self.__colunas_grafico("gerar_grafico", x, y)
+            if colunas is None:
+                return
+            x_col, y_col = colunas
+            estrategia = self.perfil.estrategia(tipo, x_col)
+            self.logger.log_info(f"gerar_grafico() - x='{x_col}', y='{y_col}', estratégia '{estrategia}'")
+            df = self.__dados_grafico(x_col, y_col, estrategia)
+            if df is None:
                 return
+            verificar_cancelamento()
 
-            # Adiciona labels e título
-            plt.xlabel(x_label or x)
-            plt.ylabel(y_label or y)
-            plt.title(titulo or "Gráfico")
-            plt.tight_layout()
-            self.__figura = plt.gcf()
+            argumentos = (tipo, df, x_col, x_label or x_col, y_label or y_col, titulo or "Gráfico", barras_erro or self.barras_erro)
+            grafico = renderizar_grafico(*argumentos)
+            self.__grafico = grafico
+            self.__ultimo_grafico = argumentos
+            resumo_pontos = ""
+            if tipo.lower() == "linhas":
+                resumo_pontos = f" ({grafico.pontos_desenhados} pontos desenhados de {grafico.pontos_totais})"
+                self.logger.log_info(f"gerar_grafico() - {grafico.pontos_desenhados} pontos desenhados de {grafico.pontos_totais}")
 
             self.mensagem_estado_processamento("Gráfico gerado com sucesso")
             self.logger.log_info("gerar_grafico() - Gráfico gerado com sucesso")
-            self.__grafico_gerado_evt.invoke()
-            self.mensagem_estado_processamento("Gráfico pronto para visualização")  
+            self.__grafico_gerado_evt.invoke(grafico.figura)
+            self.mensagem_estado_processamento(f"Gráfico pronto para visualização{resumo_pontos}")
+
+        except TipoGraficoNaoSuportadoErro as e:
+            self.mensagem_falha_geracao(str(e))
+            self.logger.log_erro(f"gerar_grafico() - {e}")
 
         except Exception as e:
             stacktrace = traceback.format_exc()
@@ -355,39 +813,273 @@ class Model:
             # 2. Evento funcional amigável (mensagem para a View)
             self.mensagem_falha_geracao(f"Erro ao gerar gráfico: {str(e)}")
             self.logger.log_erro(f"gerar_grafico() - Erro inesperado: {str(e)}")
-        finally:
-            # Garante que fecha qualquer figura temporária se houve erro
-            if self.__figura is None:
-                plt.close()
 
+    def gerar_galeria(self, tipo: str, modo: str = PARES, barras_erro: Optional[str] = None) -> None:
+        """
+        Gera uma galeria de miniaturas do tipo de gráfico pedido, uma por par de colunas
+        (ver galeria.pares_galeria), desenhadas num pool de processos que leem as colunas
+        de memória partilhada. Cada miniatura é entregue à View assim que fica pronta;
+        escolher uma miniatura gera o gráfico desse par em tamanho normal (gerar_grafico).
+        :param modo: "pares" (todos os pares que fazem sentido) ou "categoria" (só a coluna
+                     de categoria contra cada coluna numérica).
+        """
+        self.mensagem_estado_processamento("A preparar a galeria")
+        self.logger.log_info(f"gerar_galeria() - A gerar galeria do tipo '{tipo}' (modo '{modo}')")
+        try:
+            if not self.dados or self.perfil is None:
+                self.mensagem_falha_geracao("Não há dados para gerar gráfico.")
+                self.logger.log_erro("gerar_galeria() - Não há dados para gerar gráfico")
+                return
+            if self.__streaming:
+                # Os processos da galeria partilham as colunas em memória; um ficheiro lido
+                # por blocos teria de ser lido de novo para cada par
+                self.mensagem_falha_geracao("A galeria precisa dos dados em memória: este ficheiro é lido por blocos.")
+                self.logger.log_erro("gerar_galeria() - Ficheiro em modo streaming")
+                return
+            if tipo.lower() not in TIPOS_GRAFICO:
+                raise TipoGraficoNaoSuportadoErro(f"Tipo de gráfico não suportado: {tipo}")
+
+            pares = pares_galeria(self.perfil, tipo, modo)
+            if not pares:
+                self.mensagem_falha_geracao("Não há pares de colunas para a galeria.")
+                self.logger.log_erro("gerar_galeria() - Não há pares de colunas")
+                return
+            frame = self.dados.garantir_colunas(list(dict.fromkeys(coluna for par in pares for coluna in par)))
+            verificar_cancelamento()
+
+            self.__galerias += 1
+            galeria = self.__galerias
+            self.__galeria_iniciada_evt.invoke(galeria, tipo, pares)
+            concluidas: List[int] = []
+
+            def concluida(indice: int, imagem: Optional[bytes], erro: Optional[str]) -> None:
+                concluidas.append(indice)
+                if erro is not None:
+                    self.logger.log_erro(f"gerar_galeria() - {pares[indice][1]} por {pares[indice][0]}: {erro}")
+                self.__miniatura_gerada_evt.invoke(galeria, indice, imagem, erro)
+                self.__progresso(f"Galeria: {len(concluidas)} de {len(pares)} gráficos")
+
+            gerar_miniaturas(frame, tipo, pares, [self.perfil.estrategia(tipo, x) for x, _ in pares],
+                             self.regras_validacao, self.politica_validacao, barras_erro or self.barras_erro,
+                             numero_processos(), concluida)
+            self.mensagem_estado_processamento(f"Galeria pronta ({len(pares)} gráficos): escolha um para o ver em tamanho normal")
+            self.logger.log_info(f"gerar_galeria() - {len(pares)} miniaturas geradas")
+
+        except TipoGraficoNaoSuportadoErro as e:
+            self.mensagem_falha_geracao(str(e))
+            self.logger.log_erro(f"gerar_galeria() - {e}")
+
+        except Exception as e:
+            stacktrace = traceback.format_exc()
+
+            # 1. Evento técnico (equivalente ao throw ex no C#)
+            self.__erro_interno_evt.invoke(stacktrace)
+            # 2. Evento funcional amigável (mensagem para a View)
+            self.mensagem_falha_geracao(f"Erro ao gerar galeria: {str(e)}")
+            self.logger.log_erro(f"gerar_galeria() - Erro inesperado: {str(e)}")
+
+    def alterar_aparencia(self, x_label: str, y_label: str, titulo: str, barras_erro: Optional[str] = None) -> None:
+        """
+        Altera os rótulos, o título e/ou o modo das barras de erro do gráfico mostrado, sem
+        voltar a ler, agregar ou desenhar os dados: a View recebe o gráfico no evento
+        aparencia_alterada e muda apenas esses artistas. A gravação passa a usar a nova aparência.
+        """
+        self.logger.log_info(f"alterar_aparencia() - x_label='{x_label}', y_label='{y_label}', titulo='{titulo}', barras_erro={barras_erro}")
+        if self.__grafico is None or self.__ultimo_grafico is None:
+            self.mensagem_falha_geracao("Nenhum gráfico foi gerado.")
+            self.logger.log_erro("alterar_aparencia() - Nenhum gráfico foi gerado")
+            return
+
+        tipo, tabela, x_col, _, _, _, modo = self.__ultimo_grafico
+        barras_erro = barras_erro or modo
+        self.__ultimo_grafico = (tipo, tabela, x_col, x_label, y_label, titulo or "Gráfico", barras_erro)
+        if self.__seguimento is not None:
+            leitor, agregado, grafico, _ = self.__seguimento
+            self.__seguimento = (leitor, agregado, grafico, (tipo, x_col, x_label, y_label, titulo or "Gráfico", barras_erro))
+        self.__aparencia_alterada_evt.invoke(self.__grafico, x_label, y_label, titulo or "Gráfico", barras_erro)
+        self.mensagem_estado_processamento("Aparência do gráfico atualizada")
+
+    # =========================================================================
+    # Modo de seguimento (ficheiros escritos continuamente)
+    # =========================================================================
+
+    @property
+    def a_seguir(self) -> bool:
+        return self.__seguimento is not None
+
+    def iniciar_seguimento(self, tipo: str, x: str, y: str, x_label: Optional[str] = "", y_label: Optional[str] = "",
+                           titulo: Optional[str] = "", barras_erro: Optional[str] = None, janela: int = JANELA_LINHAS) -> None:
+        """
+        Passa a seguir o ficheiro importado: lê-o uma vez (por blocos) e mostra o gráfico;
+        depois, cada chamada a atualizar_seguimento lê apenas as linhas acrescentadas.
+        A figura é criada aqui uma única vez; as atualizações mudam só os dados desenhados.
+        :param janela: Nos gráficos de linhas, número de linhas mais recentes desenhadas.
+        """
+        self.parar_seguimento()
+        self.mensagem_estado_processamento("A preparar o seguimento do ficheiro")
+        self.logger.log_info(f"iniciar_seguimento() - Gráfico do tipo '{tipo}'")
+        try:
+            if self.esquema is None or self.perfil is None:
+                self.mensagem_falha_geracao("Não há dados para gerar gráfico.")
+                self.logger.log_erro("iniciar_seguimento() - Nenhum ficheiro importado")
+                return
+
+            if detetar_compressao(self.esquema.caminho) is not None:
+                # Um ficheiro comprimido não pode ser lido a partir do fim, como o LeitorIncremental faz
+                self.mensagem_falha_geracao("Não é possível seguir um ficheiro comprimido.")
+                self.logger.log_erro("iniciar_seguimento() - Ficheiro comprimido")
+                return
+
+            colunas = self.__colunas_grafico("iniciar_seguimento", x, y)
+            if colunas is None:
+                return
+            x_col, y_col = colunas
+            leitor = LeitorIncremental(self.esquema.caminho, self.esquema)
+            agregado = AgregadoAoVivo(tipo, x_col, y_col, janela)
+            argumentos = (tipo, x_col, x_label or x_col, y_label or y_col, titulo or "Gráfico", barras_erro or self.barras_erro)
+            grafico = GraficoAoVivo(*argumentos)
+            self.__ler_linhas_novas(leitor, agregado)
+
+            # A figura ainda não foi entregue à View: pode ser desenhada nesta thread
+            tabela = agregado.tabela()
+            grafico.atualizar(tabela)
+            self.__seguimento = (leitor, agregado, grafico, argumentos)
+            self.__guardar_para_gravacao(tabela)
+            self.__grafico_gerado_evt.invoke(grafico.figura)
+            self.mensagem_estado_processamento(f"A seguir o ficheiro ({agregado.linhas} linhas)")
+
+        except TipoGraficoNaoSuportadoErro as e:
+            self.mensagem_falha_geracao(str(e))
+            self.logger.log_erro(f"iniciar_seguimento() - {e}")
+
+        except Exception as e:
+            stacktrace = traceback.format_exc()
+
+            # 1. Evento técnico (equivalente ao throw ex no C#)
+            self.__erro_interno_evt.invoke(stacktrace)
+            # 2. Evento funcional amigável (mensagem para a View)
+            self.mensagem_falha_geracao(f"Erro ao seguir o ficheiro: {str(e)}")
+            self.logger.log_erro(f"iniciar_seguimento() - Erro inesperado: {str(e)}")
+
+    def atualizar_seguimento(self) -> None:
+        """
+        Lê as linhas acrescentadas desde a última chamada e, se houver, atualiza as
+        estatísticas e notifica a View (grafico_atualizado). Sem seguimento ativo não faz nada.
+        """
+        if self.__seguimento is None:
+            return
+        leitor, agregado, grafico, _ = self.__seguimento
+        try:
+            novas, reiniciado = self.__ler_linhas_novas(leitor, agregado)
+            if reiniciado:
+                self.mensagem_estado_processamento("Ficheiro truncado ou substituído: leitura recomeçada")
+            if not novas and not reiniciado:
+                return
+
+            tabela = agregado.tabela()
+            self.__guardar_para_gravacao(tabela)
+            self.__grafico_atualizado_evt.invoke(grafico, tabela)
+            self.mensagem_estado_processamento(f"A seguir o ficheiro ({agregado.linhas} linhas, +{novas})")
+
+        except Exception as e:
+            self.__seguimento = None
+            stacktrace = traceback.format_exc()
+
+            # 1. Evento técnico (equivalente ao throw ex no C#)
+            self.__erro_interno_evt.invoke(stacktrace)
+            # 2. Evento funcional amigável (mensagem para a View)
+            self.mensagem_falha_geracao(f"Erro ao seguir o ficheiro: {str(e)}")
+            self.logger.log_erro(f"atualizar_seguimento() - Erro inesperado: {str(e)}")
+
+    def parar_seguimento(self) -> None:
+        if self.__seguimento is not None:
+            self.__seguimento = None
+            self.logger.log_info("parar_seguimento() - Seguimento do ficheiro terminado")
+
+    def __ler_linhas_novas(self, leitor: LeitorIncremental, agregado: AgregadoAoVivo) -> Tuple[int, bool]:
+        """Lê e agrega todas as linhas completas acrescentadas. Devolve (linhas, reiniciado)."""
+        linhas, reiniciado = 0, False
+        ignoradas = leitor.linhas_ignoradas
+        while True:
+            bloco, recomecou = leitor.ler_novas()
+            if recomecou:
+                self.logger.log_info("atualizar_seguimento() - Ficheiro truncado ou rodado: a ler desde o início")
+                agregado.reiniciar()
+                linhas, reiniciado = 0, True
+            if bloco is None:
+                break
+            agregado.adicionar(bloco)
+            linhas += len(bloco)
+            verificar_cancelamento()
+        if leitor.linhas_ignoradas > ignoradas:
+            self.logger.log_erro(f"atualizar_seguimento() - {leitor.linhas_ignoradas - ignoradas} linhas com mais de "
+                                 f"{leitor.bytes_por_leitura} bytes ignoradas")
+        if linhas:
+            self.logger.log_info(f"atualizar_seguimento() - {linhas} linhas novas "
+                                 f"({agregado.descartadas} linhas inválidas ignoradas no total)")
+        return linhas, reiniciado
+
+    def __guardar_para_gravacao(self, tabela: pd.DataFrame) -> None:
+        # A gravação desenha o estado atual do seguimento numa figura própria
+        tipo, x_col, x_label, y_label, titulo, barras_erro = self.__seguimento[3]
+        self.__grafico = self.__seguimento[2]
+        self.__ultimo_grafico = (tipo, tabela, x_col, x_label, y_label, titulo, barras_erro)
 
     def get_colunas_disponiveis(self) -> list[str]:
         """
         Retorna uma lista com os nomes das colunas disponíveis nos dados importados.    
+        As colunas vêm do esquema obtido na importação, sem ler os dados.
         Se não houver dados, retorna uma lista vazia.
         """
-        if not self.dados:
-            return []
-        return list(pd.DataFrame(self.dados).columns)
+        if self.esquema is not None:
+            return list(self.esquema.colunas)
+        return self.dados.colunas
+
+    def get_colunas_numericas(self) -> list[str]:
+        """Colunas que podem ser usadas no eixo Y (maioritariamente numéricas, segundo o perfil)."""
+        if self.perfil is not None:
+            return self.perfil.colunas_numericas()
+        return self.get_colunas_disponiveis()
     
 
-    def gravar_grafico(self, caminho: str) -> None:
+    def gravar_grafico(self, caminhos: Union[str, Sequence[str]]) -> None:
         """
-        Grava a figura do gráfico previamente gerada.
+        Grava o gráfico previamente gerado num ou em vários ficheiros (o formato de cada um
+        vem da extensão: png, jpg, svg ou pdf).
+        Todos os formatos saem de um único desenho, numa figura própria da gravação: a figura
+        entregue à View pode estar a ser desenhada na thread da interface e não é tocada aqui.
+        Cada ficheiro é escrito num temporário e renomeado no fim (ver exportacao.py).
+        O gráfico continua disponível depois da gravação (ver descartar_grafico).
         """
         self.mensagem_estado_processamento("Início da gravação do gráfico")
-        self.logger.log_info(f"gravar_grafico() - A gravar gráfico em: {caminho}")
+        self.logger.log_info(f"gravar_grafico() - A gravar gráfico em: {caminhos}")
 
         try:
-            if self.__figura is None:
+            if self.__ultimo_grafico is None:
                 self.mensagem_falha_gravacao("Nenhum gráfico foi gerado.")
                 self.logger.log_erro("gravar_grafico() - Nenhum gráfico foi gerado")
                 return
 
-            self.__figura.savefig(caminho)
-            self.mensagem_grafico_gravado()
-            self.mensagem_estado_processamento("Gravação concluída")
-            self.logger.log_info("gravar_grafico() - Gravação concluída com sucesso")
+            figura = renderizar_grafico(*self.__ultimo_grafico).figura
+            resultados = exportar_figura(figura, caminhos)
+            for resultado in resultados:
+                if resultado.sucesso:
+                    self.logger.log_info(f"gravar_grafico() - {resultado.formato}: {resultado.caminho} "
+                                         f"({resultado.tamanho_bytes} bytes, {resultado.segundos:.3f} s)")
+                else:
+                    self.logger.log_erro(f"gravar_grafico() - Falha em {resultado.caminho}: {resultado.erro}")
+
+            gravados = [r for r in resultados if r.sucesso]
+            falhados = [r for r in resultados if not r.sucesso]
+            if falhados:
+                self.mensagem_falha_gravacao(
+                    "Erro ao gravar gráfico: " + "; ".join(f"{os.path.basename(r.caminho)}: {r.erro}" for r in falhados)
+                )
+            if gravados:
+                self.mensagem_grafico_gravado([r.caminho for r in gravados])
+                tempos = ", ".join(f"{r.formato} {r.segundos:.2f} s" for r in gravados)
+                self.mensagem_estado_processamento(f"Gravação concluída: {tempos}")
+                self.logger.log_info("gravar_grafico() - Gravação concluída com sucesso")
         except Exception as e:
             stacktrace = traceback.format_exc()
 
@@ -396,7 +1088,14 @@ class Model:
             # 2. Evento funcional amigável (mensagem para a View)
             self.mensagem_falha_gravacao(f"Erro ao gravar gráfico: {str(e)}")
             self.logger.log_erro(f"gravar_grafico() - Erro inesperado: {str(e)}")
-        finally:
-            # Garante limpeza de recursos mesmo em caso de erro
-            plt.close(self.__figura)
-            self.__figura = None
+
+    def descartar_grafico(self) -> None:
+        """
+        Larga o gráfico mostrado (ex.: o utilizador voltou ao menu). Até lá o gráfico continua
+        disponível depois de gravado: pode ser gravado de novo ou mudar de aparência.
+        """
+        self.parar_seguimento()
+        # As figuras não pertencem ao pyplot: basta largar as referências
+        self.__grafico = None
+        self.__ultimo_grafico = None
+        self.logger.log_info("descartar_grafico() - Gráfico descartado")
@@ -0,0 +1,37 @@
+from typing import Dict
+
+# =============================================================================
+# Opções dos gráficos partilhadas pela View e pelo Model
+# =============================================================================
+# Módulo sem dependências pesadas (numpy, pandas, matplotlib): a View importa-o no
+# arranque, antes de essas bibliotecas estarem carregadas.
+
+# Tipos de gráfico (ver renderizacao.py) e o tipo por omissão no modo batch
+TIPOS_GRAFICO = ("barras", "linhas")
+TIPO_GRAFICO_OMISSAO = "barras"
+
+# Formatos em que um gráfico pode ser gravado (ver exportacao.py)
+FORMATOS_EXPORTACAO = ("png", "jpg", "svg", "pdf")
+FORMATO_EXPORTACAO_OMISSAO = "png"
+
+# Modos das barras de erro: intervalo de confiança, desvio padrão, erro padrão ou nenhum
+MODOS_BARRAS_ERRO: Dict[str, str] = {
+    "ic": "Intervalo de confiança (95%)",
+    "dp": "Desvio padrão",
+    "ep": "Erro padrão",
+    "nenhum": "Nenhuma",
+}
+BARRAS_ERRO_OMISSAO = "ic"
+NIVEL_CONFIANCA = 0.95
+
+# Intervalo entre verificações do ficheiro no modo de seguimento (ver seguimento.py)
+INTERVALO_SEGUIMENTO_S = 1.0
+
+# Política para valores inválidos (não numéricos, fora do intervalo) nas colunas de valores
+# (ver validacao.py): convertê-los, descartar as linhas ou rejeitar o ficheiro
+POLITICAS_VALIDACAO: Dict[str, str] = {
+    "coagir": "Converter (não numéricos ignorados, fora do intervalo ajustados ao limite)",
+    "descartar": "Descartar as linhas com valores inválidos",
+    "rejeitar": "Rejeitar o ficheiro",
+}
+POLITICA_VALIDACAO_OMISSAO = "rejeitar"
@@ -0,0 +1,225 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from graficos.compressao import detetar_compressao
+from graficos.importacao import LINHAS_POR_BLOCO, AgregadorCategorias
+from graficos.perfil import PerfilDados
+from graficos.validacao import RegrasValidacao, RelatorioValidacao, aplicar_politica
+
+# =============================================================================
+# Leitura paralela de ficheiros CSV (intervalos de bytes num pool de processos)
+# =============================================================================
+
+LIMIAR_PARALELO_MB = 64              # Abaixo deste tamanho a leitura é feita num só processo
+BYTES_VARRIMENTO = 8 * 1024 * 1024   # Tamanho dos blocos lidos ao procurar as fronteiras
+
+# Notificação de progresso: (partes_concluidas, total_partes)
+Progresso = Callable[[int, int], None]
+
+
+def numero_processos() -> int:
+    """Número de processos a usar: $GRAFICOS_PROCESSOS ou o número de cores."""
+    configurado = os.environ.get("GRAFICOS_PROCESSOS")
+    if configurado:
+        return max(1, int(configurado))
+    return max(1, os.cpu_count() or 1)
+
+
+def usar_leitura_paralela(caminho: str, processos: Optional[int] = None) -> bool:
+    """
+    Decide se compensa dividir o ficheiro: só para ficheiros grandes e com vários cores.
+    Os ficheiros comprimidos são sempre lidos num só processo: o fluxo comprimido não
+    pode ser começado a meio.
+    """
+    processos = processos or numero_processos()
+    return (processos > 1 and os.path.getsize(caminho) > LIMIAR_PARALELO_MB * 1024 * 1024
+            and detetar_compressao(caminho) is None)
+
+
+def dividir_em_intervalos(caminho: str, partes: int) -> List[Tuple[int, int]]:
+    """
+    Divide a zona de dados do ficheiro (depois do cabeçalho) em intervalos [início, fim)
+    de tamanho semelhante, todos alinhados com o início de uma linha.
+
+    O ficheiro é percorrido uma vez a contar as aspas: uma quebra de linha só é fronteira
+    se o número de aspas até ela for par, ou seja, se não estiver dentro de um campo
+    entre aspas. Aspas escapadas ("") não alteram a paridade.
+    """
+    tamanho = os.path.getsize(caminho)
+    fronteiras: List[int] = []
+    alvos: List[int] = [0]  # A primeira fronteira é o fim do cabeçalho
+    paridade = 0
+    posicao_bloco = 0
+    with open(caminho, "rb") as ficheiro:
+        while alvos:
+            bloco = ficheiro.read(BYTES_VARRIMENTO)
+            if not bloco:
+                break
+            fim_bloco = posicao_bloco + len(bloco)
+            contado_ate, aspas = 0, paridade
+            while alvos and alvos[0] < fim_bloco:
+                procura = max(alvos[0], posicao_bloco) - posicao_bloco
+                quebra = bloco.find(b"\n", procura)
+                while quebra != -1:
+                    aspas += bloco.count(b'"', contado_ate, quebra)
+                    contado_ate = quebra
+                    if aspas % 2 == 0:
+                        break
+                    quebra = bloco.find(b"\n", quebra + 1)
+                if quebra == -1:
+                    # A fronteira fica no bloco seguinte
+                    alvos[0] = fim_bloco
+                    break
+                fronteira = posicao_bloco + quebra + 1
+                fronteiras.append(fronteira)
+                alvos.pop(0)
+                if len(fronteiras) == 1:
+                    # Conhecido o fim do cabeçalho, calculam-se os alvos das restantes partes
+                    passo = (tamanho - fronteira) / partes
+                    alvos = [int(fronteira + passo * i) for i in range(1, partes)]
+                alvos = [max(alvo, fronteira) for alvo in alvos]
+            paridade = (aspas + bloco.count(b'"', contado_ate)) % 2
+            posicao_bloco = fim_bloco
+
+    if not fronteiras:
+        return []
+    limites = sorted(set(fronteiras + [tamanho]))
+    return [(inicio, fim) for inicio, fim in zip(limites, limites[1:]) if fim > inicio]
+
+
+class _IntervaloFicheiro(io.RawIOBase):
+    """Ficheiro só de leitura que expõe apenas os bytes [inicio, fim) de outro ficheiro."""
+    def __init__(self, caminho: str, inicio: int, fim: int) -> None:
+        super().__init__()
+        self.__ficheiro = open(caminho, "rb")
+        self.__ficheiro.seek(inicio)
+        self.__restante = fim - inicio
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, destino) -> int:
+        n = min(len(destino), self.__restante)
+        if n <= 0:
+            return 0
+        lido = self.__ficheiro.readinto(memoryview(destino)[:n])
+        self.__restante -= lido
+        return lido
+
+    def close(self) -> None:
+        self.__ficheiro.close()
+        super().close()
+
+
+def ler_intervalo(caminho: str, inicio: int, fim: int, nomes: Sequence[str], opcoes: Dict[str, Any],
+                  linhas_por_bloco: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lê as linhas de um intervalo de bytes (sem cabeçalho), devolvendo um ou vários blocos.
+    :param nomes: Nomes de todas as colunas do ficheiro, pela ordem do cabeçalho.
+    :param opcoes: Argumentos para o pd.read_csv (sep, encoding, usecols, ...).
+    """
+    with io.BufferedReader(_IntervaloFicheiro(caminho, inicio, fim)) as fluxo:
+        leitura = pd.read_csv(fluxo, header=None, names=list(nomes), chunksize=linhas_por_bloco, **opcoes)
+        if linhas_por_bloco is None:
+            yield leitura
+            return
+        with leitura as leitor:
+            yield from leitor
+
+
+def _ler_parte(caminho: str, inicio: int, fim: int, nomes: Sequence[str], opcoes: Dict[str, Any]) -> pd.DataFrame:
+    return next(ler_intervalo(caminho, inicio, fim, nomes, opcoes))
+
+
+def _agregar_parte(caminho: str, inicio: int, fim: int, nomes: Sequence[str], opcoes: Dict[str, Any],
+                   x: str, y: str, validacao: Optional[Tuple[RegrasValidacao, str]] = None) -> AgregadorCategorias:
+    # Cada processo lê a sua parte por blocos, por isso a memória continua limitada
+    agregador = AgregadorCategorias(x, y)
+    for bloco in ler_intervalo(caminho, inicio, fim, nomes, opcoes, LINHAS_POR_BLOCO):
+        agregador.adicionar(bloco if validacao is None else aplicar_politica(bloco, y, *validacao))
+    return agregador
+
+
+def _analisar_parte(caminho: str, inicio: int, fim: int, nomes: Sequence[str], opcoes: Dict[str, Any],
+                    regras: RegrasValidacao) -> Tuple[PerfilDados, RelatorioValidacao]:
+    perfil, relatorio = PerfilDados(nomes), RelatorioValidacao(nomes, regras)
+    for bloco in ler_intervalo(caminho, inicio, fim, nomes, opcoes, LINHAS_POR_BLOCO):
+        perfil.adicionar(bloco)
+        relatorio.adicionar(bloco)
+    return perfil, relatorio
+
+
+def ler_csv_paralelo(caminho: str, nomes: Sequence[str], opcoes: Dict[str, Any],
+                     processos: Optional[int] = None, progresso: Optional[Progresso] = None) -> pd.DataFrame:
+    """
+    Lê o ficheiro completo em paralelo e devolve as partes concatenadas pela ordem das linhas.
+    :param nomes: Nomes de todas as colunas do ficheiro (o cabeçalho não é lido pelas partes).
+    :param opcoes: Argumentos para o pd.read_csv (ex.: sep, encoding, usecols).
+    """
+    processos = processos or numero_processos()
+    intervalos = dividir_em_intervalos(caminho, processos)
+    partes = _executar(_ler_parte, caminho, intervalos, processos, progresso, nomes, opcoes)
+    if not partes:
+        return pd.DataFrame(columns=opcoes.get("usecols") or list(nomes))
+    return pd.concat(partes, ignore_index=True)
+
+
+def agregar_csv_paralelo(caminho: str, nomes: Sequence[str], opcoes: Dict[str, Any], x: str, y: str,
+                         processos: Optional[int] = None, progresso: Optional[Progresso] = None,
+                         validacao: Optional[Tuple[RegrasValidacao, str]] = None) -> AgregadorCategorias:
+    """
+    Agrega y por x em paralelo: cada processo agrega a sua parte e os parciais são juntos.
+    :param validacao: (regras, política) aplicadas aos valores de y antes de agregar (ver validacao.py).
+    """
+    processos = processos or numero_processos()
+    intervalos = dividir_em_intervalos(caminho, processos)
+    agregador = AgregadorCategorias(x, y)
+    for parcial in _executar(_agregar_parte, caminho, intervalos, processos, progresso, nomes, opcoes, x, y, validacao):
+        agregador.juntar(parcial)
+    return agregador
+
+
+def analisar_csv_paralelo(caminho: str, nomes: Sequence[str], opcoes: Dict[str, Any], regras: RegrasValidacao,
+                          processos: Optional[int] = None,
+                          progresso: Optional[Progresso] = None) -> Tuple[PerfilDados, RelatorioValidacao]:
+    """
+    Perfil e validação de todas as colunas em paralelo: cada processo analisa a sua parte
+    e as partes são juntas pela ordem do ficheiro (os números de linha continuam certos).
+    """
+    processos = processos or numero_processos()
+    intervalos = dividir_em_intervalos(caminho, processos)
+    perfil, relatorio = PerfilDados(nomes), RelatorioValidacao(nomes, regras)
+    for parcial, relatorio_parcial in _executar(_analisar_parte, caminho, intervalos, processos, progresso, nomes,
+                                                opcoes, regras):
+        perfil.juntar(parcial)
+        relatorio.juntar(relatorio_parcial)
+    return perfil, relatorio
+
+
+def _executar(funcao, caminho: str, intervalos: List[Tuple[int, int]], processos: int,
+              progresso: Optional[Progresso], *args: Any) -> List[Any]:
+    """Executa a função sobre cada intervalo num pool de processos, mantendo a ordem."""
+    if not intervalos:
+        return []
+    # "spawn" evita fazer fork de um processo com threads (interface, tarefas em segundo plano)
+    contexto = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=min(processos, len(intervalos)), mp_context=contexto)
+    try:
+        futuros = [pool.submit(funcao, caminho, inicio, fim, *args) for inicio, fim in intervalos]
+        resultados = []
+        for indice, futuro in enumerate(futuros, start=1):
+            resultados.append(futuro.result())
+            if progresso is not None:
+                # O progresso pode interromper a leitura (ex.: tarefa cancelada)
+                progresso(indice, len(futuros))
+    except BaseException:
+        # Não espera pelas partes que ainda não começaram
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return resultados
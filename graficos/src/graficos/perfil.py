@@ -0,0 +1,243 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from graficos.esquema import COLUNAS_OMISSAO
+
+# =============================================================================
+# Perfil das colunas importadas (tipos, valores em falta, cardinalidade)
+# =============================================================================
+
+BITS_INDICE_HLL = 12                 # 2**12 registos: erro típico de ~1.6% na contagem de distintos
+LIMIAR_COLUNA_NUMERICA = 0.5         # Fração mínima de valores numéricos para a coluna ser oferecida como Y
+LIMIAR_VALORES_UNICOS = 0.95         # Acima desta fração de x distintos, as linhas são desenhadas sem agregar
+
+# Estratégias de construção dos dados do gráfico
+AGREGAR = "agregar"   # Estatísticas de y por valor de x (média, barras de erro)
+PONTOS = "pontos"     # Um ponto por linha do ficheiro (x quase sempre distinto: nada a agregar)
+
+COLUNAS_PERFIL = ["tipo", "linhas", "nulos", "numericos", "minimo", "maximo", "distintos"]
+
+
+class ContadorDistintos:
+    """
+    Estimativa do número de valores distintos (HyperLogLog) com memória fixa: 2**bits
+    registos de um byte, qualquer que seja o número de linhas. Os valores são processados
+    em bloco (hash e registos atualizados com operações vetorizadas do numpy) e contadores
+    de partes diferentes do ficheiro podem ser juntos.
+    """
+    def __init__(self, bits: int = BITS_INDICE_HLL) -> None:
+        self.bits = bits
+        self.registos = np.zeros(1 << bits, dtype=np.uint8)
+
+    def adicionar(self, hashes: np.ndarray) -> None:
+        """Acrescenta valores já convertidos em hashes de 64 bits (ver pd.util.hash_array)."""
+        if not len(hashes):
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        resto_bits = 64 - self.bits
+        indices = (hashes >> np.uint64(resto_bits)).astype(np.intp)
+        resto = hashes & np.uint64((1 << resto_bits) - 1)
+        # Posição do primeiro bit a 1 no resto; frexp devolve o número de bits significativos
+        _, bits_significativos = np.frexp(resto.astype(np.float64))
+        posicao = (resto_bits - bits_significativos + 1).astype(np.uint8)
+        np.maximum.at(self.registos, indices, posicao)
+
+    def juntar(self, outro: "ContadorDistintos") -> None:
+        np.maximum(self.registos, outro.registos, out=self.registos)
+
+    def estimativa(self) -> int:
+        m = len(self.registos)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimativa = alfa * m * m / np.sum(np.ldexp(1.0, -self.registos.astype(np.int64)))
+        vazios = int(np.count_nonzero(self.registos == 0))
+        if estimativa <= 2.5 * m and vazios:
+            # Poucos valores distintos: a contagem linear dos registos vazios é mais exata
+            estimativa = m * math.log(m / vazios)
+        return int(round(estimativa))
+
+
+class PerfilColuna:
+    """Resumo de uma coluna, acumulado bloco a bloco."""
+    def __init__(self, nome: str) -> None:
+        self.nome = nome
+        self.tipo = ""             # dtype comum a todos os blocos (como no pd.read_csv do ficheiro inteiro)
+        self.linhas = 0
+        self.nulos = 0
+        self.numericos = 0         # Valores preenchidos que são (ou se convertem em) números
+        self.minimo = math.nan     # Mínimo e máximo dos valores numéricos
+        self.maximo = math.nan
+        self.__distintos: Optional[ContadorDistintos] = ContadorDistintos()
+        self.__distintos_fixo = 0  # Contagem de um perfil lido da cache (sem registos)
+
+    @property
+    def preenchidos(self) -> int:
+        return self.linhas - self.nulos
+
+    @property
+    def fracao_numerica(self) -> float:
+        return self.numericos / self.preenchidos if self.preenchidos else 0.0
+
+    @property
+    def numerica(self) -> bool:
+        """Coluna maioritariamente numérica (pode ser usada como eixo Y)."""
+        return self.numericos > 0 and self.fracao_numerica >= LIMIAR_COLUNA_NUMERICA
+
+    @property
+    def distintos(self) -> int:
+        """Número aproximado de valores distintos (sem contar os valores em falta)."""
+        if self.__distintos is None:
+            return self.__distintos_fixo
+        return min(self.__distintos.estimativa(), self.preenchidos)
+
+    def adicionar(self, serie: pd.Series) -> None:
+        self.tipo = _tipo_comum(self.tipo, serie.dtype)
+        self.linhas += len(serie)
+        if pd.api.types.is_numeric_dtype(serie.dtype):
+            valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+            valores = valores[~np.isnan(valores)]
+            self.nulos += len(serie) - len(valores)
+            self.numericos += len(valores)
+            texto = np.array([], dtype=object)
+        else:
+            # Texto: a conversão para número (lenta) é feita só uma vez por valor distinto
+            codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+            numeros = pd.to_numeric(pd.Series(unicos, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+            e_numero = ~np.isnan(numeros)
+            self.nulos += int(np.count_nonzero(codigos < 0))
+            self.numericos += int(np.count_nonzero(e_numero[codigos[codigos >= 0]]))
+            valores, texto = numeros[e_numero], np.asarray(unicos, dtype=object)[~e_numero]
+
+        if len(valores):
+            self.minimo = _limite(min, self.minimo, float(valores.min()))
+            self.maximo = _limite(max, self.maximo, float(valores.max()))
+        # Números pelo valor (5 e "5" contam como um só), o restante pelo texto
+        self.__distintos.adicionar(pd.util.hash_array(valores))
+        if len(texto):
+            self.__distintos.adicionar(pd.util.hash_array(texto.astype(str)))
+
+    def juntar(self, outro: "PerfilColuna") -> None:
+        self.tipo = _tipo_comum(self.tipo, outro.tipo) if outro.tipo else self.tipo
+        self.linhas += outro.linhas
+        self.nulos += outro.nulos
+        self.numericos += outro.numericos
+        self.minimo = _limite(min, self.minimo, outro.minimo)
+        self.maximo = _limite(max, self.maximo, outro.maximo)
+        self.__distintos.juntar(outro.__distintos)
+
+    @classmethod
+    def de_valores(cls, nome: str, valores: Dict[str, object]) -> "PerfilColuna":
+        """Reconstrói um perfil guardado (ver PerfilDados.para_frame)."""
+        perfil = cls(nome)
+        perfil.tipo = str(valores["tipo"])
+        perfil.linhas, perfil.nulos, perfil.numericos = (int(valores[c]) for c in ("linhas", "nulos", "numericos"))
+        perfil.minimo, perfil.maximo = float(valores["minimo"]), float(valores["maximo"])
+        perfil.__distintos, perfil.__distintos_fixo = None, int(valores["distintos"])
+        return perfil
+
+    def __repr__(self) -> str:
+        return (f"{self.nome}: {self.tipo}, {self.nulos} em falta, {self.fracao_numerica:.0%} numéricos, "
+                f"[{self.minimo:g}, {self.maximo:g}], ~{self.distintos} distintos")
+
+
+class PerfilDados:
+    """
+    Perfil de todas as colunas de um ficheiro, construído numa única passagem pelos dados
+    (bloco a bloco, ou por partes em processos diferentes que depois são juntas).
+
+    É calculado uma vez na importação: o formulário de parâmetros e a escolha da forma de
+    construir o gráfico (agregar ou desenhar os pontos) usam-no sem voltar a ler os dados.
+    """
+    def __init__(self, colunas: Sequence[str]) -> None:
+        self.colunas: Dict[str, PerfilColuna] = {str(nome): PerfilColuna(str(nome)) for nome in colunas}
+
+    @property
+    def linhas(self) -> int:
+        return next(iter(self.colunas.values())).linhas if self.colunas else 0
+
+    def adicionar(self, bloco: pd.DataFrame) -> None:
+        for nome, perfil in self.colunas.items():
+            perfil.adicionar(bloco[nome])
+
+    def juntar(self, outro: "PerfilDados") -> None:
+        for nome, perfil in self.colunas.items():
+            perfil.juntar(outro.colunas[nome])
+
+    def __getitem__(self, nome: str) -> PerfilColuna:
+        return self.colunas[nome]
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self.colunas
+
+    def colunas_numericas(self) -> List[str]:
+        return [nome for nome, perfil in self.colunas.items() if perfil.numerica]
+
+    def sugerir_eixos(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Colunas usadas quando o utilizador não escolhe X e Y: Categoria/Valor se existirem;
+        senão a primeira coluna de texto (ou a primeira coluna) e a primeira numérica restante.
+        """
+        if all(coluna in self.colunas for coluna in COLUNAS_OMISSAO):
+            return COLUNAS_OMISSAO
+        numericas = self.colunas_numericas()
+        texto = [nome for nome in self.colunas if nome not in numericas]
+        x = texto[0] if texto else next(iter(self.colunas), None)
+        y = next((nome for nome in numericas if nome != x), None)
+        return x, y
+
+    def estrategia(self, tipo: str, x: str) -> str:
+        """
+        AGREGAR (estatísticas de y por valor de x) ou PONTOS. Um gráfico de linhas com x
+        numérico e quase sempre distinto (ex.: tempo, medições contínuas) não tem nada a
+        agregar: cada linha do ficheiro é um ponto e o groupby seria trabalho inútil.
+        """
+        perfil = self.colunas[x]
+        if tipo.lower() != "linhas" or not _tipo_numerico(perfil.tipo):
+            return AGREGAR
+        if perfil.preenchidos and perfil.distintos >= LIMIAR_VALORES_UNICOS * perfil.preenchidos:
+            return PONTOS
+        return AGREGAR
+
+    def para_frame(self) -> pd.DataFrame:
+        """Resumo (uma linha por coluna) que pode ser guardado na cache de importações."""
+        return pd.DataFrame(
+            [[perfil.tipo, perfil.linhas, perfil.nulos, perfil.numericos, perfil.minimo, perfil.maximo, perfil.distintos]
+             for perfil in self.colunas.values()],
+            index=list(self.colunas), columns=COLUNAS_PERFIL,
+        ).rename_axis("coluna").reset_index()
+
+    @classmethod
+    def de_frame(cls, frame: pd.DataFrame) -> "PerfilDados":
+        perfil = cls([])
+        for valores in frame.to_dict("records"):
+            nome = str(valores["coluna"])
+            perfil.colunas[nome] = PerfilColuna.de_valores(nome, valores)
+        return perfil
+
+    def __repr__(self) -> str:
+        return "PerfilDados(" + "; ".join(map(repr, self.colunas.values())) + ")"
+
+
+def _limite(funcao, atual: float, novo: float) -> float:
+    """min/max que ignora os NaN (limites ainda desconhecidos)."""
+    valores = [valor for valor in (atual, novo) if not math.isnan(valor)]
+    return funcao(valores) if valores else math.nan
+
+
+def _tipo_numerico(tipo: str) -> bool:
+    try:
+        return tipo != "bool" and pd.api.types.is_numeric_dtype(np.dtype(tipo))
+    except TypeError:
+        return False
+
+
+def _tipo_comum(atual: str, novo) -> str:
+    """dtype que o pandas daria à coluna inteira a partir dos dtypes de dois blocos."""
+    novo = str(novo)
+    if not atual or atual == novo:
+        return novo
+    if _tipo_numerico(atual) and _tipo_numerico(novo):
+        return str(np.result_type(atual, novo))
+    return "object"
@@ -0,0 +1,148 @@
+from typing import Callable, Optional, Tuple
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from graficos.agregacao import BARRAS_ERRO_OMISSAO, calcular_barras_erro
+from graficos.amostragem import baldes_por_largura, reduzir_min_max
+from graficos.opcoes import TIPOS_GRAFICO
+
+# =============================================================================
+# Desenho dos gráficos em objetos Figure/Axes explícitos (sem o estado global do pyplot)
+# =============================================================================
+
+TAMANHO_FIGURA = (6, 4)  # Polegadas
+
+
+class TipoGraficoNaoSuportadoErro(ValueError):
+    """Erro lançado quando é pedido um tipo de gráfico desconhecido."""
+
+
+# Desenha as barras/banda de erro de um modo nos eixos e devolve o artista (None se "nenhum")
+DesenhoErros = Callable[[str], Optional[Artist]]
+
+
+class GraficoRenderizado:
+    """Figura desenhada e o número de pontos desenhados face aos existentes nos dados."""
+    def __init__(self, figura: Figure, pontos_desenhados: int, pontos_totais: int,
+                 barras_erro: str = BARRAS_ERRO_OMISSAO, desenhar_erros: Optional[DesenhoErros] = None,
+                 erros: Optional[Artist] = None) -> None:
+        self.figura = figura
+        self.pontos_desenhados = pontos_desenhados
+        self.pontos_totais = pontos_totais
+        self.barras_erro = barras_erro
+        self.__desenhar_erros = desenhar_erros
+        self.__erros = erros
+
+    def alterar_aparencia(self, x_label: str, y_label: str, titulo: str, barras_erro: str) -> None:
+        """
+        Muda os rótulos, o título e o modo das barras de erro sem voltar a desenhar os dados:
+        só os textos e o artista das barras/banda de erro são alterados. Se a figura já está
+        a ser mostrada, deve ser chamado na thread que a desenha.
+        """
+        eixo = self.figura.axes[0]
+        eixo.set_xlabel(x_label)
+        eixo.set_ylabel(y_label)
+        eixo.set_title(titulo)
+        if barras_erro != self.barras_erro and self.__desenhar_erros is not None:
+            if self.__erros is not None:
+                self.__erros.remove()
+            self.__erros = self.__desenhar_erros(barras_erro)
+            self.barras_erro = barras_erro
+            reajustar_eixos(eixo)
+        self.figura.tight_layout()
+        self.figura.canvas.draw_idle()
+
+
+def renderizar_grafico(tipo: str, tabela: pd.DataFrame, x: str, x_label: str, y_label: str, titulo: str,
+                       barras_erro: str = BARRAS_ERRO_OMISSAO, tamanho: Tuple[float, float] = TAMANHO_FIGURA,
+                       dpi: Optional[float] = None) -> GraficoRenderizado:
+    """
+    Desenha o gráfico numa Figure nova, com um canvas Agg (não interativo) próprio.
+
+    Não usa o pyplot: a figura não fica registada em nenhum estado global, por isso
+    várias figuras podem ser desenhadas em simultâneo (ex.: num pool de threads) e a
+    figura pode depois ser mostrada numa janela ou gravada por quem a recebe.
+    :param tabela: Estatísticas por valor de x (colunas x, media, ..., ver agregacao.py).
+    """
+    if tipo.lower() not in TIPOS_GRAFICO:
+        raise TipoGraficoNaoSuportadoErro(f"Tipo de gráfico não suportado: {tipo}")
+
+    figura = Figure(figsize=tamanho, dpi=dpi)
+    FigureCanvasAgg(figura)
+    eixo = figura.add_subplot()
+    if tipo.lower() == "barras":
+        desenhados, desenhar_erros = _desenhar_barras(eixo, tabela, x)
+    else:
+        desenhados, desenhar_erros = _desenhar_linhas(eixo, tabela, x)
+    erros = desenhar_erros(barras_erro)
+
+    eixo.set_xlabel(x_label)
+    eixo.set_ylabel(y_label)
+    eixo.set_title(titulo)
+    figura.tight_layout()
+    return GraficoRenderizado(figura, desenhados, len(tabela), barras_erro, desenhar_erros, erros)
+
+
+def reajustar_eixos(eixo: Axes) -> None:
+    """Recalcula os limites dos eixos a partir dos dados desenhados, incluindo as coleções
+    (barras e bandas de erro), que o relim() do matplotlib ignora."""
+    eixo.relim()
+    for colecao in eixo.collections:
+        limites = colecao.get_datalim(eixo.transData).get_points()
+        if np.isfinite(limites).all():
+            eixo.update_datalim(limites)
+    eixo.autoscale_view()
+
+
+def _desenhar_barras(eixo: Axes, tabela: pd.DataFrame, x: str) -> Tuple[int, DesenhoErros]:
+    """Uma barra por categoria (média), com as barras de erro já calculadas na agregação."""
+    sns.barplot(x=x, y="media", data=tabela, order=list(tabela[x]), errorbar=None, ax=eixo)
+
+    def desenhar_erros(modo_erro: str) -> Optional[Artist]:
+        erros = calcular_barras_erro(tabela, modo_erro)
+        if erros is None:
+            return None
+        # Mesmo aspeto das barras de erro desenhadas pelo seaborn
+        return eixo.errorbar(range(len(tabela)), tabela["media"], yerr=erros, fmt="none", ecolor=".26",
+                             elinewidth=1.5 * matplotlib.rcParams["lines.linewidth"])
+    return len(tabela), desenhar_erros
+
+
+def _desenhar_linhas(eixo: Axes, tabela: pd.DataFrame, x: str) -> Tuple[int, DesenhoErros]:
+    """
+    Desenha a linha das médias por x, reduzida à resolução da figura (mínimo/máximo por
+    pixel). Devolve o número de pontos desenhados e a função que desenha a banda de erro.
+    """
+    numerico = pd.api.types.is_numeric_dtype(tabela[x])
+    if numerico:
+        tabela = tabela.sort_values(x, kind="stable")
+        posicoes = tabela[x].to_numpy()
+    else:
+        # x categórico: desenhado pela ordem de aparição, com as categorias como rótulos
+        posicoes = np.arange(len(tabela))
+
+    figura = eixo.get_figure()
+    medias = tabela["media"].to_numpy()
+    indices = reduzir_min_max(posicoes, medias, baldes_por_largura(figura.get_figwidth(), figura.dpi))
+    linha, = eixo.plot(posicoes[indices], medias[indices])
+
+    def desenhar_erros(modo_erro: str) -> Optional[Artist]:
+        erros = calcular_barras_erro(tabela, modo_erro)
+        if erros is None:
+            return None
+        return eixo.fill_between(posicoes[indices], medias[indices] - erros[indices], medias[indices] + erros[indices],
+                                 color=linha.get_color(), alpha=0.2, linewidth=0)
+
+    if not numerico:
+        rotulos = tabela[x].astype(str).to_numpy()
+        eixo.xaxis.set_major_locator(MaxNLocator(integer=True))
+        eixo.xaxis.set_major_formatter(FuncFormatter(lambda valor, _: rotulos[int(valor)] if 0 <= valor < len(rotulos) else ""))
+    return len(indices), desenhar_erros
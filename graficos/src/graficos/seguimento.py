@@ -0,0 +1,270 @@
+import io
+import os
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from graficos.agregacao import BARRAS_ERRO_OMISSAO, calcular_barras_erro, estatisticas, resumir
+from graficos.amostragem import baldes_por_largura, reduzir_min_max
+from graficos.esquema import EsquemaCSV
+from graficos.importacao import AgregadorCategorias
+from graficos.renderizacao import TAMANHO_FIGURA, TIPOS_GRAFICO, TipoGraficoNaoSuportadoErro, reajustar_eixos
+
+# =============================================================================
+# Seguimento de ficheiros CSV em crescimento (ex.: escritos por data loggers)
+# =============================================================================
+
+BYTES_POR_LEITURA = 8 * 1024 * 1024  # Máximo lido de cada vez (limita a memória a cada passo)
+JANELA_LINHAS = 100_000             # Linhas mantidas nos gráficos de linhas (janela deslizante)
+
+
+class LeitorIncremental:
+    """
+    Lê de um ficheiro CSV apenas as linhas acrescentadas desde a leitura anterior.
+
+    Guarda a posição (em bytes) até onde o ficheiro já foi lido e a identificação do
+    ficheiro (dispositivo e inode). Uma linha ainda incompleta no fim do ficheiro fica
+    para a leitura seguinte. Se o ficheiro encolher (truncado) ou passar a ser outro
+    ficheiro com o mesmo nome (rodado), a leitura recomeça do início, sem o cabeçalho.
+    Uma linha mais longa do que bytes_por_leitura nunca ficaria completa numa leitura:
+    é ignorada (e contada em linhas_ignoradas) e a leitura continua na linha seguinte.
+    """
+    def __init__(self, caminho: str, esquema: EsquemaCSV, bytes_por_leitura: int = BYTES_POR_LEITURA) -> None:
+        self.caminho = caminho
+        self.colunas = list(esquema.colunas)
+        self.opcoes = esquema.opcoes_leitura()
+        self.bytes_por_leitura = bytes_por_leitura
+        self.posicao = 0
+        self.linhas_ignoradas = 0
+        self.__identificacao: Optional[Tuple[int, int]] = None
+        self.__cabecalho_lido = False
+        self.__a_ignorar = False   # A posição está a meio de uma linha demasiado longa
+
+    def ler_novas(self) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        Lê as linhas completas acrescentadas (no máximo bytes_por_leitura de cada vez).
+        :return: (linhas novas ou None, True se o ficheiro foi truncado ou rodado e a
+                 leitura recomeçou do início).
+        """
+        try:
+            ficheiro = open(self.caminho, "rb")
+        except FileNotFoundError:
+            # Durante a rotação o ficheiro pode não existir por instantes
+            return None, False
+        with ficheiro:
+            estado = os.fstat(ficheiro.fileno())
+            identificacao = (estado.st_dev, estado.st_ino)
+            reiniciado = False
+            if self.__identificacao is not None and (identificacao != self.__identificacao or estado.st_size < self.posicao):
+                self.posicao, self.__cabecalho_lido, self.__a_ignorar = 0, False, False
+                reiniciado = True
+            self.__identificacao = identificacao
+
+            if estado.st_size <= self.posicao:
+                return None, reiniciado
+            ficheiro.seek(self.posicao)
+            dados = ficheiro.read(self.bytes_por_leitura)
+        lidos = len(dados)
+
+        if self.__a_ignorar:
+            # Resto da linha demasiado longa: descartado até à quebra de linha
+            quebra = dados.find(b"\n")
+            if quebra == -1:
+                self.posicao += lidos
+                return None, reiniciado
+            dados = dados[quebra + 1:]
+            self.posicao += quebra + 1
+            self.__a_ignorar = False
+
+        # Só as linhas completas; o resto é lido de novo quando o escritor terminar a linha
+        fim = dados.rfind(b"\n") + 1
+        if fim == 0:
+            if lidos == self.bytes_por_leitura and len(dados) == lidos:
+                # Nem uma linha completa numa leitura cheia: a linha nunca caberia, é ignorada
+                self.posicao += lidos
+                self.__a_ignorar = True
+                self.__cabecalho_lido = True
+                self.linhas_ignoradas += 1
+            return None, reiniciado
+        dados = dados[:fim]
+        self.posicao += fim
+
+        if not self.__cabecalho_lido:
+            dados = dados[dados.find(b"\n") + 1:]
+            self.__cabecalho_lido = True
+        if not dados.strip():
+            return None, reiniciado
+        bloco = pd.read_csv(io.BytesIO(dados), header=None, names=self.colunas, **self.opcoes)
+        return bloco, reiniciado
+
+
+class AgregadoAoVivo:
+    """
+    Estatísticas por valor de x atualizadas a cada bloco de linhas novas.
+
+    Nos gráficos de barras são acumuladas todas as linhas (a memória depende apenas do
+    número de categorias). Nos gráficos de linhas só as últimas `janela` linhas contam,
+    para que a memória não cresça com o ficheiro.
+    """
+    def __init__(self, tipo: str, x: str, y: str, janela: int = JANELA_LINHAS) -> None:
+        self.tipo = tipo.lower()
+        self.x = x
+        self.y = y
+        self.janela = janela
+        self.linhas = 0          # Linhas válidas recebidas desde o início/reinício
+        self.descartadas = 0     # Linhas com valor não numérico ou em falta, ignoradas
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        self.__agregador = AgregadorCategorias(self.x, self.y)
+        self.__blocos: Deque[pd.DataFrame] = deque()
+        self.__linhas_janela = 0
+        self.linhas = self.descartadas = 0
+
+    def adicionar(self, bloco: pd.DataFrame) -> None:
+        # Num ficheiro a ser escrito uma linha inválida não deve parar o seguimento
+        valores = pd.to_numeric(bloco[self.y], errors="coerce")
+        validas = valores.notna() & bloco[self.x].notna()
+        self.descartadas += int((~validas).sum())
+        bloco = pd.DataFrame({self.x: bloco[self.x][validas], self.y: valores[validas]})
+        if bloco.empty:
+            return
+        self.linhas += len(bloco)
+
+        if self.tipo == "barras":
+            self.__agregador.adicionar(bloco)
+            return
+        self.__blocos.append(bloco)
+        self.__linhas_janela += len(bloco)
+        while self.__linhas_janela - len(self.__blocos[0]) >= self.janela:
+            self.__linhas_janela -= len(self.__blocos.popleft())
+
+    def tabela(self) -> pd.DataFrame:
+        """Estatísticas por valor de x (mesmas colunas de AgregadorCategorias.resultado())."""
+        if self.tipo == "barras":
+            return self.__agregador.resultado()
+        if not self.__blocos:
+            return AgregadorCategorias(self.x, self.y).resultado()
+        janela = pd.concat(self.__blocos, ignore_index=True).tail(self.janela)
+        return estatisticas(resumir(janela[self.y], janela[self.x]), self.x)
+
+
+class GraficoAoVivo:
+    """
+    Gráfico cuja figura é criada uma vez e depois atualizada no lugar: a cada atualização
+    mudam apenas os dados dos artistas (alturas das barras, pontos da linha, barras e
+    banda de erro), sem recriar a figura nem os eixos.
+
+    Depois de entregue à View, atualizar() deve ser chamado na thread que desenha a figura.
+    """
+    def __init__(self, tipo: str, x: str, x_label: str, y_label: str, titulo: str,
+                 barras_erro: str = BARRAS_ERRO_OMISSAO) -> None:
+        if tipo.lower() not in TIPOS_GRAFICO:
+            raise TipoGraficoNaoSuportadoErro(f"Tipo de gráfico não suportado: {tipo}")
+        self.tipo = tipo.lower()
+        self.x = x
+        self.barras_erro = barras_erro
+        self.figura = Figure(figsize=TAMANHO_FIGURA)
+        FigureCanvasAgg(self.figura)
+        self.eixo: Axes = self.figura.add_subplot()
+        self.eixo.set_xlabel(x_label)
+        self.eixo.set_ylabel(y_label)
+        self.eixo.set_title(titulo)
+
+        self.__categorias: List[str] = []
+        self.__barras = None
+        self.__erros = None
+        self.__linha = None
+        self.__banda = None
+        self.__rotulos = np.array([], dtype=object)
+        self.__tabela: Optional[pd.DataFrame] = None
+        # Mesma cor das barras desenhadas pelo seaborn em renderizacao.py
+        self.__cor = sns.desaturate("C0", 0.75)
+
+    def atualizar(self, tabela: pd.DataFrame) -> None:
+        """Atualiza os artistas com as estatísticas atuais e reajusta os eixos."""
+        self.__tabela = tabela
+        if self.tipo == "barras":
+            self.__atualizar_barras(tabela)
+        else:
+            self.__atualizar_linhas(tabela)
+        reajustar_eixos(self.eixo)
+        self.figura.canvas.draw_idle()
+
+    def alterar_aparencia(self, x_label: str, y_label: str, titulo: str, barras_erro: str) -> None:
+        """Muda rótulos, título e modo das barras de erro (mesma interface de GraficoRenderizado)."""
+        self.eixo.set_xlabel(x_label)
+        self.eixo.set_ylabel(y_label)
+        self.eixo.set_title(titulo)
+        if barras_erro != self.barras_erro:
+            self.barras_erro = barras_erro
+            for artista in (self.__erros, self.__banda):
+                if artista is not None:
+                    artista.remove()
+            self.__erros = self.__banda = None
+            if self.__tabela is not None:
+                self.atualizar(self.__tabela)
+        self.figura.canvas.draw_idle()
+
+    def __atualizar_barras(self, tabela: pd.DataFrame) -> None:
+        categorias = tabela[self.x].astype(str).tolist()
+        medias = tabela["media"].to_numpy(dtype="float64")
+        erros = calcular_barras_erro(tabela, self.barras_erro)
+        posicoes = np.arange(len(tabela))
+
+        if self.__barras is None or categorias != self.__categorias:
+            # Apareceram categorias novas: só então as barras são recriadas (nos mesmos eixos)
+            if self.__barras is not None:
+                self.__barras.remove()
+            self.__barras = self.eixo.bar(posicoes, medias, color=self.__cor)
+            self.eixo.set_xticks(posicoes, categorias)
+            self.__categorias = categorias
+        else:
+            for barra, media in zip(self.__barras, medias):
+                barra.set_height(media)
+
+        if erros is None:
+            return
+        segmentos = [[(p, m - e), (p, m + e)] for p, m, e in zip(posicoes, medias, np.nan_to_num(erros))]
+        if self.__erros is None:
+            self.__erros = self.eixo.vlines(posicoes, medias, medias, colors=".26")
+        self.__erros.set_segments(segmentos)
+
+    def __atualizar_linhas(self, tabela: pd.DataFrame) -> None:
+        numerico = pd.api.types.is_numeric_dtype(tabela[self.x])
+        if numerico:
+            tabela = tabela.sort_values(self.x, kind="stable")
+            posicoes = tabela[self.x].to_numpy(dtype="float64")
+        else:
+            posicoes = np.arange(len(tabela), dtype="float64")
+            self.__rotulos = tabela[self.x].astype(str).to_numpy()
+
+        medias = tabela["media"].to_numpy(dtype="float64")
+        indices = reduzir_min_max(posicoes, medias, baldes_por_largura(self.figura.get_figwidth(), self.figura.dpi))
+        if self.__linha is None:
+            self.__linha, = self.eixo.plot(posicoes[indices], medias[indices])
+            if not numerico:
+                rotulos = lambda valor, _: self.__rotulos[int(valor)] if 0 <= valor < len(self.__rotulos) else ""
+                self.eixo.xaxis.set_major_locator(MaxNLocator(integer=True))
+                self.eixo.xaxis.set_major_formatter(FuncFormatter(rotulos))
+        else:
+            self.__linha.set_data(posicoes[indices], medias[indices])
+
+        erros = calcular_barras_erro(tabela, self.barras_erro)
+        if erros is None:
+            return
+        x, inferior, superior = posicoes[indices], medias[indices] - erros[indices], medias[indices] + erros[indices]
+        if self.__banda is not None and hasattr(self.__banda, "set_data"):
+            self.__banda.set_data(x, inferior, superior)   # matplotlib >= 3.10
+        else:
+            if self.__banda is not None:
+                self.__banda.remove()
+            self.__banda = self.eixo.fill_between(x, inferior, superior, color=self.__linha.get_color(),
+                                                  alpha=0.2, linewidth=0)
@@ -0,0 +1,56 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# Otimização dos tipos de dados (dtypes) das colunas importadas
+# =============================================================================
+
+# Colunas de texto com uma fração de valores distintos até este limiar passam a categóricas
+LIMIAR_CARDINALIDADE_CATEGORICA = 0.5
+
+
+def memoria_bytes(df: pd.DataFrame) -> int:
+    """Memória ocupada pelo DataFrame, incluindo o conteúdo das strings."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def otimizar_tipos(df: pd.DataFrame, limiar_cardinalidade: float = LIMIAR_CARDINALIDADE_CATEGORICA) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Converte as colunas para tipos mais compactos sem perder informação:
+      - texto repetitivo -> category;
+      - inteiros -> o menor tipo inteiro que contém todos os valores;
+      - decimais -> float32 apenas se todos os valores forem representáveis sem perda.
+    Devolve (df_otimizado, memória_antes, memória_depois), em bytes.
+    """
+    antes = memoria_bytes(df)
+    colunas = {}
+    for nome in df.columns:
+        colunas[nome] = _otimizar_coluna(df[nome], limiar_cardinalidade)
+    otimizado = pd.DataFrame(colunas, index=df.index, copy=False)
+    return otimizado, antes, memoria_bytes(otimizado)
+
+
+def _otimizar_coluna(serie: pd.Series, limiar_cardinalidade: float) -> pd.Series:
+    tipo = serie.dtype
+    if isinstance(tipo, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(tipo):
+        return serie
+
+    if pd.api.types.is_integer_dtype(tipo):
+        inteiros = pd.to_numeric(serie, downcast="integer")
+        return inteiros if inteiros.dtype.itemsize < tipo.itemsize else serie
+
+    if pd.api.types.is_float_dtype(tipo):
+        if tipo == np.float32:
+            return serie
+        reduzida = serie.astype(np.float32)
+        # A conversão só é feita se todos os valores sobreviverem à ida e volta
+        iguais = (reduzida.astype(tipo) == serie) | serie.isna()
+        return reduzida if iguais.all() else serie
+
+    if pd.api.types.is_object_dtype(tipo) or pd.api.types.is_string_dtype(tipo):
+        if len(serie) and serie.nunique(dropna=True) <= limiar_cardinalidade * len(serie):
+            # Categorias pela ordem de aparição, para não alterar a ordem nos gráficos
+            return serie.astype(pd.CategoricalDtype(pd.unique(serie.dropna())))
+    return serie
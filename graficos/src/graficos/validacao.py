@@ -0,0 +1,211 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from graficos.opcoes import POLITICA_VALIDACAO_OMISSAO, POLITICAS_VALIDACAO
+
+# =============================================================================
+# Validação da qualidade dos dados (colunas de valores)
+# =============================================================================
+
+LINHAS_EXEMPLO = 10          # Números de linha guardados por coluna e problema
+PRIMEIRA_LINHA_DADOS = 2     # Linha do ficheiro onde começam os dados (a linha 1 é o cabeçalho)
+
+# Problemas detetados e a sua descrição nas mensagens
+PROBLEMAS: Dict[str, str] = {
+    "nao_numerico": "valores não numéricos",
+    "em_falta": "valores em falta",
+    "negativo": "valores negativos",
+    "fora_intervalo": "valores fora do intervalo",
+}
+
+
+class ValoresInvalidosErro(ValueError):
+    """Erro lançado, com a política "rejeitar", quando uma coluna de valores tem valores inválidos."""
+
+
+class RegrasValidacao:
+    """
+    O que é um valor inválido: não numérico, fora do intervalo [minimo, maximo] (se
+    definido) ou negativo (se os negativos não forem permitidos). Valores em falta e
+    negativos permitidos são apenas reportados.
+    """
+    def __init__(self, minimo: Optional[float] = None, maximo: Optional[float] = None, negativos: bool = True) -> None:
+        self.minimo = minimo
+        self.maximo = maximo
+        self.negativos = negativos
+
+    def problemas(self, numeros: np.ndarray, em_falta: np.ndarray) -> Dict[str, np.ndarray]:
+        """Máscara (uma entrada por linha) de cada problema."""
+        with np.errstate(invalid="ignore"):
+            fora = np.zeros(len(numeros), dtype=bool)
+            if self.minimo is not None:
+                fora |= numeros < self.minimo
+            if self.maximo is not None:
+                fora |= numeros > self.maximo
+            return {
+                "nao_numerico": np.isnan(numeros) & ~em_falta,
+                "em_falta": em_falta,
+                "negativo": numeros < 0,
+                "fora_intervalo": fora,
+            }
+
+    def problemas_invalidos(self) -> List[str]:
+        """Problemas que tornam um valor inválido (sujeitos à política)."""
+        return ["nao_numerico", "fora_intervalo"] + ([] if self.negativos else ["negativo"])
+
+    def invalidos(self, numeros: np.ndarray, em_falta: np.ndarray) -> np.ndarray:
+        problemas = self.problemas(numeros, em_falta)
+        return np.logical_or.reduce([problemas[nome] for nome in self.problemas_invalidos()])
+
+    def limites(self) -> Tuple[Optional[float], Optional[float]]:
+        """Intervalo para onde a política "coagir" ajusta os valores."""
+        inferior = self.minimo if self.negativos else max(self.minimo or 0.0, 0.0)
+        return inferior, self.maximo
+
+    def __repr__(self) -> str:
+        return f"RegrasValidacao(minimo={self.minimo!r}, maximo={self.maximo!r}, negativos={self.negativos!r})"
+
+
+def converter_numeros(serie: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte a coluna em float64 (NaN onde não há um número) e devolve também a máscara
+    dos valores em falta. Nas colunas de texto a conversão é feita uma vez por valor
+    distinto e espalhada pelas linhas com os códigos do factorize (sem ciclos por linha).
+    """
+    if pd.api.types.is_numeric_dtype(serie.dtype):
+        numeros = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+        return numeros, np.isnan(numeros)
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    numeros_unicos = pd.to_numeric(pd.Series(unicos, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    # O código -1 (valor em falta) escolhe o NaN acrescentado no fim
+    return np.append(numeros_unicos, np.nan)[codigos], codigos < 0
+
+
+class DiagnosticoColuna:
+    """Contagem de cada problema numa coluna e os números das primeiras linhas afetadas."""
+    def __init__(self) -> None:
+        self.contagens: Dict[str, int] = dict.fromkeys(PROBLEMAS, 0)
+        self.linhas: Dict[str, List[int]] = {nome: [] for nome in PROBLEMAS}
+
+    def adicionar(self, problemas: Dict[str, np.ndarray], inicio: int) -> None:
+        """:param inicio: Índice (desde 0) da primeira linha do bloco nos dados do ficheiro."""
+        for nome, mascara in problemas.items():
+            contagem = int(np.count_nonzero(mascara))
+            if not contagem:
+                continue
+            self.contagens[nome] += contagem
+            em_falta = LINHAS_EXEMPLO - len(self.linhas[nome])
+            if em_falta > 0:
+                indices = np.flatnonzero(mascara)[:em_falta]
+                self.linhas[nome].extend((indices + inicio + PRIMEIRA_LINHA_DADOS).tolist())
+
+    def juntar(self, outro: "DiagnosticoColuna", desvio: int) -> None:
+        """Junta o diagnóstico da parte seguinte do ficheiro, que começa `desvio` linhas depois."""
+        for nome in PROBLEMAS:
+            self.contagens[nome] += outro.contagens[nome]
+            em_falta = LINHAS_EXEMPLO - len(self.linhas[nome])
+            self.linhas[nome].extend(linha + desvio for linha in outro.linhas[nome][:max(em_falta, 0)])
+
+
+class RelatorioValidacao:
+    """
+    Diagnóstico de todas as colunas, construído bloco a bloco na mesma passagem pelo
+    ficheiro que o perfil (ver perfil.py), com operações vetorizadas sobre cada bloco.
+    Partes do ficheiro analisadas em processos diferentes são juntas pela ordem do ficheiro.
+    """
+    def __init__(self, colunas: Sequence[str], regras: Optional[RegrasValidacao] = None) -> None:
+        self.regras = regras or RegrasValidacao()
+        self.linhas = 0
+        self.colunas: Dict[str, DiagnosticoColuna] = {str(nome): DiagnosticoColuna() for nome in colunas}
+
+    def adicionar(self, bloco: pd.DataFrame) -> None:
+        for nome, diagnostico in self.colunas.items():
+            numeros, em_falta = converter_numeros(bloco[nome])
+            diagnostico.adicionar(self.regras.problemas(numeros, em_falta), self.linhas)
+        self.linhas += len(bloco)
+
+    def juntar(self, outro: "RelatorioValidacao") -> None:
+        for nome, diagnostico in self.colunas.items():
+            diagnostico.juntar(outro.colunas[nome], self.linhas)
+        self.linhas += outro.linhas
+
+    def invalidos(self, coluna: str) -> int:
+        contagens = self.colunas[coluna].contagens
+        return sum(contagens[nome] for nome in self.regras.problemas_invalidos())
+
+    def descrever(self, colunas: Sequence[str], apenas_invalidos: bool = False) -> List[str]:
+        """Uma frase por coluna e problema encontrado, ex.: "Valor: 2 valores não numéricos (linhas 2, 3)"."""
+        problemas = self.regras.problemas_invalidos() if apenas_invalidos else list(PROBLEMAS)
+        frases = []
+        for coluna in colunas:
+            diagnostico = self.colunas[coluna]
+            for nome in problemas:
+                contagem = diagnostico.contagens[nome]
+                if contagem:
+                    linhas = ", ".join(map(str, diagnostico.linhas[nome]))
+                    mais = ", ..." if contagem > len(diagnostico.linhas[nome]) else ""
+                    frases.append(f"{coluna}: {contagem} {PROBLEMAS[nome]} (linhas {linhas}{mais})")
+        return frases
+
+    def para_frame(self) -> pd.DataFrame:
+        """Resumo (uma linha por coluna e problema) que pode ser guardado na cache de importações."""
+        return pd.DataFrame(
+            [[coluna, nome, diagnostico.contagens[nome], ",".join(map(str, diagnostico.linhas[nome])), self.linhas]
+             for coluna, diagnostico in self.colunas.items() for nome in PROBLEMAS],
+            columns=["coluna", "problema", "contagem", "linhas", "total_linhas"],
+        )
+
+    @classmethod
+    def de_frame(cls, frame: pd.DataFrame, regras: Optional[RegrasValidacao] = None) -> "RelatorioValidacao":
+        relatorio = cls([], regras)
+        for valores in frame.to_dict("records"):
+            diagnostico = relatorio.colunas.setdefault(str(valores["coluna"]), DiagnosticoColuna())
+            diagnostico.contagens[valores["problema"]] = int(valores["contagem"])
+            diagnostico.linhas[valores["problema"]] = [int(linha) for linha in str(valores["linhas"]).split(",") if linha]
+            relatorio.linhas = int(valores["total_linhas"])
+        return relatorio
+
+
+def tratar_invalidos(numeros: np.ndarray, em_falta: np.ndarray, coluna: str, regras: Optional[RegrasValidacao] = None,
+                     politica: str = POLITICA_VALIDACAO_OMISSAO) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Aplica a política (ver aplicar_politica) a uma coluna já convertida por converter_numeros.
+    Devolve os números tratados e a máscara das linhas que ficam (None se ficam todas).
+    """
+    if politica not in POLITICAS_VALIDACAO:
+        raise ValueError(f"Política de validação desconhecida: {politica}")
+    regras = regras or RegrasValidacao()
+    invalidos = regras.invalidos(numeros, em_falta)
+    if not invalidos.any():
+        return numeros, None
+
+    if politica == "rejeitar":
+        problemas = regras.problemas(numeros, em_falta)
+        descricao = ", ".join(f"{int(np.count_nonzero(problemas[nome]))} {PROBLEMAS[nome]}"
+                              for nome in regras.problemas_invalidos() if problemas[nome].any())
+        raise ValoresInvalidosErro(f"A coluna '{coluna}' contém {descricao}.")
+    if politica == "descartar":
+        return numeros[~invalidos], ~invalidos
+    inferior, superior = regras.limites()
+    return (np.clip(numeros, inferior, superior) if (inferior, superior) != (None, None) else numeros), None
+
+
+def aplicar_politica(bloco: pd.DataFrame, coluna: str, regras: Optional[RegrasValidacao] = None,
+                     politica: str = POLITICA_VALIDACAO_OMISSAO) -> pd.DataFrame:
+    """
+    Devolve o bloco com a coluna convertida em números, tratando os valores inválidos
+    segundo a política:
+      - "coagir": não numéricos passam a NaN (ignorados nas estatísticas) e os valores
+        fora do intervalo são ajustados ao limite mais próximo;
+      - "descartar": as linhas com valores inválidos são removidas;
+      - "rejeitar": lança ValoresInvalidosErro.
+    """
+    numeros, em_falta = converter_numeros(bloco[coluna])
+    tratados, ficam = tratar_invalidos(numeros, em_falta, coluna, regras, politica)
+    if ficam is not None:
+        return bloco.loc[ficam].assign(**{coluna: tratados})
+    if tratados is numeros and pd.api.types.is_numeric_dtype(bloco[coluna].dtype):
+        return bloco
+    return bloco.assign(**{coluna: tratados})
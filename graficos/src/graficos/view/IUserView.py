@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from matplotlib.figure import Figure
+    from graficos.renderizacao import GraficoRenderizado
+    from graficos.seguimento import GraficoAoVivo
 
 class IUserView(ABC):
 
@@ -28,6 +34,30 @@ class IUserView(ABC):
     @abstractmethod
     def grava_grafico_click_evt(self): pass
 
+    @property
+    @abstractmethod
+    def cancelar_tarefa_click_evt(self): pass
+
+    @property
+    @abstractmethod
+    def seguir_ficheiro_click_evt(self): pass
+
+    @property
+    @abstractmethod
+    def alterar_aparencia_click_evt(self): pass
+
+    @property
+    @abstractmethod
+    def voltar_menu_click_evt(self): pass
+
+    @property
+    @abstractmethod
+    def galeria_click_evt(self): pass
+
+    @property
+    @abstractmethod
+    def miniatura_selecionada_click_evt(self): pass
+
     # Métodos públicos obrigatórios
     @abstractmethod
     def ativar_interface(self) -> None: pass
@@ -39,7 +69,7 @@ class IUserView(ABC):
     def mostra_dlg_grava_grafico(self) -> None: pass
 
     @abstractmethod
-    def mostra_formulario_parametros(self, colunas: List[str]) -> None: pass
+    def mostra_formulario_parametros(self, colunas: List[str], colunas_y: Optional[List[str]] = None) -> None: pass
 
     @abstractmethod
     def mostra_mensagem_info(self, mensagem: str) -> None: pass
@@ -48,7 +78,20 @@ class IUserView(ABC):
     def atualiza_lista_graficos(self, graficos: List[str]) -> None: pass
 
     @abstractmethod
-    def mostrar_grafico(self, lista_graficos: List[str]) -> None: pass
+    def mostrar_grafico(self, figura: "Figure") -> None: pass
+
+    @abstractmethod
+    def atualizar_grafico(self, grafico: "GraficoAoVivo", tabela: "pd.DataFrame") -> None: pass
+
+    @abstractmethod
+    def alterar_aparencia_grafico(self, grafico: "GraficoRenderizado", x_label: str, y_label: str, titulo: str,
+                                  barras_erro: str) -> None: pass
+
+    @abstractmethod
+    def mostra_galeria(self, galeria: int, tipo: str, pares: List[Tuple[str, str]]) -> None: pass
+
+    @abstractmethod
+    def mostra_miniatura(self, galeria: int, indice: int, imagem: Optional[bytes], erro: Optional[str]) -> None: pass
 
     @abstractmethod
     def mostra_erro_importacao(self, mensagem: str) -> None: pass
@@ -56,5 +99,25 @@ class IUserView(ABC):
     @abstractmethod
     def mostra_erro_ficheiro(self, mensagem: str) -> None: pass
 
+    @abstractmethod
+    def mostra_erro_geracao(self, mensagem: str) -> None: pass
+
+    @abstractmethod
+    def mostra_grafico_gravado(self, caminhos: List[str]) -> None: pass
+
+    @abstractmethod
+    def mostra_erro_gravacao(self, mensagem: str) -> None: pass
+
+    @abstractmethod
+    def mostra_tarefa_em_curso(self, em_curso: bool) -> None: pass
+
     @abstractmethod
     def voltar_menu_inicial(self) -> None: pass
+
+    # Execução na thread da interface
+    def executar_na_interface(self, funcao: Callable[..., Any], *args: Any) -> None:
+        """Executa a função na thread da interface. Pode ser chamado a partir de qualquer thread.
+
+        Por omissão a função é executada de imediato (views sem ciclo de eventos).
+        """
+        funcao(*args)
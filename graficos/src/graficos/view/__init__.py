@@ -1 +1,7 @@
-from .view import View
+def __getattr__(nome: str):
+    # A View (tkinter) só é importada quando é pedida: o modo batch usa apenas a
+    # HeadlessView e pode correr em máquinas sem tkinter
+    if nome == "View":
+        from .view import View
+        return View
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
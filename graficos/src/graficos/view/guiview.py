@@ -1,8 +1,16 @@
+import base64
+import os
 import traceback
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 
-import matplotlib.pyplot as plt
+# Janela principal no menu e com o gráfico embutido: geometria, tamanho do container e
+# posição vertical (relativa) do botão Cancelar
+TAMANHO_JANELA_MENU = ("500x300", 485, 285, 0.77)
+TAMANHO_JANELA_GRAFICO = ("860x720", 845, 705, 0.85)
+# Janela da galeria de miniaturas: geometria e número de miniaturas por linha
+TAMANHO_JANELA_GALERIA = "860x620"
+COLUNAS_GALERIA = 4
 
 # configurações de estilo (combobox)
 def configurar_estilo_dropdown():
@@ -23,10 +31,10 @@ def configurar_estilo_dropdown():
     )
 
 # Interface Principal (tkinter). Funciona com o método ativar_interface no ficheiro view.py.
-def construir_interface_principal(root, grafico_var, estado_var, on_importar_ficheiro_click, on_grafico_selecionado, on_home_click):
+def construir_interface_principal(root, grafico_var, estado_var, on_importar_ficheiro_click, on_grafico_selecionado, on_home_click, on_cancelar_click):
     try:
         root.title("Conversor .csv para Gráfico")
-        root.geometry("500x300")
+        root.geometry(TAMANHO_JANELA_MENU[0])
         root.configure(bg="#1E3A5F")
 
         # Frame principal
@@ -35,7 +43,7 @@ def construir_interface_principal(root, grafico_var, estado_var, on_importar_fic
 
         # Container central
         container = tk.Frame(outer_frame, bg="White", bd=1, relief="solid")
-        container.place(relx=0.5, rely=0.5, anchor="center", width=485, height=285)
+        container.place(relx=0.5, rely=0.5, anchor="center", width=TAMANHO_JANELA_MENU[1], height=TAMANHO_JANELA_MENU[2])
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
@@ -70,6 +78,13 @@ def construir_interface_principal(root, grafico_var, estado_var, on_importar_fic
         )
         label_estado.place(relx=0.5, rely=0.9, anchor="center")
 
+        # Botão Cancelar (só visível enquanto há uma tarefa em segundo plano)
+        btn_cancelar = tk.Button(
+            container, text="Cancelar", command=on_cancelar_click,
+            font=("Helvetica", 9), bg="white", fg="#1E3A5F", relief="groove", cursor="hand2"
+        )
+        btn_cancelar.place_forget()
+
         # Frame do botão personalizado
         btn_home_frame = tk.Frame(container, bg="white", cursor="hand2")
         btn_home_frame.place(relx=0.05, rely=0.05, anchor="nw")
@@ -98,9 +113,11 @@ def construir_interface_principal(root, grafico_var, estado_var, on_importar_fic
         label_texto.bind("<Button-1>", clique_home)
 
         return {
+            "container": container,
             "btn_importar": btn_importar,
             "dropdown_menu": dropdown_menu,
             "label_estado": label_estado,
+            "btn_cancelar": btn_cancelar,
             "btn_home_frame": btn_home_frame,
             "btn_home_icon": label_icone,
             "btn_home_text": label_texto
@@ -122,8 +139,14 @@ def construir_formulario_parametros(
     x_label_var: tk.StringVar,
     y_label_var: tk.StringVar,
     opcao_labels: tk.StringVar,
-    on_submeter_parametros
+    on_submeter_parametros,
+    barras_erro_var: tk.StringVar = None,
+    opcoes_barras_erro: list[str] = (),
+    colunas_y: list[str] = None,
+    on_galeria=None
 ) -> tk.Frame:
+    # Colunas que podem ir para o eixo Y (numéricas); por omissão, todas
+    colunas_y = colunas if colunas_y is None else colunas_y
     
     #Frame do formulário
     form_frame = tk.Frame(parent, bg="white")
@@ -132,7 +155,7 @@ def construir_formulario_parametros(
     # Funções de atualização do dropdown
     def atualizar_dropdown_y(_=None):
         coluna_x = x_var.get()
-        novas_opcoes_y = [col for col in colunas if col != coluna_x]
+        novas_opcoes_y = [col for col in colunas_y if col != coluna_x]
         dropdown_y['values'] = novas_opcoes_y
         if y_var.get() == coluna_x:
             y_var.set("Escolher coluna Y")
@@ -181,7 +204,7 @@ def construir_formulario_parametros(
 
     # Dropdowns para escolha de colunas
     dropdown_x = ttk.Combobox(form_frame, textvariable=x_var, values=colunas, state="readonly", width=30)
-    dropdown_y = ttk.Combobox(form_frame, textvariable=y_var, values=colunas, state="readonly", width=30)
+    dropdown_y = ttk.Combobox(form_frame, textvariable=y_var, values=colunas_y, state="readonly", width=30)
     dropdown_x.grid(row=2, column=0, columnspan=2, pady=5)
     dropdown_y.grid(row=3, column=0, columnspan=2, pady=5)
 
@@ -199,11 +222,25 @@ def construir_formulario_parametros(
     label_x_entry = tk.Label(form_frame, text="Eixo X", bg="white", font=("Helvetica", 10))
     label_y_entry = tk.Label(form_frame, text="Eixo Y", bg="white", font=("Helvetica", 10))
 
-    # Botão Submeter
+    # Barras de erro (apenas para gráficos de barras)
+    if barras_erro_var is not None:
+        tk.Label(form_frame, text="Barras de erro", bg="white", font=("Helvetica", 10)).grid(
+            row=4, column=0, sticky="e", padx=(10, 5), pady=5)
+        ttk.Combobox(form_frame, textvariable=barras_erro_var, values=list(opcoes_barras_erro),
+                     state="readonly", width=26).grid(row=4, column=1, sticky="w", padx=(5, 10), pady=5)
+
+    # Botões Submeter e Galeria (um gráfico por par de colunas, para escolher)
+    botoes_frame = tk.Frame(form_frame, bg="white")
+    botoes_frame.grid(row=5, column=0, columnspan=2, pady=20)
     tk.Button(
-        form_frame, text="Submeter", command=on_submeter_parametros,
+        botoes_frame, text="Submeter", command=on_submeter_parametros,
         font=("Helvetica", 11), bg="#1E3A5F", fg="white"
-    ).grid(row=5, column=0, columnspan=2, pady=20)
+    ).pack(side="left", padx=5)
+    if on_galeria is not None:
+        tk.Button(
+            botoes_frame, text="Galeria", command=on_galeria,
+            font=("Helvetica", 11), bg="#1E3A5F", fg="white"
+        ).pack(side="left", padx=5)
 
     # Inicializa visibilidade correta
     atualizar_visibilidade_labels()
@@ -232,7 +269,8 @@ def carregar_ficheiro_csv_com_dialogo(btn_importar, mostra_mensagem_info, mostra
     try:
         path = filedialog.askopenfilename(
             title="Selecionar ficheiro CSV",
-            filetypes=[("Ficheiros CSV", "*.csv"), ("Todos os ficheiros", "*.*")]
+            filetypes=[("Ficheiros CSV", "*.csv"), ("Ficheiros CSV comprimidos", "*.csv.gz *.csv.bz2 *.csv.zst *.zip"),
+                       ("Todos os ficheiros", "*.*")]
         )
         if not path:
             mostra_mensagem_info("Importação cancelada pelo utilizador.")
@@ -248,7 +286,8 @@ def carregar_ficheiro_csv_com_dialogo(btn_importar, mostra_mensagem_info, mostra
         btn_importar.config(state="normal", text="Importar Ficheiro", cursor="hand2")
 
 # Método que mostra ao utilizador as opções de gravação do ficheiro (tkinter). Funciona com o método mostra_dlg_grava_grafico no ficheiro view.py.
-def guardar_grafico_com_dialogo(callback_gravar, mostrar_info, voltar_menu):
+def guardar_grafico_com_dialogo(callback_gravar, mostrar_info, formatos_extra=()):
+    """Pede o ficheiro de destino; os formatos extra são gravados ao lado, com o mesmo nome."""
     path = filedialog.asksaveasfilename(
         title="Guardar Gráfico Como",
         defaultextension=".png",
@@ -261,14 +300,17 @@ def guardar_grafico_com_dialogo(callback_gravar, mostrar_info, voltar_menu):
     )
 
     if path:
-        callback_gravar(path)
-        messagebox.showinfo("Sucesso", f"Gráfico guardado em:\n{path}")
-        voltar_menu()
+        # A gravação corre em segundo plano: o sucesso é mostrado quando terminar
+        mostrar_info("A gravar gráfico...")
+        base = os.path.splitext(path)[0]
+        caminhos = [path] + [f"{base}.{formato}" for formato in formatos_extra]
+        callback_gravar(list(dict.fromkeys(caminhos)))
     else:
         mostrar_info("Operação de gravação cancelada.")
 
 # Método para mostrar gráfico (tkinter). Funciona com o método mostrar_grafico(self)
-def preparar_interface_grafico(view, on_guardar_click):
+def preparar_interface_grafico(view, figura, on_guardar_click, on_seguir_click=None, on_aplicar_aparencia=None,
+                               barras_erro_var=None, opcoes_barras_erro=()):
     # Esconde todos os elementos anteriores da interface
     if hasattr(view, "form_frame") and view.form_frame.winfo_exists():
         view.form_frame.destroy()
@@ -276,21 +318,163 @@ def preparar_interface_grafico(view, on_guardar_click):
         view.dropdown_menu.place_forget()
     if hasattr(view, "btn_importar") and view.btn_importar.winfo_exists():
         view.btn_importar.place_forget()
+    # Um gráfico novo (ou o do seguimento) substitui os botões do anterior
+    if hasattr(view, "botao_frame") and view.botao_frame.winfo_exists():
+        view.botao_frame.destroy()
 
-    # Frame para botão de guardar
-    view.botao_frame = tk.Frame(view, bg="white")
-    view.botao_frame.place(relx=0.5, rely=0.5, anchor="center")
-
+    redimensionar_janela(view, TAMANHO_JANELA_GRAFICO)
+    # O gráfico é mostrado na própria janela principal (a figura não pertence ao pyplot)
+    mostrar_figura_embutida(view, figura)
+
+    # Frame dos controlos, por baixo do gráfico
+    view.botao_frame = tk.Frame(getattr(view, "container", view), bg="white")
+    view.botao_frame.place(relx=0.5, rely=0.70, anchor="n")
+
+    # Aparência: rótulos, título e barras de erro mudam sem redesenhar os dados
+    if on_aplicar_aparencia is not None:
+        eixo = figura.axes[0]
+        aparencia_frame = tk.Frame(view.botao_frame, bg="white")
+        aparencia_frame.pack(pady=(0, 5))
+        view.titulo_grafico_var = tk.StringVar(value=eixo.get_title())
+        view.x_label_grafico_var = tk.StringVar(value=eixo.get_xlabel())
+        view.y_label_grafico_var = tk.StringVar(value=eixo.get_ylabel())
+        for coluna, (texto, var) in enumerate((("Título", view.titulo_grafico_var), ("Eixo X", view.x_label_grafico_var),
+                                               ("Eixo Y", view.y_label_grafico_var))):
+            tk.Label(aparencia_frame, text=texto, bg="white", font=("Helvetica", 9)).grid(row=0, column=coluna, sticky="w", padx=3)
+            ttk.Entry(aparencia_frame, textvariable=var, width=18).grid(row=1, column=coluna, padx=3)
+        if barras_erro_var is not None:
+            tk.Label(aparencia_frame, text="Barras de erro", bg="white", font=("Helvetica", 9)).grid(row=0, column=3, sticky="w", padx=3)
+            ttk.Combobox(aparencia_frame, textvariable=barras_erro_var, values=list(opcoes_barras_erro),
+                         state="readonly", width=22).grid(row=1, column=3, padx=3)
+        tk.Button(
+            aparencia_frame, text="Aplicar", command=on_aplicar_aparencia,
+            font=("Helvetica", 9), bg="#1E3A5F", fg="white"
+        ).grid(row=1, column=4, padx=(6, 0))
+
+    acoes_frame = tk.Frame(view.botao_frame, bg="white")
+    acoes_frame.pack()
     view.btn_guardar_grafico = tk.Button(
-        view.botao_frame, text="Guardar Gráfico",
+        acoes_frame, text="Guardar Gráfico",
         command=on_guardar_click,
         font=("Helvetica", 11), bg="#1E3A5F", fg="white"
     )
-    view.btn_guardar_grafico.pack(pady=10)
+    view.btn_guardar_grafico.pack(side="left", padx=(0, 10))
+
+    # Formatos gravados em simultâneo com o escolhido no diálogo (a partir do mesmo desenho)
+    tk.Label(acoes_frame, text="Gravar também:", bg="white").pack(side="left")
+    view.formatos_extra_vars = {}
+    for formato in ("png", "svg", "pdf"):
+        var = tk.BooleanVar(value=False)
+        tk.Checkbutton(acoes_frame, text=formato.upper(), variable=var, bg="white").pack(side="left")
+        view.formatos_extra_vars[formato] = var
+
+    # Seguimento do ficheiro: o gráfico é atualizado à medida que o ficheiro cresce
+    if on_seguir_click is not None:
+        view.seguir_var = tk.BooleanVar(value=getattr(view, "a_seguir", False))
+        tk.Checkbutton(
+            view.botao_frame, text="Seguir ficheiro (atualização automática)", variable=view.seguir_var,
+            command=lambda: on_seguir_click(view.seguir_var.get()), bg="white"
+        ).pack(pady=5)
 
     view.mostra_mensagem_info("Gráfico gerado.")
-    # Mostra o gráfico
-    plt.show(block=False)
+
+def mostrar_figura_embutida(view, figura):
+    """
+    Mostra a Figure num canvas Tk dentro da janela principal, com a barra de ferramentas
+    do matplotlib. Se a figura já é a que está no canvas, apenas pede um redesenho; caso
+    contrário o canvas anterior é substituído (uma Figure só pode estar num canvas).
+    """
+    # Importado aqui para não atrasar o arranque (normalmente já foi aquecido, ver aquecimento.py)
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+    canvas = getattr(view, "canvas_grafico", None)
+    if canvas is not None and canvas.figure is figura and view.grafico_frame.winfo_exists():
+        canvas.draw_idle()
+        return
+
+    remover_grafico_embutido(view)
+    view.grafico_frame = tk.Frame(getattr(view, "container", view), bg="white")
+    view.grafico_frame.place(relx=0.5, rely=0.07, anchor="n", relwidth=0.96, relheight=0.62)
+
+    # A figura passa a seguir o tamanho do frame (e a resolução do ecrã)
+    view.canvas_grafico = FigureCanvasTkAgg(figura, master=view.grafico_frame)
+    toolbar = NavigationToolbar2Tk(view.canvas_grafico, view.grafico_frame, pack_toolbar=False)
+    toolbar.update()
+    toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+    view.canvas_grafico.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+    view.canvas_grafico.draw_idle()
+
+# Método que mostra a galeria de miniaturas (tkinter). Funciona com o método mostra_galeria no ficheiro view.py.
+def construir_janela_galeria(view, galeria, tipo, pares, on_miniatura_click):
+    """
+    Abre (ou substitui) a janela da galeria: uma grelha com scroll e um lugar por par
+    (x, y), preenchido com a miniatura quando ela chegar. Clicar numa miniatura chama
+    on_miniatura_click(x, y). `galeria` identifica a galeria mostrada: as miniaturas de
+    galerias anteriores (canceladas ou substituídas) que ainda cheguem são ignoradas.
+    """
+    fechar_janela_galeria(view)
+    janela = tk.Toplevel(view, bg="white")
+    janela.title(f"Galeria - {tipo}")
+    janela.geometry(TAMANHO_JANELA_GALERIA)
+
+    canvas = tk.Canvas(janela, bg="white", highlightthickness=0)
+    scrollbar = ttk.Scrollbar(janela, orient="vertical", command=canvas.yview)
+    canvas.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    grelha = tk.Frame(canvas, bg="white")
+    canvas.create_window((0, 0), window=grelha, anchor="nw")
+    grelha.bind("<Configure>", lambda _: canvas.configure(scrollregion=canvas.bbox("all")))
+
+    view.janela_galeria = janela
+    view.galeria_atual = galeria
+    view.miniaturas_galeria = []
+    for indice, (x, y) in enumerate(pares):
+        miniatura = tk.Label(grelha, text=f"{y} por {x}\n(a desenhar...)", bg="#F0F0F0", font=("Helvetica", 9),
+                             width=26, height=8, wraplength=180, relief="groove", cursor="hand2")
+        miniatura.grid(row=indice // COLUNAS_GALERIA, column=indice % COLUNAS_GALERIA, padx=4, pady=4)
+        miniatura.bind("<Button-1>", lambda _, x=x, y=y: on_miniatura_click(x, y))
+        view.miniaturas_galeria.append(miniatura)
+
+# Método que mostra uma miniatura da galeria (tkinter). Funciona com o método mostra_miniatura no ficheiro view.py.
+def mostrar_miniatura_galeria(view, galeria, indice, imagem, erro):
+    if not hasattr(view, "janela_galeria") or not view.janela_galeria.winfo_exists():
+        return  # A janela foi fechada entretanto
+    if galeria != getattr(view, "galeria_atual", None) or not 0 <= indice < len(view.miniaturas_galeria):
+        return  # Miniatura de uma galeria cancelada ou já substituída
+    miniatura = view.miniaturas_galeria[indice]
+    if erro is not None:
+        titulo = miniatura.cget("text").splitlines()[0]
+        miniatura.config(text=f"{titulo}\n{erro}", fg="#A00000", cursor="")
+        miniatura.unbind("<Button-1>")
+        return
+    foto = tk.PhotoImage(master=miniatura, data=base64.b64encode(imagem))
+    # O tkinter não guarda a imagem: sem esta referência seria apagada pelo garbage collector
+    miniatura.image = foto
+    # Com uma imagem, largura e altura passam a ser em píxeis (0: o tamanho da imagem)
+    miniatura.config(image=foto, text="", width=0, height=0)
+
+def fechar_janela_galeria(view):
+    if hasattr(view, "janela_galeria") and view.janela_galeria.winfo_exists():
+        view.janela_galeria.destroy()
+    view.galeria_atual = None
+    view.miniaturas_galeria = []
+
+def remover_grafico_embutido(view):
+    if hasattr(view, "grafico_frame") and view.grafico_frame.winfo_exists():
+        view.grafico_frame.destroy()
+    view.canvas_grafico = None
+
+def redimensionar_janela(view, tamanho):
+    geometria, largura, altura, posicao_cancelar = tamanho
+    view.geometry(geometria)
+    if hasattr(view, "container") and view.container.winfo_exists():
+        view.container.place_configure(width=largura, height=altura)
+    # O botão Cancelar fica entre os controlos e a mensagem de estado
+    view.posicao_cancelar = posicao_cancelar
+    if hasattr(view, "btn_cancelar") and view.btn_cancelar.winfo_ismapped():
+        view.btn_cancelar.place_configure(rely=posicao_cancelar)
+        view.btn_cancelar.lift()
 
 # Método que permite voltar ao menu inicial (tkinter). Funciona com o método voltar_menu_inicial(self).
 def voltar_menu_inicial_interface(view):
@@ -302,7 +486,9 @@ def voltar_menu_inicial_interface(view):
     if hasattr(view, "botao_frame") and view.botao_frame.winfo_exists():
         view.botao_frame.destroy()
 
+    fechar_janela_galeria(view)
+    remover_grafico_embutido(view)
+    redimensionar_janela(view, TAMANHO_JANELA_MENU)
+
     if hasattr(view, "btn_importar"):
         view.btn_importar.place(relx=0.5, rely=0.4, anchor="center")
-
-    plt.close("all")
@@ -0,0 +1,160 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .IUserView import IUserView
+from graficos.controller.controllerEvent import ControllerEvent
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from matplotlib.figure import Figure
+    from graficos.renderizacao import GraficoRenderizado
+    from graficos.seguimento import GraficoAoVivo
+
+
+class HeadlessView(IUserView):
+    """View sem interface gráfica, usada no modo batch (linha de comandos).
+
+    Não mostra nada: regista as mensagens e os erros recebidos do Model, para que quem
+    conduz o pipeline possa saber se cada passo correu bem.
+    """
+    def __init__(self) -> None:
+        # Eventos exigidos pela IUserView (nunca são emitidos sem interface)
+        self.__importar_ficheiro_click_evt = ControllerEvent()
+        self.__ficheiro_selecionado_evt = ControllerEvent()
+        self.__grafico_selecionado_click_evt = ControllerEvent()
+        self.__submissao_parametros_evt = ControllerEvent()
+        self.__solicita_guardar_grafico_click_evt = ControllerEvent()
+        self.__grava_grafico_click_evt = ControllerEvent()
+        self.__cancelar_tarefa_click_evt = ControllerEvent()
+        self.__seguir_ficheiro_click_evt = ControllerEvent()
+        self.__alterar_aparencia_click_evt = ControllerEvent()
+        self.__voltar_menu_click_evt = ControllerEvent()
+        self.__galeria_click_evt = ControllerEvent()
+        self.__miniatura_selecionada_click_evt = ControllerEvent()
+
+        # Estado registado
+        self.mensagens: List[str] = []
+        self.erros: List[str] = []
+        self.graficos_disponiveis: List[str] = []
+        self.grafico_gerado: bool = False
+        self.figura: Optional["Figure"] = None
+        self.grafico_gravado: bool = False
+        self.caminhos_gravados: List[str] = []
+        self.atualizacoes: int = 0
+        self.galeria: Optional[int] = None        # Número da galeria atual (ver Model.gerar_galeria)
+        self.pares_galeria: List[Tuple[str, str]] = []
+        self.miniaturas: Dict[int, bytes] = {}   # PNG de cada miniatura gerada, pelo índice do par
+
+    # Propriedades para acesso a eventos
+    @property
+    def importar_ficheiro_click_evt(self) -> ControllerEvent:
+        return self.__importar_ficheiro_click_evt
+
+    @property
+    def ficheiro_selecionado_evt(self) -> ControllerEvent:
+        return self.__ficheiro_selecionado_evt
+
+    @property
+    def grafico_selecionado_click_evt(self) -> ControllerEvent:
+        return self.__grafico_selecionado_click_evt
+
+    @property
+    def submissao_parametros_evt(self) -> ControllerEvent:
+        return self.__submissao_parametros_evt
+
+    @property
+    def solicita_guardar_grafico_click_evt(self) -> ControllerEvent:
+        return self.__solicita_guardar_grafico_click_evt
+
+    @property
+    def grava_grafico_click_evt(self) -> ControllerEvent:
+        return self.__grava_grafico_click_evt
+
+    @property
+    def cancelar_tarefa_click_evt(self) -> ControllerEvent:
+        return self.__cancelar_tarefa_click_evt
+
+    @property
+    def seguir_ficheiro_click_evt(self) -> ControllerEvent:
+        return self.__seguir_ficheiro_click_evt
+
+    @property
+    def alterar_aparencia_click_evt(self) -> ControllerEvent:
+        return self.__alterar_aparencia_click_evt
+
+    @property
+    def voltar_menu_click_evt(self) -> ControllerEvent:
+        return self.__voltar_menu_click_evt
+
+    @property
+    def galeria_click_evt(self) -> ControllerEvent:
+        return self.__galeria_click_evt
+
+    @property
+    def miniatura_selecionada_click_evt(self) -> ControllerEvent:
+        return self.__miniatura_selecionada_click_evt
+
+    # Métodos da IUserView
+    def ativar_interface(self) -> None:
+        pass
+
+    def mostra_dlg_carregar_ficheiro(self) -> None:
+        pass
+
+    def mostra_dlg_grava_grafico(self) -> None:
+        pass
+
+    def mostra_formulario_parametros(self, colunas: List[str], colunas_y: Optional[List[str]] = None) -> None:
+        pass
+
+    def mostra_mensagem_info(self, mensagem: str) -> None:
+        self.mensagens.append(mensagem)
+
+    def atualiza_lista_graficos(self, graficos: List[str]) -> None:
+        self.graficos_disponiveis = list(graficos)
+
+    def mostrar_grafico(self, figura: "Figure") -> None:
+        self.figura = figura
+        self.grafico_gerado = True
+
+    def atualizar_grafico(self, grafico: "GraficoAoVivo", tabela: "pd.DataFrame") -> None:
+        grafico.atualizar(tabela)
+        self.atualizacoes += 1
+
+    def alterar_aparencia_grafico(self, grafico: "GraficoRenderizado", x_label: str, y_label: str, titulo: str,
+                                  barras_erro: str) -> None:
+        grafico.alterar_aparencia(x_label, y_label, titulo, barras_erro)
+
+    def mostra_galeria(self, galeria: int, tipo: str, pares: List[Tuple[str, str]]) -> None:
+        self.galeria = galeria
+        self.pares_galeria = list(pares)
+        self.miniaturas = {}
+
+    def mostra_miniatura(self, galeria: int, indice: int, imagem: Optional[bytes], erro: Optional[str]) -> None:
+        if galeria != self.galeria:
+            return
+        if erro is not None:
+            self.erros.append(erro)
+        else:
+            self.miniaturas[indice] = imagem
+
+    def mostra_erro_importacao(self, mensagem: str) -> None:
+        self.erros.append(mensagem)
+
+    def mostra_erro_ficheiro(self, mensagem: str) -> None:
+        self.erros.append(mensagem)
+
+    def mostra_erro_geracao(self, mensagem: str) -> None:
+        self.erros.append(mensagem)
+
+    def mostra_grafico_gravado(self, caminhos: List[str]) -> None:
+        self.grafico_gravado = True
+        self.caminhos_gravados = list(caminhos)
+
+    def mostra_erro_gravacao(self, mensagem: str) -> None:
+        self.erros.append(mensagem)
+
+    def mostra_tarefa_em_curso(self, em_curso: bool) -> None:
+        pass
+
+    def voltar_menu_inicial(self) -> None:
+        pass
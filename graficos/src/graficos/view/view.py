@@ -1,17 +1,31 @@
-from typing import Callable, List
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
 
 from .IUserView import IUserView
 from graficos.controller.controllerEvent import ControllerEvent
 from graficos.controller.ILogger import ILogger
+from graficos.opcoes import BARRAS_ERRO_OMISSAO, MODOS_BARRAS_ERRO
 from .guiview import (
     construir_interface_principal, construir_formulario_parametros,
     obter_parametros_formulario, carregar_ficheiro_csv_com_dialogo,
     guardar_grafico_com_dialogo, preparar_interface_grafico,
-    voltar_menu_inicial_interface
+    voltar_menu_inicial_interface, construir_janela_galeria,
+    mostrar_miniatura_galeria
 )
 
+if TYPE_CHECKING:
+    # O matplotlib só é carregado quando o primeiro gráfico é mostrado
+    import pandas as pd
+    from matplotlib.figure import Figure
+    from graficos.renderizacao import GraficoRenderizado
+    from graficos.seguimento import GraficoAoVivo
+
+# Intervalo (ms) com que a fila de chamadas vindas das tarefas em segundo plano é processada
+INTERVALO_FILA_MS = 50
+
 
 # Eventos da View
 class ImportarFicheiroClickEvt(ControllerEvent):
@@ -42,11 +56,11 @@ class GraficoSelecionadoClickEvt(ControllerEvent):
 
 class SubmissaoParametrosEvt(ControllerEvent):
     """Emitido quando o utilizador submete os parâmetros para construir o gráfico."""
-    def add_handler(self, handler: Callable[[str, str, str, str], None]):
+    def add_handler(self, handler: Callable[[str, str, str, str, str], None]):
         super().add_handler(handler)
 
-    def invoke(self, x_col: str, y_col: str, x_label: str, y_label: str):
-        super().invoke(x_col, y_col, x_label, y_label)
+    def invoke(self, x_col: str, y_col: str, x_label: str, y_label: str, barras_erro: str):
+        super().invoke(x_col, y_col, x_label, y_label, barras_erro)
 
 
 class SolicitaGuardarGraficoClickEvt(ControllerEvent):
@@ -59,13 +73,67 @@ class SolicitaGuardarGraficoClickEvt(ControllerEvent):
 
 class GravaGraficoClickEvt(ControllerEvent):
     """Evento emitido pela View quando o User gravar o gráfico num diálogo de 
-    gravação de ficheiros.
+    gravação de ficheiros. Recebe a lista de ficheiros a gravar (um por formato).
+    """
+    def add_handler(self, handler: Callable[[List[str]], None]):
+        super().add_handler(handler)
+
+    def invoke(self, caminhos: List[str]) -> None:
+        super().invoke(caminhos)
+
+class AlterarAparenciaClickEvt(ControllerEvent):
+    """Evento emitido pela View quando o User altera os rótulos, o título ou as barras de
+    erro do gráfico mostrado (sem mudar os dados desenhados).
+    """
+    def add_handler(self, handler: Callable[[str, str, str, str], None]):
+        super().add_handler(handler)
+
+    def invoke(self, x_label: str, y_label: str, titulo: str, barras_erro: str) -> None:
+        super().invoke(x_label, y_label, titulo, barras_erro)
+
+class SeguirFicheiroClickEvt(ControllerEvent):
+    """Evento emitido pela View quando o User liga (True) ou desliga (False) o seguimento
+    do ficheiro: o gráfico é atualizado à medida que são acrescentadas linhas.
+    """
+    def add_handler(self, handler: Callable[[bool], None]):
+        super().add_handler(handler)
+
+    def invoke(self, ativo: bool) -> None:
+        super().invoke(ativo)
+
+class VoltarMenuClickEvt(ControllerEvent):
+    """Evento emitido pela View quando volta ao menu inicial (botão Home ou fim da
+    gravação): o gráfico mostrado deixa de ser necessário.
+    """
+    def invoke(self) -> None:
+        super().invoke()
+
+class GaleriaClickEvt(ControllerEvent):
+    """Evento emitido pela View quando o User pede a galeria de miniaturas (um gráfico
+    por par de colunas), com o modo das barras de erro escolhido no formulário.
     """
     def add_handler(self, handler: Callable[[str], None]):
         super().add_handler(handler)
 
-    def invoke(self, caminho: str) -> None:
-        super().invoke(caminho)
+    def invoke(self, barras_erro: str) -> None:
+        super().invoke(barras_erro)
+
+class MiniaturaSelecionadaClickEvt(ControllerEvent):
+    """Evento emitido pela View quando o User escolhe uma miniatura da galeria: o gráfico
+    desse par de colunas deve ser gerado em tamanho normal.
+    """
+    def add_handler(self, handler: Callable[[str, str, str], None]):
+        super().add_handler(handler)
+
+    def invoke(self, x_col: str, y_col: str, barras_erro: str) -> None:
+        super().invoke(x_col, y_col, barras_erro)
+
+class CancelarTarefaClickEvt(ControllerEvent):
+    """Evento emitido pela View quando o User cancela a tarefa em curso 
+    (importação, geração ou gravação).
+    """
+    def invoke(self) -> None:
+        super().invoke()
 
 # Simula o Throw do C#
 class ErroInternoEvt(ControllerEvent):
@@ -87,10 +155,20 @@ class View(tk.Tk, IUserView):
         self.__submissao_parametros_evt = SubmissaoParametrosEvt()
         self.__solicita_guardar_grafico_click_evt: SolicitaGuardarGraficoClickEvt = SolicitaGuardarGraficoClickEvt()
         self.__grava_grafico_click_evt: GravaGraficoClickEvt = GravaGraficoClickEvt()
+        self.__cancelar_tarefa_click_evt: CancelarTarefaClickEvt = CancelarTarefaClickEvt()
+        self.__seguir_ficheiro_click_evt: SeguirFicheiroClickEvt = SeguirFicheiroClickEvt()
+        self.__alterar_aparencia_click_evt: AlterarAparenciaClickEvt = AlterarAparenciaClickEvt()
+        self.__voltar_menu_click_evt: VoltarMenuClickEvt = VoltarMenuClickEvt()
+        self.__galeria_click_evt: GaleriaClickEvt = GaleriaClickEvt()
+        self.__miniatura_selecionada_click_evt: MiniaturaSelecionadaClickEvt = MiniaturaSelecionadaClickEvt()
+
+        # Chamadas feitas por outras threads, executadas no ciclo de eventos do Tk
+        self.__fila_interface: queue.SimpleQueue = queue.SimpleQueue()
 
         # Variáveis de Estado
         self.estado_var = tk.StringVar()
         self.grafico_var = tk.StringVar(value="Escolha um gráfico")
+        self.a_seguir = False
 
     # Propriedades para acesso a eventos
     @property
@@ -117,6 +195,30 @@ class View(tk.Tk, IUserView):
     def grava_grafico_click_evt(self):
         return self.__grava_grafico_click_evt
 
+    @property
+    def cancelar_tarefa_click_evt(self) -> CancelarTarefaClickEvt:
+        return self.__cancelar_tarefa_click_evt
+
+    @property
+    def seguir_ficheiro_click_evt(self) -> SeguirFicheiroClickEvt:
+        return self.__seguir_ficheiro_click_evt
+
+    @property
+    def alterar_aparencia_click_evt(self) -> AlterarAparenciaClickEvt:
+        return self.__alterar_aparencia_click_evt
+
+    @property
+    def voltar_menu_click_evt(self) -> VoltarMenuClickEvt:
+        return self.__voltar_menu_click_evt
+
+    @property
+    def galeria_click_evt(self) -> GaleriaClickEvt:
+        return self.__galeria_click_evt
+
+    @property
+    def miniatura_selecionada_click_evt(self) -> MiniaturaSelecionadaClickEvt:
+        return self.__miniatura_selecionada_click_evt
+
     # Método que ativa a interface gráfica (tkinter)
     def ativar_interface(self) -> None:
         """Constrói a interface principal e ativa o loop principal da aplicação."""
@@ -126,23 +228,48 @@ class View(tk.Tk, IUserView):
             estado_var=self.estado_var,
             on_importar_ficheiro_click=self.__on_importar_ficheiro_click,
             on_grafico_selecionado=self.__on_grafico_selecionado,
-            on_home_click=self.__on_home_click
+            on_home_click=self.__on_home_click,
+            on_cancelar_click=self.__on_cancelar_click
         )
 
         if elementos is None:
             return
         
         # Elementos principais da interface
+        self.container = elementos["container"]
         self.btn_importar = elementos["btn_importar"]
         self.dropdown_menu = elementos["dropdown_menu"]
         self.label_estado = elementos["label_estado"]
         self.btn_home = elementos["btn_home_frame"]
+        self.btn_cancelar = elementos["btn_cancelar"]
 
         # Mensagem inicial
         self.mostra_mensagem_info("Pronto para iniciar.")
         self.logger.log_info("ativar_interface() - Interface gráfica iniciada.")
+        self.after(INTERVALO_FILA_MS, self.__processar_fila_interface)
         self.mainloop()
 
+    # Execução na thread da interface
+    def executar_na_interface(self, funcao: Callable[..., Any], *args: Any) -> None:
+        """Agenda a função para o ciclo de eventos do Tk (o tkinter não é thread-safe)."""
+        if threading.current_thread() is threading.main_thread() and self.__fila_interface.empty():
+            funcao(*args)
+        else:
+            self.__fila_interface.put((funcao, args))
+
+    def __processar_fila_interface(self) -> None:
+        # Executa as chamadas pendentes e volta a agendar-se com after()
+        while True:
+            try:
+                funcao, args = self.__fila_interface.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                funcao(*args)
+            except Exception as e:
+                self.logger.log_erro(f"processar_fila_interface() - Erro ao atualizar a interface: {e}")
+        self.after(INTERVALO_FILA_MS, self.__processar_fila_interface)
+
     # Métodos auxiliares da interface
     def mostra_erro_importacao(self, mensagem: str):
         messagebox.showerror("Erro de Importação", mensagem)
@@ -152,9 +279,27 @@ class View(tk.Tk, IUserView):
         messagebox.showwarning("Ficheiro Inválido", mensagem)
         self.logger.log_erro(f"mostra_erro_ficheiro() - {mensagem}")
 
+    def mostra_erro_geracao(self, mensagem: str):
+        messagebox.showerror("Erro na Geração do Gráfico", mensagem)
+        self.logger.log_erro(f"mostra_erro_geracao() - {mensagem}")
+
+    def mostra_erro_gravacao(self, mensagem: str):
+        messagebox.showerror("Erro de Gravação", mensagem)
+        self.logger.log_erro(f"mostra_erro_gravacao() - {mensagem}")
+
     def mostra_mensagem_info(self, mensagem: str):
         self.estado_var.set(mensagem)
 
+    def mostra_tarefa_em_curso(self, em_curso: bool):
+        # O botão Cancelar só aparece enquanto há trabalho em segundo plano
+        if not hasattr(self, "btn_cancelar"):
+            return
+        if em_curso:
+            self.btn_cancelar.place(relx=0.5, rely=getattr(self, "posicao_cancelar", 0.77), anchor="center")
+            self.btn_cancelar.lift()
+        else:
+            self.btn_cancelar.place_forget()
+
     def atualiza_lista_graficos(self, graficos: list[str]):
         self.graficos_disponiveis = graficos
         self.btn_importar.place_forget()
@@ -201,13 +346,55 @@ class View(tk.Tk, IUserView):
             return
                 
         self.mostra_mensagem_info("Parâmetros corretos. A gerar gráfico...")
-        self.logger.log_info(f"on_submeter_parametros() - Parâmetros validados: x={x_col}, y={y_col}, x_label={x_label}, y_label={y_label}")
-        self.__submissao_parametros_evt.invoke(x_col, y_col, x_label, y_label)
+        barras_erro = self.__barras_erro_escolhidas()
+        self.logger.log_info(f"on_submeter_parametros() - Parâmetros validados: x={x_col}, y={y_col}, x_label={x_label}, y_label={y_label}, barras_erro={barras_erro}")
+        self.__submissao_parametros_evt.invoke(x_col, y_col, x_label, y_label, barras_erro)
+
+    def __barras_erro_escolhidas(self) -> str:
+        # Converte a descrição escolhida no código do modo das barras de erro
+        return next((modo for modo, descricao in MODOS_BARRAS_ERRO.items()
+                     if descricao == self.barras_erro_var.get()), BARRAS_ERRO_OMISSAO)
+
+    def __on_galeria_click(self):
+        # Método que informa o Controller que o utilizador pediu a galeria de miniaturas
+        self.mostra_mensagem_info("A gerar a galeria...")
+        self.logger.log_info("on_galeria_click() - Botão 'Galeria' clicado.")
+        self.__galeria_click_evt.invoke(self.__barras_erro_escolhidas())
+
+    def __on_miniatura_click(self, x_col: str, y_col: str):
+        # Método que informa o Controller que o utilizador escolheu uma miniatura da galeria
+        self.mostra_mensagem_info(f"A gerar gráfico: {y_col} por {x_col}")
+        self.logger.log_info(f"on_miniatura_click() - Miniatura escolhida: x={x_col}, y={y_col}")
+        self.__miniatura_selecionada_click_evt.invoke(x_col, y_col, self.__barras_erro_escolhidas())
+
+    def __on_cancelar_click(self):
+        # Método que informa o Controller que o utilizador quer cancelar a tarefa em curso
+        self.mostra_mensagem_info("A cancelar...")
+        self.logger.log_info("on_cancelar_click() - Botão 'Cancelar' clicado.")
+        self.__cancelar_tarefa_click_evt.invoke()
+
+    def __on_grava_grafico(self, caminhos: List[str]):
+        # O sucesso (com os ficheiros gravados) é mostrado quando a gravação terminar
+        self.__grava_grafico_click_evt.invoke(caminhos)
+
+    def __on_aplicar_aparencia(self):
+        # Método que informa o Controller que o utilizador mudou a aparência do gráfico mostrado
+        barras_erro = self.__barras_erro_escolhidas()
+        x_label, y_label = self.x_label_grafico_var.get().strip(), self.y_label_grafico_var.get().strip()
+        titulo = self.titulo_grafico_var.get().strip()
+        self.logger.log_info(f"on_aplicar_aparencia() - x_label={x_label}, y_label={y_label}, titulo={titulo}, barras_erro={barras_erro}")
+        self.__alterar_aparencia_click_evt.invoke(x_label, y_label, titulo, barras_erro)
+
+    def __on_seguir_click(self, ativo: bool):
+        # Método que informa o Controller que o utilizador ligou/desligou o seguimento do ficheiro
+        self.a_seguir = ativo
+        self.logger.log_info(f"on_seguir_click() - Seguimento do ficheiro {'ligado' if ativo else 'desligado'}.")
+        self.__seguir_ficheiro_click_evt.invoke(ativo)
 
     def __on_home_click(self):
         """Callback para voltar ao menu inicial quando o botão Home é clicado."""
         self.mostra_mensagem_info("A voltar ao menu principal...")
-        voltar_menu_inicial_interface(self)
+        self.voltar_menu_inicial()
 
     # Dialogs
     def mostra_dlg_carregar_ficheiro(self) -> None:
@@ -226,10 +413,14 @@ class View(tk.Tk, IUserView):
     # Método que mostra ao utilizador as opções de gravação do ficheiro
     def mostra_dlg_grava_grafico(self) -> None:
         guardar_grafico_com_dialogo(
-            callback_gravar=self.__grava_grafico_click_evt.invoke,
+            callback_gravar=self.__on_grava_grafico,
             mostrar_info=self.mostra_mensagem_info,
-            voltar_menu=self.voltar_menu_inicial
+            formatos_extra=[formato for formato, var in getattr(self, "formatos_extra_vars", {}).items() if var.get()]
         )
+
+    def mostra_grafico_gravado(self, caminhos: List[str]) -> None:
+        messagebox.showinfo("Sucesso", "Gráfico guardado em:\n" + "\n".join(caminhos))
+        self.voltar_menu_inicial()
         
     # Outros
     def notifica_ficheiro_selecionado(self, fullpath: str):
@@ -237,34 +428,68 @@ class View(tk.Tk, IUserView):
         self.__ficheiro_selecionado_evt.invoke(fullpath)
 
     # Método que mostra o formulário com os vários parâmetros
-    def mostra_formulario_parametros(self, colunas: list[str]) -> None:
+    def mostra_formulario_parametros(self, colunas: list[str], colunas_y: Optional[list[str]] = None) -> None:
         # Inicializar variáveis e opções
         self.x_var = tk.StringVar(value="Escolher coluna X")
         self.y_var = tk.StringVar(value="Escolher coluna Y")
         self.x_label_var = tk.StringVar(value="")
         self.y_label_var = tk.StringVar(value="")
         self.opcao_labels = tk.StringVar(value="usar_colunas")
+        self.barras_erro_var = tk.StringVar(value=MODOS_BARRAS_ERRO[BARRAS_ERRO_OMISSAO])
 
         # Constrói o formulário
         self.form_frame = construir_formulario_parametros(
             parent=self,
             colunas=colunas,
+            colunas_y=colunas_y,
             x_var=self.x_var,
             y_var=self.y_var,
             x_label_var=self.x_label_var,
             y_label_var=self.y_label_var,
             opcao_labels=self.opcao_labels,
-            on_submeter_parametros=self.__on_submeter_parametros
+            on_submeter_parametros=self.__on_submeter_parametros,
+            on_galeria=self.__on_galeria_click,
+            barras_erro_var=self.barras_erro_var,
+            opcoes_barras_erro=list(MODOS_BARRAS_ERRO.values())
         ) 
 
     # Método para mostrar o gráfico
-    def mostrar_grafico(self, __: List[str] = []) -> None:
-        preparar_interface_grafico(self, self.__on_guardar_grafico_click)
+    def mostrar_grafico(self, figura: "Figure") -> None:
+        if not hasattr(self, "barras_erro_var"):
+            self.barras_erro_var = tk.StringVar(value=MODOS_BARRAS_ERRO[BARRAS_ERRO_OMISSAO])
+        preparar_interface_grafico(
+            self, figura, self.__on_guardar_grafico_click, self.__on_seguir_click,
+            on_aplicar_aparencia=self.__on_aplicar_aparencia,
+            barras_erro_var=self.barras_erro_var,
+            opcoes_barras_erro=list(MODOS_BARRAS_ERRO.values())
+        )
         self.logger.log_info("mostrar_grafico() - Interface de gráfico exibida.")
 
+    # Galeria de miniaturas, numa janela própria; as miniaturas chegam à medida que ficam prontas
+    def mostra_galeria(self, galeria: int, tipo: str, pares: List[Tuple[str, str]]) -> None:
+        construir_janela_galeria(self, galeria, tipo, pares, self.__on_miniatura_click)
+        self.logger.log_info(f"mostra_galeria() - Galeria com {len(pares)} gráficos.")
+
+    def mostra_miniatura(self, galeria: int, indice: int, imagem: Optional[bytes], erro: Optional[str]) -> None:
+        mostrar_miniatura_galeria(self, galeria, indice, imagem, erro)
+
+    def alterar_aparencia_grafico(self, grafico: "GraficoRenderizado", x_label: str, y_label: str, titulo: str,
+                                  barras_erro: str) -> None:
+        # Só os textos e as barras de erro mudam; o canvas embutido redesenha quando puder
+        grafico.alterar_aparencia(x_label, y_label, titulo, barras_erro)
+
+    def atualizar_grafico(self, grafico: "GraficoAoVivo", tabela: "pd.DataFrame") -> None:
+        # Modo de seguimento: só os dados dos artistas mudam; o canvas redesenha quando puder
+        grafico.atualizar(tabela)
+
     # Método que permite voltar ao menu inicial
     def voltar_menu_inicial(self) -> None:
+        # O gráfico deixa de ser mostrado: o seguimento do ficheiro termina em qualquer caminho
+        # de volta ao menu (botão Home, fim da gravação)
+        if self.a_seguir:
+            self.__on_seguir_click(False)
         voltar_menu_inicial_interface(self)
+        self.__voltar_menu_click_evt.invoke()
 
         self.mostra_mensagem_info("Pronto para importar um novo ficheiro.")
         self.logger.log_info("voltar_menu_inicial() - Retornado ao menu principal.")
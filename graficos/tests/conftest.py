@@ -0,0 +1,22 @@
+from typing import List
+
+import pytest
+
+from graficos.controller.ILogger import ILogger
+
+
+class LoggerMemoria(ILogger):
+    """Logger dos testes: guarda as mensagens de erro."""
+    def __init__(self) -> None:
+        self.erros: List[str] = []
+
+    def log_info(self, mensagem: str) -> None:
+        pass
+
+    def log_erro(self, mensagem: str) -> None:
+        self.erros.append(mensagem)
+
+
+@pytest.fixture
+def logger() -> LoggerMemoria:
+    return LoggerMemoria()
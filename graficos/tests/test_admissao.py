@@ -0,0 +1,51 @@
+import pytest
+
+from graficos.admissao import (MEMORIA, REJEITAR, STREAMING, EstimativaMemoria, decidir_admissao,
+                               orcamento_memoria_mb)
+from graficos.esquema import sondar_esquema
+
+
+@pytest.fixture
+def esquema(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    caminho.write_text("Categoria,Valor,Nota\n" + "".join(f"C{i % 7},{i},texto {i}\n" for i in range(500)),
+                       encoding="utf-8")
+    return sondar_esquema(str(caminho))
+
+
+# Tamanho do CSV "descomprimido": 10 milhões de linhas como as da amostra
+def _tamanho(esquema) -> int:
+    return esquema.bytes_cabecalho + int(esquema.bytes_por_linha * 10_000_000)
+
+
+def test_estimativa_pelo_tamanho_do_ficheiro(esquema):
+    estimativa = EstimativaMemoria.da_amostra(esquema, _tamanho(esquema))
+    assert estimativa.linhas == pytest.approx(10_000_000, rel=1e-3)
+    # O bloco lê todas as colunas, mas só LINHAS_POR_BLOCO linhas
+    assert estimativa.memoria_bloco() < estimativa.memoria_grafico()
+
+
+def test_limiares_de_admissao(esquema):
+    tamanho = _tamanho(esquema)
+    estimativa = EstimativaMemoria.da_amostra(esquema, tamanho)
+    grafico_mb = estimativa.memoria_grafico() / 2**20
+    bloco_mb = estimativa.memoria_bloco() / 2**20
+
+    assert decidir_admissao(esquema, tamanho, grafico_mb * 1.01).modo == MEMORIA
+    decisao = decidir_admissao(esquema, tamanho, grafico_mb * 0.99)
+    assert decisao.modo == STREAMING and decisao.streaming
+    assert decidir_admissao(esquema, tamanho, bloco_mb * 1.01).modo == STREAMING
+    decisao = decidir_admissao(esquema, tamanho, bloco_mb * 0.99)
+    assert decisao.modo == REJEITAR and not decisao.streaming
+    assert "acima do orçamento" in str(decisao)
+
+
+def test_ficheiro_pequeno_cabe_em_memoria(esquema):
+    assert decidir_admissao(esquema, esquema.bytes_cabecalho + 1000, orcamento_mb=1).modo == MEMORIA
+
+
+def test_orcamento_configurado(monkeypatch):
+    monkeypatch.setenv("GRAFICOS_MEMORIA_MB", "256")
+    assert orcamento_memoria_mb() == 256
+    monkeypatch.delenv("GRAFICOS_MEMORIA_MB")
+    assert orcamento_memoria_mb() > 0
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from graficos.agregacao import calcular_barras_erro, combinar, estatisticas, quantil_t, resumir
+
+# Valores críticos bilaterais da t de Student a 95% (tabelas)
+T_95 = {1: 12.7062047, 2: 4.3026527, 3: 3.1824463, 30: 2.0422725}
+
+
+@pytest.mark.parametrize("graus, tolerancia", [(1, 1e-6), (2, 1e-6), (3, 1e-2), (30, 1e-4)])
+def test_quantil_t(graus, tolerancia):
+    assert quantil_t(np.array([graus]))[0] == pytest.approx(T_95[graus], abs=tolerancia)
+
+
+def test_quantil_t_sem_graus_de_liberdade():
+    assert np.isnan(quantil_t(np.array([0.0, -1.0]))).all()
+
+
+def test_combinar_resumos_igual_a_var_amostral():
+    gerador = np.random.default_rng(11)
+    valores = pd.Series(gerador.normal(1e6, 5.0, 3_000))
+    categorias = pd.Series(gerador.choice(list("XYZ"), 3_000))
+    # Partes de tamanhos desiguais, algumas sem todas as categorias
+    cortes = [0, 7, 500, 501, 2_200, 3_000]
+    resumos = [resumir(valores[a:b], categorias[a:b]) for a, b in zip(cortes, cortes[1:])]
+    tabela = estatisticas(combinar(resumos), "Categoria").set_index("Categoria")
+
+    for categoria in "XYZ":
+        grupo = valores[categorias == categoria].to_numpy()
+        linha = tabela.loc[categoria]
+        assert linha["contagem"] == len(grupo)
+        assert linha["media"] == pytest.approx(grupo.mean(), rel=1e-12)
+        assert linha["desvio_padrao"] ** 2 == pytest.approx(np.var(grupo, ddof=1), rel=1e-9)
+        assert linha["erro_padrao"] == pytest.approx(np.std(grupo, ddof=1) / np.sqrt(len(grupo)), rel=1e-9)
+
+
+def test_barras_erro_por_modo():
+    tabela = estatisticas(resumir(pd.Series([1.0, 3.0, 5.0, 10.0]), pd.Series(["A", "A", "A", "B"])), "Categoria")
+    np.testing.assert_allclose(calcular_barras_erro(tabela, "dp"), [2.0, np.nan])
+    np.testing.assert_allclose(calcular_barras_erro(tabela, "ep"), [2.0 / np.sqrt(3), np.nan])
+    np.testing.assert_allclose(calcular_barras_erro(tabela, "ic"), [2.0 / np.sqrt(3) * 4.3026527, np.nan], rtol=1e-6)
+    assert calcular_barras_erro(tabela, "nenhum") is None
+    with pytest.raises(ValueError):
+        calcular_barras_erro(tabela, "quartis")
@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+import pytest
+
+from graficos import cache as modulo_cache
+from graficos.cache import CacheImportacao
+
+
+@pytest.fixture
+def ficheiro(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    caminho.write_text("Categoria,Valor\nA,1\nB,2\nA,3\n", encoding="utf-8")
+    return str(caminho)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheImportacao(str(tmp_path / "cache"))
+
+
+def test_guardar_e_obter(cache, ficheiro):
+    frame = pd.read_csv(ficheiro)
+    assert cache.obter(ficheiro) is None
+    assert cache.guardar(ficheiro, frame)
+    obtido = cache.obter(ficheiro)
+    assert list(obtido["Categoria"]) == ["A", "B", "A"]
+    assert list(obtido["Valor"]) == [1, 2, 3]
+    # Colunas pedidas que não estão em cache são omitidas
+    assert list(cache.obter(ficheiro, colunas=["Valor", "Outra"]).columns) == ["Valor"]
+
+
+def test_entrada_invalidada_quando_o_ficheiro_muda(cache, ficheiro):
+    cache.guardar(ficheiro, pd.read_csv(ficheiro))
+    with open(ficheiro, "a", encoding="utf-8") as f:
+        f.write("C,4\n")
+    assert cache.obter(ficheiro) is None
+
+
+def test_entrada_invalidada_pelo_hash(tmp_path, ficheiro):
+    diretorio = str(tmp_path / "cache")
+    CacheImportacao(diretorio).guardar(ficheiro, pd.read_csv(ficheiro))
+    # Mesmo tamanho e mtime, conteúdo diferente: só o hash do conteúdo o deteta
+    estado = os.stat(ficheiro)
+    with open(ficheiro, "w", encoding="utf-8") as f:
+        f.write("Categoria,Valor\nA,9\nB,9\nA,9\n")
+    os.utime(ficheiro, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+    assert CacheImportacao(diretorio).obter(ficheiro) is None
+
+
+def test_hash_calculado_uma_vez_por_versao_do_ficheiro(cache, ficheiro, monkeypatch):
+    chamadas = []
+    original = modulo_cache.hash_conteudo
+
+    def contar(caminho, tamanho):
+        chamadas.append(caminho)
+        return original(caminho, tamanho)
+    monkeypatch.setattr(modulo_cache, "hash_conteudo", contar)
+
+    frame = pd.read_csv(ficheiro)
+    cache.guardar(ficheiro, frame[["Categoria"]])
+    cache.guardar(ficheiro, frame[["Valor"]])
+    for _ in range(3):
+        assert cache.obter(ficheiro) is not None
+    assert len(chamadas) == 1
+
+    with open(ficheiro, "a", encoding="utf-8") as f:
+        f.write("C,4\n")
+    cache.guardar(ficheiro, pd.read_csv(ficheiro))
+    assert cache.obter(ficheiro) is not None
+    assert len(chamadas) == 2
+
+
+def test_limpar_excedente(tmp_path, ficheiro):
+    cache = CacheImportacao(str(tmp_path / "cache"), tamanho_max_bytes=1)
+    cache.guardar(ficheiro, pd.read_csv(ficheiro))
+    assert cache.obter(ficheiro) is None
@@ -0,0 +1,61 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from graficos.cache_graficos import CacheGraficos, impressao_digital, tamanho_bytes
+
+
+def _dados(valor: float) -> pd.DataFrame:
+    return pd.DataFrame({"media": np.full(100, valor)})
+
+
+def _tamanho(chave) -> int:
+    return tamanho_bytes(_dados(0)) + sys.getsizeof(chave)
+
+
+def test_remove_as_entradas_menos_usadas_ao_exceder_o_limite():
+    cache = CacheGraficos(tamanho_max_bytes=3 * _tamanho("a"))
+    for chave in "abc":
+        assert cache.guardar(chave, _dados(ord(chave)))
+    assert cache.obter("a") is not None   # "a" passa a ser a mais recente
+
+    cache.guardar("d", _dados(4))
+
+    assert len(cache) == 3 and cache.remocoes == 1
+    assert cache.obter("b") is None
+    assert [cache.obter(chave)["media"].iloc[0] for chave in "acd"] == [ord("a"), ord("c"), 4]
+    assert cache.bytes_ocupados == 3 * _tamanho("a") <= cache.tamanho_max_bytes
+
+
+def test_entrada_maior_que_o_limite_nao_e_guardada():
+    cache = CacheGraficos(tamanho_max_bytes=_tamanho("a"))
+    assert cache.guardar("a", _dados(1))
+    assert not cache.guardar("grande", pd.DataFrame({"media": np.zeros(1_000)}))
+    assert len(cache) == 1 and cache.remocoes == 0
+
+
+def test_substituir_entrada_nao_conta_os_bytes_duas_vezes():
+    cache = CacheGraficos(tamanho_max_bytes=2 * _tamanho("a"))
+    cache.guardar("a", _dados(1))
+    cache.guardar("b", _dados(2))
+    cache.guardar("a", _dados(3))
+
+    assert len(cache) == 2 and cache.remocoes == 0
+    assert cache.bytes_ocupados == 2 * _tamanho("a")
+    assert cache.obter("a")["media"].iloc[0] == 3
+    assert cache.acertos == 1 and cache.falhas == 0
+
+    cache.limpar()
+    assert len(cache) == 0 and cache.bytes_ocupados == 0
+
+
+def test_impressao_digital_muda_com_o_ficheiro_e_a_variante(tmp_path):
+    caminho = tmp_path / "dados.csv"
+    caminho.write_text("Categoria,Valor\nA,1\n", encoding="utf-8")
+    primeira = impressao_digital(str(caminho))
+
+    assert impressao_digital(str(caminho)) == primeira
+    assert impressao_digital(str(caminho), "sep=;") != primeira
+    caminho.write_text("Categoria,Valor\nA,1\nB,2\n", encoding="utf-8")
+    assert impressao_digital(str(caminho)) != primeira
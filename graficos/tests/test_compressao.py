@@ -0,0 +1,76 @@
+import bz2
+import gzip
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+from graficos.compressao import (FATOR_COMPRESSAO_ESTIMADO, CompressaoNaoSuportadaErro, FicheiroCSV,
+                                 detetar_compressao, nome_sem_compressao, tamanho_dados)
+
+CSV = ("Categoria,Valor\n" + "".join(f"C{i % 5},{i}\n" for i in range(200))).encode("utf-8")
+
+
+def _gzip(caminho):
+    caminho.write_bytes(gzip.compress(CSV))
+
+
+def _bz2(caminho):
+    caminho.write_bytes(bz2.compress(CSV))
+
+
+def _zip(caminho):
+    with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED) as arquivo:
+        arquivo.writestr("dados.csv", CSV)
+
+
+@pytest.mark.parametrize("formato, escrever", [("gzip", _gzip), ("bz2", _bz2), ("zip", _zip)])
+def test_leitura_de_ficheiros_comprimidos(tmp_path, formato, escrever):
+    # Extensão enganadora: a deteção usa só as assinaturas
+    caminho = tmp_path / "dados.csv"
+    escrever(caminho)
+    assert detetar_compressao(str(caminho)) == formato
+    with FicheiroCSV(str(caminho)) as ficheiro:
+        frame = pd.read_csv(ficheiro.dados)
+        assert 0 < ficheiro.bytes_lidos() <= caminho.stat().st_size
+    pd.testing.assert_frame_equal(frame, pd.read_csv(io.BytesIO(CSV)))
+
+
+def test_texto_simples_com_extensao_de_compressao(tmp_path):
+    caminho = tmp_path / "dados.csv.gz"
+    caminho.write_bytes(CSV)
+    assert detetar_compressao(str(caminho)) is None
+    assert tamanho_dados(str(caminho)) == len(CSV)
+
+
+def test_assinatura_zstd(tmp_path):
+    caminho = tmp_path / "dados.bin"
+    caminho.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 16)
+    assert detetar_compressao(str(caminho)) == "zstd"
+    assert tamanho_dados(str(caminho)) == 20 * FATOR_COMPRESSAO_ESTIMADO
+
+
+def test_tamanho_dados(tmp_path):
+    gz, zp, bz = tmp_path / "a.gz", tmp_path / "a.zip", tmp_path / "a.bz2"
+    _gzip(gz)
+    _zip(zp)
+    _bz2(bz)
+    # gzip e zip guardam o tamanho original; o bzip2 é estimado
+    assert tamanho_dados(str(gz)) == len(CSV)
+    assert tamanho_dados(str(zp)) == len(CSV)
+    assert tamanho_dados(str(bz)) == bz.stat().st_size * FATOR_COMPRESSAO_ESTIMADO
+
+
+def test_zip_com_varios_csv(tmp_path):
+    caminho = tmp_path / "varios.zip"
+    with zipfile.ZipFile(caminho, "w") as arquivo:
+        arquivo.writestr("a.csv", CSV)
+        arquivo.writestr("b.csv", CSV)
+    with pytest.raises(CompressaoNaoSuportadaErro):
+        FicheiroCSV(str(caminho))
+
+
+@pytest.mark.parametrize("nome, esperado", [("a.csv.gz", "a"), ("dir/B.CSV.ZST", "B"), ("c.csv", "c"), ("d.zip", "d")])
+def test_nome_sem_compressao(nome, esperado):
+    assert nome_sem_compressao(nome) == esperado
@@ -0,0 +1,112 @@
+import gc
+import time
+
+import pytest
+
+from graficos.controller import controllerEvent
+from graficos.controller.controllerEvent import ControllerEvent
+from graficos.controller.metricasEventos import HistogramaLatencia, RegistoLatencias
+
+
+class EventoTeste(ControllerEvent):
+    pass
+
+
+class Subscritor:
+    def __init__(self, recebidos: list, nome: str) -> None:
+        self.recebidos = recebidos
+        self.nome = nome
+
+    def tratar(self, valor) -> None:
+        self.recebidos.append((self.nome, valor))
+
+
+@pytest.fixture
+def registo(monkeypatch):
+    registo = RegistoLatencias(ativo=True)
+    monkeypatch.setattr(controllerEvent, "registo_latencias", registo)
+    return registo
+
+
+def test_handlers_notificados_pela_ordem_de_subscricao():
+    recebidos = []
+    evento = EventoTeste()
+    subscritores = [Subscritor(recebidos, nome) for nome in "abc"]
+    for subscritor in subscritores:
+        evento.add_handler(subscritor.tratar)
+    evento.add_handler(subscritores[0].tratar)  # repetido: sem efeito
+
+    evento.invoke(1)
+    evento.remove_handler(subscritores[1].tratar)
+    evento.invoke(2)
+
+    assert recebidos == [("a", 1), ("b", 1), ("c", 1), ("a", 2), ("c", 2)]
+
+
+def test_handler_fraco_removido_depois_de_recolhido():
+    recebidos = []
+    evento = EventoTeste()
+    forte = Subscritor(recebidos, "forte")
+    fraco = Subscritor(recebidos, "fraco")
+    evento.add_handler(forte.tratar)
+    evento.add_handler_fraco(fraco.tratar)
+
+    evento.invoke(1)
+    del fraco
+    gc.collect()
+    evento.invoke(2)
+
+    assert recebidos == [("forte", 1), ("fraco", 1), ("forte", 2)]
+
+
+def test_handler_pode_alterar_subscricoes_durante_a_notificacao():
+    recebidos = []
+    evento = EventoTeste()
+    tardio = Subscritor(recebidos, "tardio")
+
+    def subscrever(valor):
+        recebidos.append(("primeiro", valor))
+        evento.add_handler(tardio.tratar)
+        evento.remove_handler(subscrever)
+
+    evento.add_handler(subscrever)
+    evento.invoke(1)
+    evento.invoke(2)
+
+    assert recebidos == [("primeiro", 1), ("tardio", 2)]
+
+
+def test_latencias_registadas_por_evento_e_por_handler(registo):
+    evento = EventoTeste()
+    evento.add_handler(lambda: time.sleep(0.002))
+    for _ in range(3):
+        evento.invoke()
+
+    eventos, handlers = registo.eventos(), registo.handlers()
+    assert eventos["EventoTeste"].total == 3
+    assert eventos["EventoTeste"].soma_ns >= 3 * 2_000_000
+    ((nome_evento, nome_handler), histograma), = handlers.items()
+    assert nome_evento == "EventoTeste" and "<lambda>" in nome_handler
+    assert histograma.total == 3
+    assert histograma.percentil_ms(50) >= 2.0
+    assert "EventoTeste" in registo.despejar()
+
+
+def test_latencias_inativas_nao_registam(registo):
+    registo.ativo = False
+    evento = EventoTeste()
+    evento.add_handler(lambda: None)
+    evento.invoke()
+    assert registo.eventos() == {} and registo.handlers() == {}
+
+
+def test_histograma_percentis():
+    histograma = HistogramaLatencia()
+    for duracao_us in [1, 3, 3, 3, 100]:
+        histograma.registar(duracao_us * 1000)
+    assert histograma.total == 5
+    assert histograma.media_ms == pytest.approx(0.022)
+    # Limite superior do intervalo exponencial onde cai o percentil
+    assert histograma.percentil_ms(50) == pytest.approx(0.004)
+    assert histograma.percentil_ms(100) == pytest.approx(0.1)
+    assert HistogramaLatencia().percentil_ms(99) == 0.0
@@ -0,0 +1,67 @@
+import os
+
+import matplotlib
+import pytest
+
+matplotlib.use("Agg")
+from matplotlib.figure import Figure  # noqa: E402
+
+from graficos.exportacao import exportar_figura  # noqa: E402
+
+ASSINATURAS = {"png": b"\x89PNG", "jpg": b"\xff\xd8", "pdf": b"%PDF", "svg": b"<?xml"}
+
+
+@pytest.fixture
+def figura():
+    figura = Figure(figsize=(2, 2))
+    figura.add_subplot().plot([1, 2, 3], [3, 1, 2])
+    return figura
+
+
+def test_exportar_varios_formatos(tmp_path, figura):
+    caminhos = [str(tmp_path / f"grafico.{formato}") for formato in ("png", "jpeg", "pdf", "svg")]
+    resultados = exportar_figura(figura, caminhos + [caminhos[0]])
+
+    assert [r.formato for r in resultados] == ["png", "jpg", "pdf", "svg"]
+    for resultado in resultados:
+        assert resultado.sucesso
+        assert resultado.tamanho_bytes == os.path.getsize(resultado.caminho) > 0
+        with open(resultado.caminho, "rb") as ficheiro:
+            assert ficheiro.read().startswith(ASSINATURAS[resultado.formato])
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(c) for c in caminhos)
+
+
+def test_formato_nao_suportado_nao_impede_os_restantes(tmp_path, figura):
+    resultados = exportar_figura(figura, [str(tmp_path / "grafico.bmp"), str(tmp_path / "grafico.png")])
+
+    assert not resultados[0].sucesso and "bmp" in resultados[0].erro
+    assert resultados[1].sucesso
+    assert os.listdir(tmp_path) == ["grafico.png"]
+
+
+def test_falha_a_meio_nao_deixa_ficheiro_parcial(tmp_path, figura, monkeypatch):
+    destino = tmp_path / "grafico.png"
+    destino.write_bytes(b"versao anterior")
+
+    def gravar_a_meio(ficheiro, **kwargs):
+        ficheiro.write(b"\x89PNG parcial")
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(figura, "savefig", gravar_a_meio)
+    resultado, = exportar_figura(figura, str(destino))
+
+    assert not resultado.sucesso and "disco cheio" in resultado.erro
+    # O destino mantém o conteúdo anterior e o temporário foi apagado
+    assert destino.read_bytes() == b"versao anterior"
+    assert os.listdir(tmp_path) == ["grafico.png"]
+
+
+def test_cancelamento_apaga_o_temporario_e_propaga(tmp_path, figura, monkeypatch):
+    def interromper(ficheiro, **kwargs):
+        ficheiro.write(b"%PDF parcial")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(figura, "savefig", interromper)
+    with pytest.raises(KeyboardInterrupt):
+        exportar_figura(figura, str(tmp_path / "grafico.pdf"))
+    assert os.listdir(tmp_path) == []
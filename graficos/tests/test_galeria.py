@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from graficos.galeria import CATEGORIA, MAX_CATEGORIAS_MINIATURA, gerar_miniaturas, pares_galeria
+from graficos.model import Model
+from graficos.perfil import PerfilDados
+from graficos.validacao import RegrasValidacao
+from graficos.view.headlessview import HeadlessView
+
+PNG = b"\x89PNG"
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    linhas = 4 * MAX_CATEGORIAS_MINIATURA
+    gerador = np.random.default_rng(3)
+    return pd.DataFrame({
+        "id": [f"id{i}" for i in range(linhas)],          # Texto, todos distintos
+        "Grupo": gerador.choice(list("ABC"), linhas),
+        "Tempo": np.arange(linhas, dtype=float),          # Numérico, todos distintos
+        "Valor": gerador.normal(10, 2, linhas),
+    })
+
+
+def _perfil(frame: pd.DataFrame) -> PerfilDados:
+    perfil = PerfilDados(frame.columns)
+    perfil.adicionar(frame)
+    return perfil
+
+
+def test_pares_sem_x_ilegiveis(frame):
+    perfil = _perfil(frame)
+    # O X sugerido ("id", a primeira coluna de texto) tem demasiados valores distintos
+    assert perfil.sugerir_eixos()[0] == "id"
+    barras = pares_galeria(perfil, "barras")
+    assert all(x != "id" for x, _ in barras)
+    assert ("Grupo", "Valor") in barras and ("Tempo", "Valor") not in barras
+    # Num gráfico de linhas, um X numérico com muitos valores continua legível
+    assert ("Tempo", "Valor") in pares_galeria(perfil, "linhas")
+    assert pares_galeria(perfil, "barras", CATEGORIA) == []
+    assert len(pares_galeria(perfil, "linhas", maximo=2)) == 2
+
+
+def test_miniaturas_com_erro_por_miniatura(frame):
+    pares = [("Grupo", "Valor"), ("Grupo", "Tempo")]
+    concluidas = {}
+
+    def concluida(indice, imagem, erro):
+        concluidas[indice] = (imagem, erro)
+
+    gerar_miniaturas(frame, "barras", pares, ["agregar"] * 2, RegrasValidacao(), "coagir", "ic", 1, concluida)
+    assert sorted(concluidas) == [0, 1]
+    assert all(imagem.startswith(PNG) and erro is None for imagem, erro in concluidas.values())
+
+    # Um tipo desconhecido falha em cada miniatura, sem interromper as restantes
+    concluidas.clear()
+    gerar_miniaturas(frame, "pizza", pares, ["agregar"] * 2, RegrasValidacao(), "coagir", "ic", 1, concluida)
+    assert sorted(concluidas) == [0, 1]
+    assert all(imagem is None and "pizza" in erro for imagem, erro in concluidas.values())
+
+
+def test_miniaturas_de_galerias_anteriores_ignoradas(frame, tmp_path, logger):
+    caminho = tmp_path / "dados.csv"
+    frame[["Grupo", "Valor"]].to_csv(caminho, index=False)
+    view = HeadlessView()
+    model = Model(view, logger)
+    model.cache_importacao = None
+    model.importar_ficheiro(str(caminho))
+
+    model.gerar_galeria("Barras")
+    primeira, miniaturas = view.galeria, dict(view.miniaturas)
+    assert miniaturas and all(imagem.startswith(PNG) for imagem in miniaturas.values())
+    model.gerar_galeria("Linhas")
+    assert view.galeria != primeira
+
+    # Uma miniatura da primeira galeria que só chegue agora não entra na galeria atual
+    view.miniaturas.clear()
+    view.mostra_miniatura(primeira, 0, miniaturas[0], None)
+    assert view.miniaturas == {}
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from graficos import model as modulo_model
+from graficos.importacao import AgregadorCategorias, ValoresNaoNumericosErro, ler_csv_por_blocos
+from graficos.model import Model
+from graficos.opcoes import POLITICAS_VALIDACAO
+from graficos.view.headlessview import HeadlessView
+
+FICHEIROS_TESTE = os.path.join(os.path.dirname(__file__), "..", "..", "FicheirosTeste")
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    gerador = np.random.default_rng(7)
+    return pd.DataFrame({
+        "Categoria": gerador.choice(list("ABCDEFG"), 2_000),
+        # Médias grandes: a combinação dos parciais não pode perder precisão na variância
+        "Valor": gerador.normal(1e9, 3.0, 2_000),
+    })
+
+
+def _em_memoria(frame: pd.DataFrame) -> pd.DataFrame:
+    grupos = frame.groupby("Categoria", sort=False)["Valor"]
+    return pd.DataFrame({
+        "media": grupos.mean(),
+        "soma": grupos.sum(),
+        "contagem": grupos.count(),
+        "desvio_padrao": grupos.std(),
+    })
+
+
+def _comparar(resultado: pd.DataFrame, frame: pd.DataFrame) -> None:
+    esperado = _em_memoria(frame)
+    resultado = resultado.set_index("Categoria")
+    assert list(resultado.index) == list(esperado.index)  # Ordem de aparição
+    for coluna in esperado.columns:
+        np.testing.assert_allclose(resultado[coluna].to_numpy(dtype=float), esperado[coluna].to_numpy(dtype=float),
+                                   rtol=1e-6)
+
+
+def test_agregacao_por_blocos_igual_a_em_memoria(frame):
+    agregador = AgregadorCategorias()
+    for inicio in range(0, len(frame), 37):
+        agregador.adicionar(frame.iloc[inicio:inicio + 37])
+    assert agregador.linhas == len(frame)
+    _comparar(agregador.resultado(), frame)
+
+
+def test_juntar_agregadores_de_partes(frame):
+    agregador = AgregadorCategorias()
+    for parte in np.array_split(np.arange(len(frame)), 5):
+        parcial = AgregadorCategorias()
+        parcial.adicionar(frame.iloc[parte])
+        agregador.juntar(parcial)
+    _comparar(agregador.resultado(), frame)
+
+
+def test_leitura_por_blocos_do_ficheiro(frame, tmp_path):
+    caminho = tmp_path / "dados.csv"
+    frame.to_csv(caminho, index=False)
+    agregador = AgregadorCategorias()
+    for bloco, bytes_lidos, bytes_totais in ler_csv_por_blocos(str(caminho), linhas_por_bloco=300):
+        assert 0 < bytes_lidos <= bytes_totais
+        agregador.adicionar(bloco)
+    _comparar(agregador.resultado(), pd.read_csv(caminho))
+
+
+def test_valores_nao_numericos():
+    agregador = AgregadorCategorias()
+    with pytest.raises(ValoresNaoNumericosErro):
+        agregador.adicionar(pd.DataFrame({"Categoria": ["A", "B"], "Valor": ["1", "x"]}))
+
+
+def test_sem_blocos():
+    assert AgregadorCategorias().resultado().empty
+
+
+@pytest.mark.parametrize("politica", POLITICAS_VALIDACAO)
+def test_ficheiro_mal_formatado_recusado_pela_sonda(politica, logger, monkeypatch):
+    # A estrutura é verificada no cabeçalho e na amostra: o ficheiro nunca é percorrido
+    def passagem_completa(*_, **__):
+        raise AssertionError("o ficheiro não devia ser percorrido")
+    monkeypatch.setattr(modulo_model, "ler_csv_por_blocos", passagem_completa)
+    monkeypatch.setattr(modulo_model, "analisar_csv_paralelo", passagem_completa)
+
+    view = HeadlessView()
+    model = Model(view, logger)
+    model.cache_importacao = None
+    model.politica_validacao = politica
+    model.importar_ficheiro(os.path.join(FICHEIROS_TESTE, "csv formato errado.csv"))
+
+    assert view.erros == ["Ficheiro CSV mal formatado."]
+    assert "cabeçalho parece uma linha de dados" in logger.erros[-1]
+    assert model.esquema is None
+
+
+def test_colunas_omissao_exigidas_sem_eixos_escolhidos(tmp_path, logger):
+    caminho = tmp_path / "medicoes.csv"
+    caminho.write_text("Temperatura,Humidade\n20,30\n21,35\n", encoding="utf-8")
+    view = HeadlessView()
+    model = Model(view, logger)
+    model.cache_importacao = None
+    model.importar_ficheiro(str(caminho))
+    assert not view.erros
+
+    model.gerar_grafico("Barras", None, None)
+    assert not view.grafico_gerado and "Categoria, Valor" in view.erros[-1]
+    model.gerar_grafico("Barras", "Temperatura", "Humidade")
+    assert view.grafico_gerado
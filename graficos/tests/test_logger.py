@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+
+from graficos.controller import controllerQueueLogger
+from graficos.controller.controllerQueueLogger import ControllerQueueLogger
+
+
+def _registos(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f]
+
+
+def test_fechar_escreve_os_pendentes(tmp_path):
+    caminho = tmp_path / "app.log"
+    logger = ControllerQueueLogger(str(caminho))
+    for i in range(500):
+        logger.log_info(f"mensagem {i}")
+    logger.log_erro("falhou")
+    logger.fechar()
+
+    registos = _registos(caminho)
+    assert [r["mensagem"] for r in registos] == [f"mensagem {i}" for i in range(500)] + ["falhou"]
+    assert registos[-1]["nivel"] == "ERRO"
+    logger.fechar()  # Pode ser chamado várias vezes
+
+
+def test_registos_depois_de_fechar(tmp_path):
+    caminho = tmp_path / "app.log"
+    logger = ControllerQueueLogger(str(caminho))
+    logger.log_info("antes")
+    logger.fechar()
+
+    def registar(indice):
+        for i in range(50):
+            logger.log_info(f"depois {indice}.{i}")
+    threads = [threading.Thread(target=registar, args=(indice,)) for indice in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Escritos de imediato, sem linhas misturadas entre threads
+    mensagens = [r["mensagem"] for r in _registos(caminho)]
+    assert mensagens[0] == "antes"
+    assert sorted(mensagens[1:]) == sorted(f"depois {indice}.{i}" for indice in range(4) for i in range(50))
+
+
+def test_limite_de_repeticoes_com_resumo(tmp_path):
+    caminho = tmp_path / "app.log"
+    logger = ControllerQueueLogger(str(caminho), max_repeticoes=3, janela_repeticoes_s=60)
+    for _ in range(10):
+        logger.log_erro("repetida")
+    logger.log_info("outra")
+    logger.fechar()
+
+    registos = _registos(caminho)
+    repetidas = [r for r in registos if r["mensagem"] == "repetida"]
+    assert len(repetidas) == 4
+    assert [r.get("suprimidas") for r in repetidas] == [None, None, None, 7]
+    assert repetidas[-1]["nivel"] == "ERRO"
+    assert sum(r["mensagem"] == "outra" for r in registos) == 1
+
+
+def test_resumo_das_suprimidas_depois_de_fechar(tmp_path):
+    caminho = tmp_path / "app.log"
+    logger = ControllerQueueLogger(str(caminho), max_repeticoes=2, janela_repeticoes_s=0.05)
+    logger.fechar()
+    for _ in range(5):
+        logger.log_info("repetida")
+    time.sleep(0.1)
+    logger.log_info("outra")  # Termina a janela: o resumo é escrito, não fica perdido na fila
+
+    registos = _registos(caminho)
+    assert [(r["mensagem"], r.get("suprimidas")) for r in registos] == [
+        ("repetida", None), ("repetida", None), ("repetida", 3), ("outra", None)]
+
+
+def test_rotacao_por_tamanho(tmp_path, monkeypatch):
+    # Lotes pequenos: o tamanho é verificado depois de cada lote escrito
+    monkeypatch.setattr(controllerQueueLogger, "REGISTOS_POR_LOTE", 5)
+    caminho = tmp_path / "app.log"
+    logger = ControllerQueueLogger(str(caminho), tamanho_max_bytes=2_000, ficheiros_rotacao=2)
+    for i in range(300):
+        logger.log_info(f"mensagem {i:04d} " + "x" * 40)
+    logger.fechar()
+
+    assert (tmp_path / "app.log.1").exists() and (tmp_path / "app.log.2").exists()
+    assert not (tmp_path / "app.log.3").exists()
+    # O ficheiro atual pode ter acabado de ser rodado
+    ficheiros = [tmp_path / nome for nome in ("app.log.2", "app.log.1", "app.log") if (tmp_path / nome).exists()]
+    for ficheiro in ficheiros:
+        assert ficheiro.stat().st_size < 2_000 + 5 * 100
+    # Os ficheiros mantidos têm os registos mais recentes, pela ordem
+    mensagens = [r["mensagem"] for ficheiro in ficheiros for r in _registos(ficheiro)]
+    assert mensagens[-1].startswith("mensagem 0299")
+    assert mensagens == sorted(mensagens)
+
+
+def test_medir_etapa(tmp_path):
+    caminho = tmp_path / "app.log"
+    logger = ControllerQueueLogger(str(caminho))
+    with logger.medir_etapa("importar"):
+        pass
+    logger.fechar()
+    registo, = _registos(caminho)
+    assert registo["etapa"] == "importar" and registo["duracao_ms"] >= 0
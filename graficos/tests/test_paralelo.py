@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from graficos import paralelo
+from graficos.paralelo import dividir_em_intervalos, ler_csv_paralelo
+
+
+@pytest.fixture
+def ficheiro(tmp_path):
+    # Campos entre aspas com quebras de linha, vírgulas e aspas escapadas ("")
+    linhas = ["id,texto,Valor"]
+    for i in range(300):
+        texto = f'"linha {i}\nsegunda, parte\n""citação"""' if i % 3 == 0 else f"simples {i}"
+        linhas.append(f"{i},{texto},{i * 1.5}")
+    caminho = tmp_path / "aspas.csv"
+    caminho.write_bytes(("\n".join(linhas) + "\n").encode("utf-8"))
+    return str(caminho)
+
+
+@pytest.mark.parametrize("bytes_varrimento", [7, 64, paralelo.BYTES_VARRIMENTO])
+def test_intervalos_alinhados_com_linhas(ficheiro, monkeypatch, bytes_varrimento):
+    # Blocos de varrimento pequenos: as aspas abertas atravessam a fronteira entre blocos
+    monkeypatch.setattr(paralelo, "BYTES_VARRIMENTO", bytes_varrimento)
+    with open(ficheiro, "rb") as f:
+        conteudo = f.read()
+    intervalos = dividir_em_intervalos(ficheiro, 4)
+
+    assert len(intervalos) == 4
+    assert intervalos[0][0] == conteudo.index(b"\n") + 1
+    assert intervalos[-1][1] == len(conteudo)
+    assert all(fim == inicio for (_, fim), (inicio, _) in zip(intervalos, intervalos[1:]))
+    for inicio, _ in intervalos:
+        # Cada parte começa no início de uma linha, fora de um campo entre aspas
+        assert conteudo[inicio - 1:inicio] == b"\n"
+        assert conteudo[:inicio].count(b'"') % 2 == 0
+
+
+def test_leitura_paralela_igual_a_read_csv(ficheiro):
+    esperado = pd.read_csv(ficheiro)
+    lido = ler_csv_paralelo(ficheiro, list(esperado.columns), {}, processos=3)
+    pd.testing.assert_frame_equal(lido, esperado)
+
+
+def test_ficheiro_so_com_cabecalho(tmp_path):
+    caminho = tmp_path / "vazio.csv"
+    caminho.write_text("a,b\n", encoding="utf-8")
+    assert dividir_em_intervalos(str(caminho), 4) == []
+    assert ler_csv_paralelo(str(caminho), ["a", "b"], {}, processos=2).empty
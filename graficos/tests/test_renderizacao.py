@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from graficos.amostragem import baldes_por_largura, reduzir_min_max  # noqa: E402
+from graficos.importacao import AgregadorCategorias  # noqa: E402
+from graficos.renderizacao import renderizar_grafico  # noqa: E402
+
+
+def _tabela(semente: int, categorias: int) -> pd.DataFrame:
+    gerador = np.random.default_rng(semente)
+    frame = pd.DataFrame({
+        "Categoria": gerador.integers(0, categorias, 500).astype(str),
+        "Valor": gerador.normal(100, 15, 500),
+    })
+    agregador = AgregadorCategorias("Categoria", "Valor")
+    agregador.adicionar(frame)
+    return agregador.resultado()
+
+
+def _desenhar(tipo: str, tabela: pd.DataFrame, titulo: str) -> np.ndarray:
+    grafico = renderizar_grafico(tipo, tabela, "Categoria", "Categoria", "Valor", titulo, "ic")
+    grafico.figura.canvas.draw()
+    return np.asarray(grafico.figura.canvas.buffer_rgba()).copy()
+
+
+@pytest.fixture(autouse=True)
+def sem_figuras_abertas():
+    plt.close("all")
+    yield
+    plt.close("all")
+
+
+def test_graficos_em_threads_iguais_aos_desenhados_em_serie():
+    pedidos = [(tipo, _tabela(semente, 3 + semente), f"Gráfico {semente}")
+               for semente in range(8) for tipo in ("barras", "linhas")]
+    em_serie = [_desenhar(*pedido) for pedido in pedidos]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        em_paralelo = list(executor.map(lambda pedido: _desenhar(*pedido), pedidos))
+
+    for serie, paralelo in zip(em_serie, em_paralelo):
+        np.testing.assert_array_equal(paralelo, serie)
+    # As figuras não passam pelo pyplot: nenhuma fica registada no estado global
+    assert plt.get_fignums() == []
+
+
+def test_tipo_desconhecido():
+    with pytest.raises(ValueError):
+        renderizar_grafico("pizza", _tabela(0, 3), "Categoria", "Categoria", "Valor", "")
+
+
+@pytest.mark.parametrize("x_numerico", [True, False])
+def test_reducao_min_max_mantem_extremos_de_cada_balde(x_numerico):
+    gerador = np.random.default_rng(3)
+    n, baldes = 20_000, 100
+    x = np.sort(gerador.uniform(0, 50, n)) if x_numerico else np.array([f"p{i}" for i in range(n)])
+    y = gerador.normal(0, 1, n)
+    y[[123, 9_876]] = [40.0, -40.0]
+    y[5_000:5_050] = np.nan
+
+    indices = reduzir_min_max(x, y, baldes)
+
+    assert len(indices) <= 4 * baldes
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert {123, 9_876} <= set(indices)
+    # Em cada balde (pixel) o mínimo e o máximo da série reduzida são os da série original
+    if x_numerico:
+        balde = np.minimum(((x - x[0]) / (x[-1] - x[0]) * baldes).astype(int), baldes - 1)
+    else:
+        balde = np.arange(n) * baldes // n
+    for b in np.unique(balde):
+        originais = y[balde == b]
+        reduzidos = y[indices[balde[indices] == b]]
+        assert np.nanmin(reduzidos) == np.nanmin(originais)
+        assert np.nanmax(reduzidos) == np.nanmax(originais)
+
+
+def test_reducao_min_max_series_pequenas_ficam_inteiras():
+    assert reduzir_min_max(np.arange(40), np.arange(40.0), 10).tolist() == list(range(40))
+    assert baldes_por_largura(10, 100) == 800
+    assert baldes_por_largura(0.001, 1) == 1
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from graficos.esquema import sondar_esquema
+from graficos.seguimento import LeitorIncremental
+
+
+@pytest.fixture
+def ficheiro(tmp_path):
+    caminho = tmp_path / "registo.csv"
+    caminho.write_bytes(b"Categoria,Valor\nA,1\nB,2\n")
+    return caminho
+
+
+def _leitor(ficheiro, **opcoes) -> LeitorIncremental:
+    return LeitorIncremental(str(ficheiro), sondar_esquema(str(ficheiro)), **opcoes)
+
+
+def _acrescentar(ficheiro, dados: bytes) -> None:
+    with open(ficheiro, "ab") as f:
+        f.write(dados)
+
+
+def test_cabecalho_ignorado_e_so_linhas_novas(ficheiro):
+    leitor = _leitor(ficheiro)
+    bloco, reiniciado = leitor.ler_novas()
+    assert list(bloco["Categoria"]) == ["A", "B"] and not reiniciado
+    assert leitor.ler_novas() == (None, False)
+
+    _acrescentar(ficheiro, b"C,3\n")
+    bloco, _ = leitor.ler_novas()
+    assert list(bloco["Valor"]) == [3]
+
+
+def test_linha_incompleta_fica_para_a_leitura_seguinte(ficheiro):
+    leitor = _leitor(ficheiro)
+    leitor.ler_novas()
+    _acrescentar(ficheiro, b"C,3\nD,4")
+    bloco, _ = leitor.ler_novas()
+    assert list(bloco["Categoria"]) == ["C"]
+    assert leitor.ler_novas() == (None, False)
+
+    _acrescentar(ficheiro, b"0\n")
+    bloco, _ = leitor.ler_novas()
+    assert list(bloco["Categoria"]) == ["D"] and list(bloco["Valor"]) == [40]
+
+
+def test_ficheiro_truncado_recomeca_sem_cabecalho(ficheiro):
+    leitor = _leitor(ficheiro)
+    leitor.ler_novas()
+    ficheiro.write_bytes(b"Categoria,Valor\nZ,9\n")
+    bloco, reiniciado = leitor.ler_novas()
+    assert reiniciado and list(bloco["Categoria"]) == ["Z"]
+
+
+def test_ficheiro_rodado_recomeca(ficheiro, tmp_path):
+    leitor = _leitor(ficheiro)
+    leitor.ler_novas()
+    # Outro ficheiro (outro inode) com o mesmo nome, maior do que o anterior
+    novo = tmp_path / "novo.csv"
+    novo.write_bytes(b"Categoria,Valor\n" + b"".join(b"N,%d\n" % i for i in range(10)))
+    os.replace(novo, ficheiro)
+    bloco, reiniciado = leitor.ler_novas()
+    assert reiniciado and len(bloco) == 10
+
+
+def test_linha_mais_longa_do_que_uma_leitura_e_ignorada(ficheiro):
+    leitor = _leitor(ficheiro, bytes_por_leitura=16)
+    while leitor.posicao < os.path.getsize(ficheiro):
+        leitor.ler_novas()
+    _acrescentar(ficheiro, b"X," + b"9" * 40 + b"\nC,3\n")
+    linhas = []
+    for _ in range(10):
+        bloco, _ = leitor.ler_novas()
+        if bloco is not None:
+            linhas += list(bloco["Categoria"])
+    # A leitura avança sempre: a linha longa é saltada e a seguinte é lida
+    assert linhas == ["C"]
+    assert leitor.linhas_ignoradas == 1
+    assert leitor.posicao == os.path.getsize(ficheiro)
+
+
+def test_cabecalho_mais_longo_do_que_uma_leitura(tmp_path):
+    caminho = tmp_path / "largo.csv"
+    caminho.write_bytes(b"Categoria,Valor\nA,1\n")
+    leitor = _leitor(caminho, bytes_por_leitura=8)
+    blocos = [leitor.ler_novas()[0] for _ in range(5)]
+    assert leitor.linhas_ignoradas == 1
+    assert [list(b["Categoria"]) for b in blocos if b is not None] == [["A"]]
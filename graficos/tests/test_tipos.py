@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from graficos.tipos import otimizar_tipos
+
+
+@pytest.mark.parametrize("valores, tipo_esperado", [
+    ([0, 127, -128], np.int8),
+    ([0, 128], np.int16),
+    ([-32_768, 32_767], np.int16),
+    ([0, 32_768], np.int32),
+    ([-2 ** 31, 2 ** 31 - 1], np.int32),
+    ([0, 2 ** 31], np.int64),
+    ([np.iinfo(np.int64).min, np.iinfo(np.int64).max], np.int64),
+])
+def test_inteiros_nos_limites_de_cada_tipo(valores, tipo_esperado):
+    df = pd.DataFrame({"n": np.array(valores, dtype=np.int64)})
+    otimizado, _, _ = otimizar_tipos(df)
+
+    assert otimizado["n"].dtype == tipo_esperado
+    assert otimizado["n"].astype(np.int64).tolist() == valores
+
+
+@pytest.mark.parametrize("valores, tipo_esperado", [
+    ([0.5, -2.25, 1024.0, np.nan], np.float32),
+    ([float(np.finfo(np.float32).max), float(np.finfo(np.float32).tiny), np.inf, -np.inf], np.float32),
+    ([0.1, 1.0], np.float64),                     # 0.1 não é representável em float32
+    ([1.0, 2.0 ** 24 + 1], np.float64),           # inteiro acima da mantissa do float32
+    ([1.0, 1e300], np.float64),                   # fora da gama do float32
+    ([1.0, 1e-300], np.float64),                  # abaixo do menor float32
+])
+def test_decimais_so_reduzidos_sem_perda(valores, tipo_esperado):
+    df = pd.DataFrame({"v": np.array(valores, dtype=np.float64)})
+    with np.errstate(over="ignore"):
+        otimizado, _, _ = otimizar_tipos(df)
+
+    assert otimizado["v"].dtype == tipo_esperado
+    original, convertido = df["v"].to_numpy(), otimizado["v"].to_numpy(dtype=np.float64)
+    assert np.array_equal(convertido, original, equal_nan=True)
+
+
+def test_nan_mantem_se_e_texto_passa_a_categorico():
+    df = pd.DataFrame({
+        "v": [np.nan, np.nan, 3.0, np.nan],
+        "cat": ["b", "a", "b", None],
+        "id": ["x1", "x2", "x3", "x4"],
+    })
+    otimizado, _, _ = otimizar_tipos(df)
+
+    assert otimizado["v"].dtype == np.float32
+    assert otimizado["v"].isna().tolist() == [True, True, False, True]
+    assert isinstance(otimizado["cat"].dtype, pd.CategoricalDtype)
+    assert list(otimizado["cat"].cat.categories) == ["b", "a"]
+    assert otimizado["cat"].isna().tolist() == [False, False, False, True]
+    assert otimizado["id"].dtype == df["id"].dtype
+    pd.testing.assert_frame_equal(otimizado.astype({"v": "float64", "cat": df["cat"].dtype}), df)
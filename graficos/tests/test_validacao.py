@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from graficos.validacao import (RegrasValidacao, RelatorioValidacao, ValoresInvalidosErro, aplicar_politica,
+                                converter_numeros)
+
+
+@pytest.fixture
+def bloco() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Categoria": ["A", "B", "C", "D", "E", "F"],
+        "Valor": ["1", "x", None, "-5", "250", "7"],
+    })
+
+
+def test_converter_numeros(bloco):
+    numeros, em_falta = converter_numeros(bloco["Valor"])
+    np.testing.assert_array_equal(numeros, [1, np.nan, np.nan, -5, 250, 7])
+    np.testing.assert_array_equal(em_falta, [False, False, True, False, False, False])
+
+
+def test_numeros_de_linha_do_ficheiro(bloco):
+    # A linha 1 do ficheiro é o cabeçalho: a primeira linha de dados é a 2
+    relatorio = RelatorioValidacao(["Valor"], RegrasValidacao(maximo=100, negativos=False))
+    relatorio.adicionar(bloco.iloc[:3])
+    relatorio.adicionar(bloco.iloc[3:])
+    linhas = relatorio.colunas["Valor"].linhas
+    assert linhas["nao_numerico"] == [3]
+    assert linhas["em_falta"] == [4]
+    assert linhas["negativo"] == [5]
+    assert linhas["fora_intervalo"] == [6]
+    assert relatorio.invalidos("Valor") == 3
+    assert relatorio.descrever(["Valor"], apenas_invalidos=True) == [
+        "Valor: 1 valores não numéricos (linhas 3)",
+        "Valor: 1 valores fora do intervalo (linhas 6)",
+        "Valor: 1 valores negativos (linhas 5)",
+    ]
+
+
+def test_juntar_partes_mantem_numeros_de_linha(bloco):
+    inteiro = RelatorioValidacao(["Valor"])
+    inteiro.adicionar(bloco)
+    juntos = RelatorioValidacao(["Valor"])
+    for parte in (bloco.iloc[:2], bloco.iloc[2:5], bloco.iloc[5:]):
+        parcial = RelatorioValidacao(["Valor"])
+        parcial.adicionar(parte)
+        juntos.juntar(parcial)
+    assert juntos.linhas == inteiro.linhas == len(bloco)
+    assert juntos.colunas["Valor"].linhas == inteiro.colunas["Valor"].linhas
+    # O resumo guardado na cache reconstrói o mesmo relatório
+    reconstruido = RelatorioValidacao.de_frame(juntos.para_frame())
+    assert reconstruido.colunas["Valor"].linhas == inteiro.colunas["Valor"].linhas
+
+
+def test_politica_coagir(bloco):
+    tratado = aplicar_politica(bloco, "Valor", RegrasValidacao(minimo=0, maximo=100), "coagir")
+    np.testing.assert_array_equal(tratado["Valor"], [1, np.nan, np.nan, 0, 100, 7])
+    assert list(tratado["Categoria"]) == list(bloco["Categoria"])
+
+
+def test_politica_descartar(bloco):
+    tratado = aplicar_politica(bloco, "Valor", RegrasValidacao(maximo=100, negativos=False), "descartar")
+    # Os valores em falta só são reportados; o não numérico, o negativo e o acima do máximo saem
+    assert list(tratado["Categoria"]) == ["A", "C", "F"]
+    np.testing.assert_array_equal(tratado["Valor"], [1, np.nan, 7])
+
+
+def test_politica_rejeitar(bloco):
+    with pytest.raises(ValoresInvalidosErro, match="1 valores não numéricos"):
+        aplicar_politica(bloco, "Valor", RegrasValidacao(), "rejeitar")
+
+
+def test_bloco_valido_nao_e_copiado():
+    bloco = pd.DataFrame({"Categoria": ["A"], "Valor": [1.0]})
+    assert aplicar_politica(bloco, "Valor", RegrasValidacao(), "rejeitar") is bloco
+
+
+def test_politica_desconhecida(bloco):
+    with pytest.raises(ValueError):
+        aplicar_politica(bloco, "Valor", RegrasValidacao(), "ignorar")